@@ -0,0 +1,95 @@
+"""
+터미널 출력 해석 벤치마크: 예전 정규식 세니타이저 vs AnsiParser.
+
+    python benchmarks/ansi_parser_bench.py [캡처한_출력_파일 ...]
+
+파일을 주지 않으면 로그/컬러 출력/진행 표시줄 형태의 출력을 만들어 쓴다. 출력을 CHUNK_BYTES 씩
+잘라(readyRead 조각처럼) 넣고, 걸린 시간과 처리량, 결과 줄 수를 비교한다.
+캡처는 예: script -q -c "pytest --color=yes" out.log
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.ansi_parser import AnsiParser
+
+CHUNK_BYTES = 4096
+REPEAT = 3
+
+
+def legacy_sanitize(text: str) -> str:
+    """예전 TerminalManager._sanitize_output (청크마다 정규식 세 번)."""
+    text = text.replace('\r', '\n')
+    text = re.sub(r"\x1B\][^\x07]*(\x07|\x1b\\)", "", text)
+    text = re.sub(r"\x1B\[[0-?]*[ -/]*[@-~]", "", text)
+    text = re.sub(r"\x1B[()][0-2AB]", "", text)
+    return text
+
+
+def sample_outputs():
+    log = ''.join(f"2024-01-01 12:00:{i % 60:02d} INFO worker-{i % 8} processed item {i} in {i % 97} ms\r\n"
+                  for i in range(200000))
+    colored = ''.join(
+        f"\x1b[0m\x1b[01;34mdir_{i}\x1b[0m  \x1b[01;32mrun_{i}.sh\x1b[0m  file_{i}.txt  "
+        f"\x1b[38;5;208mwarn\x1b[0m \x1b[1;31mFAILED\x1b[0m tests/test_{i}.py::case\r\n"
+        for i in range(60000))
+    progress = ''.join(
+        ''.join(f"\r\x1b[2K  {p:3d}% |{'#' * (p // 4):<25}| {p * 131} kB" for p in range(0, 101))
+        + f"\r\ndownloaded package-{i}.tar.gz\r\n"
+        for i in range(1500))
+    return [('log', log), ('colored', colored), ('progress', progress)]
+
+
+def chunks(text: str):
+    data = text.encode('utf-8')
+    for start in range(0, len(data), CHUNK_BYTES):
+        yield data[start:start + CHUNK_BYTES].decode('utf-8', errors='ignore')
+
+
+def bench(name: str, text: str):
+    parts = list(chunks(text))
+    size = len(text.encode('utf-8')) / 1e6
+
+    best = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        out = [legacy_sanitize(part) for part in parts]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    legacy_lines = ''.join(out).count('\n')
+    legacy_time = best
+
+    best = None
+    for _ in range(REPEAT):
+        parser = AnsiParser()
+        started = time.perf_counter()
+        lines = 0
+        for part in parts:
+            spans, _ = parser.feed(part)
+            for span_text, _ in spans:
+                lines += span_text.count('\n')
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    parser_time = best
+
+    print(f"{name:<12} {size:7.1f} MB  legacy {legacy_time * 1000:8.1f} ms ({size / legacy_time:6.1f} MB/s, {legacy_lines} lines)"
+          f"  parser {parser_time * 1000:8.1f} ms ({size / parser_time:6.1f} MB/s, {lines} lines)")
+
+
+def main(paths):
+    if paths:
+        samples = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                samples.append((os.path.basename(path), f.read().decode('utf-8', errors='ignore')))
+    else:
+        samples = sample_outputs()
+    for name, text in samples:
+        bench(name, text)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,432 @@
+"""
+에디터 핫 패스 벤치마크 (헤드리스, 결과는 JSON).
+
+    python benchmarks/editor_bench.py [--files 10000,100000] [--only load_folder_tree,open_file]
+                                      [--out result.json] [--compare baseline.json] [--threshold 0.1]
+
+Qt 는 offscreen 플랫폼으로 띄우고, 합성 픽스처(파일 트리, ANSI 출력, LLM 응답, 큰 소스 파일)를
+--fixtures 디렉토리에 만들어 다음 실행에서도 재사용한다 (100만 파일 트리는 만드는 데만 몇 분 걸림).
+색인/스왑 캐시는 실행마다 새 임시 디렉토리를 쓰므로 색인 시간은 항상 처음부터 만드는 시간이다.
+
+결과 JSON 의 results 는 {"name", "params", "metrics"} 목록이고, 이름이 _ms / _ns 로 끝나는 지표는
+작을수록 좋다. --compare 로 이전 결과를 주면 같은 (name, params) 끼리 비교해 threshold 보다 느려진
+지표를 보여주고 종료 코드 1 로 끝난다 (커밋 사이 회귀 추적용).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import shutil
+import platform
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# 색인/스왑/응답 캐시는 이 실행 전용 임시 디렉토리에, 셸 풀은 띄우지 않음
+CACHE_DIR = tempfile.mkdtemp(prefix='editor-bench-cache-')
+os.environ['EDITOR_CACHE_DIR'] = CACHE_DIR
+os.environ['LLM_CACHE'] = '0'
+os.environ['TERMINAL_POOL_SIZE'] = '0'
+
+from PyQt5.QtCore import QEventLoop, QModelIndex, QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtWidgets import QApplication, QTreeView
+
+from ansi_parser_bench import sample_outputs
+
+DEFAULT_FILES = '10000,100000'
+FILES_PER_DIR = 100
+DIRS_PER_PACKAGE = 10
+# 트리를 전부 펼쳐 get_file_path_from_item 을 재는 최대 크기
+EXPAND_MAX_FILES = 100000
+RESPONSE_MB = (1, 8)
+HTML_KB = (64, 512)
+OPEN_FILE_MB = (1, 4, 64)
+WAIT_TIMEOUT_S = 600
+
+CASES = ('load_folder_tree', 'get_file_path_from_item', 'sanitize_output', 'extract_response', 'format_as_html', 'open_file')
+
+
+def log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def measure(fn, repeat: int):
+    """fn 을 repeat 번 실행한 (최솟값, 중앙값) ms 와 마지막 반환값."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return min(times), statistics.median(times), result
+
+
+def wait_until(predicate, timeout: float = WAIT_TIMEOUT_S):
+    """조건이 맞을 때까지 이벤트 루프를 돌린다 (스레드에서 오는 시그널도 처리됨)."""
+    app = QApplication.instance()
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark wait timed out")
+        app.processEvents(QEventLoop.AllEvents, 10)
+        time.sleep(0.0005)
+
+
+def settle():
+    """쌓인 이벤트(레이아웃, 지연 타이머 등)를 처리한다."""
+    app = QApplication.instance()
+    for _ in range(3):
+        app.processEvents(QEventLoop.AllEvents, 50)
+
+
+# ---------- 픽스처 ----------
+
+def make_tree(base: str, files: int) -> str:
+    """pkg_XXXX/mod_XX/file_XXX.py 형태로 files 개의 작은 파이썬 파일을 만든다 (이미 있으면 재사용)."""
+    root = os.path.abspath(os.path.join(base, f'tree_{files}'))
+    stamp = os.path.join(root, '.bench-complete')
+    if os.path.exists(stamp):
+        return root
+    log(f"generating tree with {files} files in {root} ...")
+    started = time.perf_counter()
+    created = 0
+    package = 0
+    while created < files:
+        for module in range(DIRS_PER_PACKAGE):
+            if created >= files:
+                break
+            directory = os.path.join(root, f'pkg_{package:04d}', f'mod_{module:02d}')
+            os.makedirs(directory, exist_ok=True)
+            for i in range(min(FILES_PER_DIR, files - created)):
+                with open(os.path.join(directory, f'file_{i:03d}.py'), 'w') as f:
+                    f.write(f"def handler_{created}(value):\n    return value * {i} + {package}\n")
+                created += 1
+        package += 1
+    with open(stamp, 'w') as f:
+        f.write(str(files))
+    log(f"  done in {time.perf_counter() - started:.1f} s")
+    return root
+
+
+def make_source_file(base: str, megabytes: int) -> str:
+    path = os.path.join(base, 'open_file', f'source_{megabytes}mb.py')
+    if os.path.exists(path) and os.path.getsize(path) >= megabytes * 1024 * 1024:
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    block = ''.join(
+        f"class Widget{i}(Base):\n"
+        f"    \"\"\"Widget number {i}.\"\"\"\n"
+        f"    def render(self, value: int = {i}) -> str:\n"
+        f"        # format the value\n"
+        f"        return f'<div id=\"{i}\">{{value + {i}}}</div>'\n\n"
+        for i in range(1000))
+    target = megabytes * 1024 * 1024
+    with open(path, 'w') as f:
+        written = 0
+        while written < target:
+            f.write(block)
+            written += len(block)
+    return path
+
+
+def make_response(megabytes: int, kind: str) -> str:
+    from src.managers.agent_manager import AgentManager
+    size = megabytes * 1024 * 1024
+    desc_line = "- **변경**: `handler` 함수의 반환값을 *정규화* 했습니다. 자세한 내용은 아래를 보세요.\n"
+    code_line = "    result = transform(value, scale=2) + offset  # keep in sync\n"
+    desc = desc_line * max(1, size // 10 // len(desc_line))
+    code = code_line * max(1, size // len(code_line))
+    if kind == 'markers':
+        return (f"{AgentManager.DESC_BEGIN}\n{desc}{AgentManager.DESC_END}\n"
+                f"{AgentManager.CODE_BEGIN}\n{code}{AgentManager.CODE_END}\n")
+    if kind == 'fence':
+        return f"{desc}\n```python\n{code}```\n"
+    # 마커도 코드 블록도 없는 응답 (추출이 실패하는 최악의 경우)
+    return desc + code
+
+
+def make_markdown(kilobytes: int) -> str:
+    section = (
+        "## 변경 사항\n\n"
+        "`load_folder_tree` 가 **최상위 한 단계만** 읽도록 바꾸었습니다. *나머지*는 펼칠 때 읽습니다.\n\n"
+        "1. 첫 번째 항목\n2. 두 번째 항목 with `code`\n\n"
+        "| 항목 | 이전 | 이후 |\n|---|---|---|\n| 시간 | 120 ms | 8 ms |\n\n"
+        "```python\ndef handler(value):\n    return value * 2\n```\n\n"
+        "> 참고: 캐시는 다음 실행에서도 재사용됩니다.\n\n"
+    )
+    return section * max(1, kilobytes * 1024 // len(section.encode('utf-8')))
+
+
+# ---------- 케이스 ----------
+
+def bench_load_folder_tree(ctx):
+    from src.managers.file_manager import FileManager
+    results = []
+    for files in ctx.files:
+        root = make_tree(ctx.fixtures, files)
+        manager = FileManager()
+        view = QTreeView()
+        marks = {}
+        started = time.perf_counter()
+
+        def mark(name):
+            marks.setdefault(name, (time.perf_counter() - started) * 1000)
+
+        manager.model.directory_loaded.connect(lambda path: path == root and mark('root_listed_ms'))
+        manager.path_index.build_finished.connect(lambda count: mark('path_index_ms'))
+        manager.search_index.build_finished.connect(lambda count: mark('search_index_ms'))
+        started = time.perf_counter()
+        manager.load_folder_tree(view, root)
+        mark('call_ms')
+        wait_until(lambda: len(marks) == 4)
+        results.append({'name': 'load_folder_tree', 'params': {'files': files}, 'metrics': marks})
+        log(f"load_folder_tree files={files} {marks}")
+        ctx.trees[files] = (manager, view, root)
+    return results
+
+
+def _expand_all(model) -> list:
+    """트리를 전부 읽고 모든 항목의 인덱스를 돌려준다."""
+    pending = set()
+    model.directory_loaded.connect(pending.discard)
+    indexes = []
+    frontier = [QModelIndex()]
+    while frontier:
+        next_frontier = []
+        for parent in frontier:
+            for row in range(model.rowCount(parent)):
+                index = model.index(row, 0, parent)
+                indexes.append(index)
+                if model.is_dir(index):
+                    next_frontier.append(index)
+                    if model.canFetchMore(index):
+                        pending.add(model.path(index))
+                        model.fetchMore(index)
+        wait_until(lambda: not pending)
+        frontier = next_frontier
+    model.directory_loaded.disconnect(pending.discard)
+    return indexes
+
+
+def bench_get_file_path_from_item(ctx):
+    results = []
+    for files in ctx.files:
+        if files > EXPAND_MAX_FILES:
+            log(f"get_file_path_from_item files={files} skipped (> {EXPAND_MAX_FILES})")
+            continue
+        if files not in ctx.trees:
+            bench_load_folder_tree(ctx.only_files(files))
+        manager, view, root = ctx.trees[files]
+        started = time.perf_counter()
+        indexes = _expand_all(manager.model)
+        expand_ms = (time.perf_counter() - started) * 1000
+        best, median, _ = measure(lambda: [manager.get_file_path_from_item(index) for index in indexes], ctx.repeat)
+        metrics = {
+            'expand_ms': expand_ms,
+            'best_ms': best,
+            'median_ms': median,
+            'per_item_ns': best * 1e6 / len(indexes),
+        }
+        results.append({'name': 'get_file_path_from_item', 'params': {'files': files, 'items': len(indexes)}, 'metrics': metrics})
+        log(f"get_file_path_from_item files={files} items={len(indexes)} {metrics}")
+    return results
+
+
+def bench_sanitize_output(ctx):
+    from src.managers.terminal_manager import TerminalManager
+    manager = TerminalManager()
+    results = []
+    for name, text in sample_outputs():
+        size = len(text.encode('utf-8')) / 1e6
+        best, median, _ = measure(lambda: manager._sanitize_output(text), ctx.repeat)
+        metrics = {'best_ms': best, 'median_ms': median, 'mb_per_s': size / (best / 1000)}
+        results.append({'name': 'sanitize_output', 'params': {'sample': name, 'mb': round(size, 1)}, 'metrics': metrics})
+        log(f"sanitize_output {name} {size:.1f} MB {metrics}")
+    return results
+
+
+def bench_extract_response(ctx):
+    from src.managers.agent_manager import AgentManager
+    agent = AgentManager(None)
+    results = []
+    for megabytes in RESPONSE_MB:
+        for kind in ('markers', 'fence', 'none'):
+            text = make_response(megabytes, kind)
+            for method in ('_extract_code', '_extract_desc'):
+                fn = getattr(agent, method)
+                best, median, _ = measure(lambda: fn(text), ctx.repeat)
+                metrics = {'best_ms': best, 'median_ms': median}
+                results.append({'name': f'extract_response{method[8:]}', 'params': {'mb': megabytes, 'kind': kind}, 'metrics': metrics})
+                log(f"{method} {megabytes} MB {kind} {metrics}")
+    return results
+
+
+def bench_format_as_html(ctx):
+    window = ctx.window()
+    results = []
+    for kilobytes in HTML_KB:
+        text = make_markdown(kilobytes)
+        best, median, html = measure(lambda: window._format_as_html(text), ctx.repeat)
+        render_best, render_median, _ = measure(lambda: window.agent_resultEdit.setHtml(html), ctx.repeat)
+        metrics = {'best_ms': best, 'median_ms': median, 'set_html_best_ms': render_best, 'set_html_median_ms': render_median}
+        results.append({'name': 'format_as_html', 'params': {'kb': kilobytes}, 'metrics': metrics})
+        log(f"format_as_html {kilobytes} KB {metrics}")
+    return results
+
+
+def bench_open_file(ctx):
+    window = ctx.window()
+    paths = [make_source_file(ctx.fixtures, megabytes) for megabytes in OPEN_FILE_MB]
+    folder = os.path.dirname(paths[0])
+    window.opened_folder_path = folder
+    window.file_manager.load_folder_tree(window.file_list, folder)
+    model = window.file_manager.model
+    wait_until(lambda: all(model.index_for_path(path).isValid() for path in paths))
+    results = []
+    for path, megabytes in zip(paths, OPEN_FILE_MB):
+        opens, paints, loads = [], [], []
+        for _ in range(ctx.repeat):
+            settle()
+            index = model.index_for_path(path)
+            started = time.perf_counter()
+            window.open_file(index)
+            opens.append((time.perf_counter() - started) * 1000)
+            # 화면에 보이는 부분까지 그린 시점
+            window.code_input.viewport().repaint()
+            window.large_view.viewport().repaint()
+            paints.append((time.perf_counter() - started) * 1000)
+            buffer = window.buffer_manager.get(path)
+            if buffer is not None and buffer.large_index is not None:
+                # 대용량 파일은 줄 색인이 끝날 때까지
+                wait_until(lambda: buffer.large_index.done)
+            loads.append((time.perf_counter() - started) * 1000)
+            window._close_buffer(path)
+        metrics = {
+            'open_best_ms': min(opens), 'open_median_ms': statistics.median(opens),
+            'first_paint_best_ms': min(paints), 'first_paint_median_ms': statistics.median(paints),
+            'loaded_best_ms': min(loads), 'loaded_median_ms': statistics.median(loads),
+        }
+        results.append({'name': 'open_file', 'params': {'mb': megabytes}, 'metrics': metrics})
+        log(f"open_file {megabytes} MB {metrics}")
+    return results
+
+
+# ---------- 실행 ----------
+
+class Context:
+    def __init__(self, files, fixtures: str, repeat: int):
+        self.files = files
+        self.fixtures = fixtures
+        self.repeat = repeat
+        self.trees = {}
+        self._window = None
+
+    def only_files(self, files: int) -> 'Context':
+        ctx = Context([files], self.fixtures, self.repeat)
+        ctx.trees = self.trees
+        return ctx
+
+    def window(self):
+        if self._window is None:
+            from src.windows.editor_window import EditorWindow
+            self._window = EditorWindow()
+            self._window.resize(1400, 900)
+            self._window.show()
+            settle()
+        return self._window
+
+    def close(self):
+        for manager, view, root in self.trees.values():
+            manager.path_index.cancel()
+            manager.search_index.close()
+        if self._window is not None:
+            self._window.close()
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'pyqt': PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """baseline 대비 threshold 보다 느려진 지표를 출력한다. returns: 회귀가 있었는지"""
+    def key(result):
+        return result['name'], json.dumps(result['params'], sort_keys=True)
+
+    before = {key(r): r['metrics'] for r in baseline.get('results', [])}
+    regressed = False
+    log(f"\ncompared with {baseline.get('environment', {}).get('commit', '?')[:12]} (threshold {threshold:.0%})")
+    for result in current['results']:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        for metric, value in result['metrics'].items():
+            if not metric.endswith(('_ms', '_ns')) or not old.get(metric):
+                continue
+            change = value / old[metric] - 1
+            flag = 'REGRESSION' if change > threshold else ''
+            regressed = regressed or bool(flag)
+            log(f"{result['name']:<24} {key(result)[1]:<36} {metric:<22} {old[metric]:10.2f} -> {value:10.2f} ({change:+7.1%}) {flag}")
+    return regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="에디터 핫 패스 벤치마크")
+    parser.add_argument('--files', default=DEFAULT_FILES, help="파일 트리 크기들 (쉼표 구분, 예: 10000,100000,1000000)")
+    parser.add_argument('--only', default='', help=f"실행할 케이스 (쉼표 구분): {', '.join(CASES)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--fixtures', default=os.path.join(tempfile.gettempdir(), 'editor-bench-fixtures'))
+    parser.add_argument('--out', help="결과 JSON 파일 (없으면 표준 출력)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.1, help="회귀로 볼 느려짐 비율 (기본 0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in args.only.split(',') if c] or list(CASES)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case: {', '.join(sorted(unknown))}")
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    ctx = Context([int(n) for n in args.files.split(',') if n], args.fixtures, max(1, args.repeat))
+    os.makedirs(args.fixtures, exist_ok=True)
+    results = []
+    try:
+        for case in CASES:
+            if case in cases:
+                results.extend(globals()[f'bench_{case}'](ctx))
+    finally:
+        ctx.close()
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    report = {'environment': environment(), 'results': results}
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            if compare(report, json.load(f), args.threshold):
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+ModelManager 부하 테스트: 같은 프로세스에서 띄운 목 서버(mock_llm_server)에 동시 요청을 보내고 결과를 JSON 으로.
+
+    python benchmarks/llm_load_bench.py --requests 200 --concurrency 16 --stream \\
+        --latency-ms 200 --tokens-per-sec 200 --rate-limit-rate 0.1 --error-rate 0.05 [--cache --distinct 20]
+
+요청마다 전체 지연과 첫 토큰까지 시간(TTFT, --stream 일 때)을 재고 p50/p95/p99 를 낸다. 서버 통계(재시도를 포함한
+실제 요청 수, 429/500/끊김 수, 최대 동시 요청 수)와 응답 캐시 통계, ModelManager 텔레메트리 요약도 함께 적는다.
+--cache 면 temperature 0 으로 보내 --distinct 개의 서로 다른 프롬프트만 돌려 쓰므로 캐시 적중이 생긴다.
+--hedge 면 목 서버의 두 모델 별칭에 HedgedChat 으로 헤지해 보낸다. --slow-rate/--slow-ms 로 꼬리 지연을 만들어
+헤징 전후의 p99 를 비교할 수 있다:
+
+    python benchmarks/llm_load_bench.py --stream --slow-rate 0.05 --slow-ms 3000 [--hedge --hedge-delay-ms 400]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_llm_server import MockConfig, MockLLMServer
+
+
+def percentile(values, fraction: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(values):
+    return {
+        'p50_ms': percentile(values, 0.5),
+        'p95_ms': percentile(values, 0.95),
+        'p99_ms': percentile(values, 0.99),
+        'max_ms': max(values) if values else None,
+    }
+
+
+def run(args) -> dict:
+    config = MockConfig(args.latency_ms, args.jitter_ms, args.tokens_per_sec, args.error_rate, args.rate_limit_rate,
+                        args.max_concurrent, args.retry_after, args.drop_rate, args.reply_tokens,
+                        models=['mock-model', 'mock-model-b'], seed=args.seed, slow_rate=args.slow_rate, slow_ms=args.slow_ms)
+    server = MockLLMServer(config).start()
+    cache_dir = tempfile.mkdtemp(prefix='llm-load-bench-')
+    os.environ.update({
+        'LLM_LOCAL_URL': server.url,
+        'LLM_LOCAL_MODELS': 'mock-model,mock-model-b',
+        'EDITOR_CACHE_DIR': cache_dir,
+        'LLM_CACHE': '1' if args.cache else '0',
+        'LLM_MAX_RETRIES': str(args.max_retries),
+    })
+    from src.managers.model_manager import ModelManager
+    from src.managers.llm_hedging import HedgedChat
+    manager = ModelManager()
+    manager.pool_maxsize = max(manager.pool_maxsize, args.concurrency * 2)
+    hedger = None
+    if args.hedge:
+        hedger = HedgedChat(manager, ['mock-model', 'mock-model-b'], args.hedge_delay_ms, args.hedge_budget,
+                            max_inflight=args.hedge_max_inflight)
+    chat = hedger.chat if hedger is not None else manager.chat
+
+    lock = threading.Lock()
+    latencies, ttfts, failures = [], [], {}
+
+    def one(i: int):
+        prompt = f"request {i % args.distinct if args.distinct else i}: summarize the change"
+        messages = [{'role': 'user', 'content': prompt}]
+        first = []
+        started = time.perf_counter()
+
+        def on_token(delta):
+            if not first:
+                first.append(time.perf_counter())
+
+        ok, text = chat(messages, temperature=0.0 if args.cache else 0.2,
+                                on_token=on_token if args.stream else None)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+                if first:
+                    ttfts.append((first[0] - started) * 1000)
+            else:
+                key = text.split(':', 1)[0][:80]
+                failures[key] = failures.get(key, 0) + 1
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(one, range(args.requests)))
+        wall = time.perf_counter() - started
+        stats = server.stats()
+        cache = manager.cache_stats()
+        telemetry = manager.telemetry.summaries()
+        hedge = hedger.stats() if hedger is not None else None
+    finally:
+        manager.close()
+        server.stop()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return {
+        'config': {k: v for k, v in vars(args).items() if k != 'out'},
+        'results': {
+            'requests': args.requests,
+            'ok': len(latencies),
+            'failed': sum(failures.values()),
+            'failures': failures,
+            'wall_s': wall,
+            'throughput_rps': args.requests / wall if wall else None,
+            'latency': summarize(latencies),
+            'ttft': summarize(ttfts),
+            'server': stats,
+            'cache': cache,
+            'telemetry': telemetry,
+            'hedge': hedge,
+        },
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ModelManager 부하 테스트 (로컬 목 서버)")
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--stream', action='store_true')
+    parser.add_argument('--cache', action='store_true', help="응답 캐시를 켜고 temperature 0 으로 요청")
+    parser.add_argument('--distinct', type=int, default=0, help="서로 다른 프롬프트 수 (0 이면 모두 다름)")
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=200.0)
+    parser.add_argument('--jitter-ms', type=float, default=50.0)
+    parser.add_argument('--slow-rate', type=float, default=0.0, help="첫 바이트 전에 --slow-ms 만큼 더 멈출 비율")
+    parser.add_argument('--slow-ms', type=float, default=2000.0)
+    parser.add_argument('--hedge', action='store_true', help="두 모델 별칭에 헤지 요청")
+    parser.add_argument('--hedge-delay-ms', type=float, help="헤지 전 대기 (없으면 텔레메트리 p95)")
+    parser.add_argument('--hedge-budget', type=float, default=0.1, help="헤지할 수 있는 호출 비율")
+    parser.add_argument('--hedge-max-inflight', type=int, default=4)
+    parser.add_argument('--tokens-per-sec', type=float, default=200.0)
+    parser.add_argument('--reply-tokens', type=int, default=100)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--max-concurrent', type=int, default=0)
+    parser.add_argument('--retry-after', type=float, default=0.2)
+    parser.add_argument('--drop-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help="결과 JSON 파일 (없으면 표준 출력)")
+    args = parser.parse_args(argv)
+
+    text = json.dumps(run(args), indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
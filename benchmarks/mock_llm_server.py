@@ -0,0 +1,324 @@
+"""
+로컬 OpenAI 호환 chat completions 목 서버 (네트워크/키 없이 에이전트 경로를 돌려보기 위한 대역).
+
+    python benchmarks/mock_llm_server.py --port 8808 --latency-ms 300 --tokens-per-sec 80 --rate-limit-rate 0.1
+    LLM_LOCAL_URL=http://127.0.0.1:8808/v1 python main.py
+
+POST /v1/chat/completions 는 stream 여부에 따라 JSON 또는 SSE(chunked) 로 답하고, GET /v1/models 는
+모델 목록, GET /stats 는 지금까지의 요청/오류/429 수와 최대 동시 요청 수를 돌려준다.
+
+- 지연: 첫 바이트까지 --latency-ms(±--jitter-ms), 이후 --tokens-per-sec 속도로 토큰을 내보냄 (비스트리밍은 다 만든 뒤 한 번에)
+- 꼬리 지연: --slow-rate 비율의 요청은 첫 바이트 전에 --slow-ms 만큼 더 멈춤 (헤징 실험용)
+- 오류: --error-rate 비율로 500, --rate-limit-rate 비율 또는 동시 요청이 --max-concurrent 를 넘으면 429 (Retry-After: --retry-after)
+- 끊김: --drop-rate 비율로 스트림 중간에 연결을 끊음
+- 응답: 에이전트 프롬프트면 형식에 맞는 답(설명 + 원본 파일 그대로 / 빈 편집 블록), 아니면 --reply-tokens 개 단어,
+  --reply-file 을 주면 그 내용
+
+다른 벤치마크에서는 MockLLMServer(MockConfig(...)).start() 로 같은 프로세스 안에서 띄워 쓸 수 있다.
+"""
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+_TOKEN = re.compile(r'\s*\S+|\s+')
+_FENCE = re.compile(r'```[^\n]*\n([\s\S]*?)\n```')
+_WORDS = ('the', 'editor', 'model', 'returns', 'a', 'streamed', 'answer', 'with', 'tokens', 'for', 'testing')
+
+
+class MockConfig:
+    def __init__(self, latency_ms: float = 200.0, jitter_ms: float = 0.0, tokens_per_sec: float = 100.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, max_concurrent: int = 0,
+                 retry_after: float = 1.0, drop_rate: float = 0.0, reply_tokens: int = 200,
+                 reply: Optional[str] = None, models: Optional[List[str]] = None, seed: Optional[int] = None,
+                 slow_rate: float = 0.0, slow_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.drop_rate = drop_rate
+        self.reply_tokens = reply_tokens
+        self.reply = reply
+        self.models = models or ['mock-model']
+        self.seed = seed
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+
+
+def _reply_for(messages: List[Dict], config: MockConfig) -> str:
+    """요청에 대한 답 텍스트 (에이전트 프롬프트면 에이전트가 해석할 수 있는 형식)."""
+    if config.reply is not None:
+        return config.reply
+    system = next((m.get('content', '') for m in messages if m.get('role') == 'system'), '')
+    user = next((m.get('content', '') for m in reversed(messages) if m.get('role') == 'user'), '')
+    words = ' '.join(_WORDS[i % len(_WORDS)] for i in range(config.reply_tokens))
+    desc = f"<<BEGIN_DESC>>\n(mock) {words}\n<<END_DESC>>\n"
+    if '<<BEGIN_EDITS>>' in system:
+        # 빈 편집 블록 = 변경 없음
+        return desc + "<<BEGIN_EDITS>>\n<<END_EDITS>>\n"
+    if '<<BEGIN_FILE>>' in system:
+        fence = _FENCE.search(user)
+        return desc + f"<<BEGIN_FILE>>\n{fence.group(1) if fence else ''}\n<<END_FILE>>\n"
+    return words
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: 'MockLLMServer'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/') in ('/v1/models', '/models'):
+            self._json(200, {'object': 'list', 'data': [{'id': m, 'object': 'model'} for m in self.server.config.models]})
+        elif self.path.rstrip('/') == '/stats':
+            self._json(200, self.server.stats())
+        else:
+            self._json(404, {'error': {'message': f'unknown path {self.path}'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        if self.path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+            self._json(404, {'error': {'message': f'unknown path {self.path}'}})
+            return
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            self._json(400, {'error': {'message': 'invalid JSON'}})
+            return
+        server = self.server
+        config = server.config
+        active = server.enter()
+        try:
+            server.count('requests')
+            if (config.max_concurrent and active > config.max_concurrent) or server.chance(config.rate_limit_rate):
+                server.count('rate_limited')
+                self._json(429, {'error': {'message': 'rate limited (mock)', 'type': 'rate_limit'}},
+                           {'Retry-After': f'{config.retry_after:g}'})
+                return
+            if server.chance(config.error_rate):
+                server.count('errors')
+                self._json(500, {'error': {'message': 'internal error (mock)'}})
+                return
+            delay = config.latency_ms + server.jitter(config.jitter_ms)
+            if server.chance(config.slow_rate):
+                server.count('slow')
+                delay += config.slow_ms
+            time.sleep(max(0.0, delay) / 1000)
+            text = _reply_for(request.get('messages') or [], config)
+            tokens = _TOKEN.findall(text)
+            max_tokens = request.get('max_tokens')
+            if max_tokens:
+                tokens = tokens[:max_tokens]
+            model = request.get('model') or config.models[0]
+            if request.get('stream'):
+                if not self._stream(model, tokens, self._usage(request, tokens)):
+                    return
+            else:
+                if config.tokens_per_sec > 0:
+                    time.sleep(len(tokens) / config.tokens_per_sec)
+                self._json(200, {
+                    'id': f'chatcmpl-mock-{server.next_id()}',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': model,
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ''.join(tokens)}, 'finish_reason': 'stop'}],
+                    'usage': self._usage(request, tokens),
+                })
+            server.count('completed')
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트 취소 (헤징에서 진 요청 등)
+            server.count('disconnected')
+            self.close_connection = True
+        finally:
+            server.leave()
+
+    def _stream(self, model: str, tokens: List[str], usage: Dict[str, int]) -> bool:
+        """SSE 로 토큰을 내보낸다. returns: 끝까지 보냈는지 (--drop-rate 로 끊었으면 False)"""
+        server = self.server
+        config = server.config
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        completion_id = f'chatcmpl-mock-{server.next_id()}'
+        drop_at = server.randint(0, max(0, len(tokens) - 1)) if server.chance(config.drop_rate) else None
+
+        def chunk(delta: Dict, finish: Optional[str] = None) -> str:
+            event = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()), 'model': model,
+                     'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish}]}
+            if finish:
+                # 마지막 조각에 usage (OpenAI 의 stream_options.include_usage 와 같은 정보)
+                event['usage'] = usage
+            return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+        self._write_chunk(chunk({'role': 'assistant'}))
+        started = time.perf_counter()
+        sent = 0
+        while sent < len(tokens):
+            if drop_at is not None and sent >= drop_at:
+                server.count('dropped')
+                self.close_connection = True
+                return False
+            # 토큰 속도에 맞춰 지금까지 나가야 할 만큼을 한 번에 (sleep 해상도보다 빠른 속도도 지킴)
+            due = len(tokens) if config.tokens_per_sec <= 0 else int((time.perf_counter() - started) * config.tokens_per_sec) + 1
+            due = min(len(tokens), max(due, sent + 1))
+            if drop_at is not None:
+                due = min(due, drop_at)
+            self._write_chunk(''.join(chunk({'content': token}) for token in tokens[sent:due]))
+            sent = due
+            if sent < len(tokens) and config.tokens_per_sec > 0:
+                time.sleep(max(0.0, sent / config.tokens_per_sec - (time.perf_counter() - started)))
+        self._write_chunk(chunk({}, 'stop') + "data: [DONE]\n\n")
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+        return True
+
+    def _write_chunk(self, text: str):
+        data = text.encode('utf-8')
+        self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+    def _json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def _usage(request: Dict, tokens: List[str]) -> Dict[str, int]:
+        prompt = sum(len(_TOKEN.findall(m.get('content') or '')) for m in request.get('messages') or [])
+        return {'prompt_tokens': prompt, 'completion_tokens': len(tokens), 'total_tokens': prompt + len(tokens)}
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.config = config or MockConfig()
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._active = 0
+        self._ids = 0
+        self._stats = {'requests': 0, 'completed': 0, 'rate_limited': 0, 'errors': 0, 'dropped': 0, 'disconnected': 0, 'slow': 0, 'max_active': 0}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'MockLLMServer':
+        """백그라운드 스레드에서 서비스 시작."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def handle_error(self, request, client_address):
+        # keep-alive 연결을 클라이언트가 닫은 것은 오류로 출력하지 않는다
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, active=self._active)
+
+    # ---- 요청 스레드에서 호출 ----
+
+    def enter(self) -> int:
+        with self._lock:
+            self._active += 1
+            self._stats['max_active'] = max(self._stats['max_active'], self._active)
+            return self._active
+
+    def leave(self):
+        with self._lock:
+            self._active -= 1
+
+    def count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def next_id(self) -> int:
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def randint(self, low: int, high: int) -> int:
+        with self._lock:
+            return self._random.randint(low, high)
+
+    def jitter(self, amount: float) -> float:
+        if amount <= 0:
+            return 0.0
+        with self._lock:
+            return self._random.uniform(-amount, amount)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 OpenAI 호환 목 LLM 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8808)
+    parser.add_argument('--latency-ms', type=float, default=200.0, help="첫 바이트까지 지연")
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--slow-rate', type=float, default=0.0, help="첫 바이트 전에 --slow-ms 만큼 더 멈출 비율")
+    parser.add_argument('--slow-ms', type=float, default=2000.0)
+    parser.add_argument('--tokens-per-sec', type=float, default=100.0, help="0 이면 제한 없음")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500 으로 답할 비율")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="429 로 답할 비율")
+    parser.add_argument('--max-concurrent', type=int, default=0, help="넘으면 429 (0 이면 제한 없음)")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="429 의 Retry-After (초)")
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="스트림 중간에 끊을 비율")
+    parser.add_argument('--reply-tokens', type=int, default=200)
+    parser.add_argument('--reply-file', help="항상 이 파일 내용으로 답함")
+    parser.add_argument('--models', default='mock-model', help="쉼표 구분 모델 이름")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    reply = None
+    if args.reply_file:
+        with open(args.reply_file, encoding='utf-8') as f:
+            reply = f.read()
+    config = MockConfig(args.latency_ms, args.jitter_ms, args.tokens_per_sec, args.error_rate, args.rate_limit_rate,
+                        args.max_concurrent, args.retry_after, args.drop_rate, args.reply_tokens, reply,
+                        [m for m in args.models.split(',') if m], args.seed, args.slow_rate, args.slow_ms)
+    server = MockLLMServer(config, args.host, args.port)
+    print(f"mock LLM server on {server.url}  (LLM_LOCAL_URL={server.url} LLM_LOCAL_MODELS={args.models})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
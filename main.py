@@ -1,9 +1,59 @@
 import sys
+import time
+
+# --profile-startup 의 기준 시각 (PyQt/에디터 모듈 import 전)
+START_TIME = time.perf_counter()
+
+from PyQt5.QtCore import QObject, QEvent, QTimer
 from PyQt5.QtWidgets import QApplication
-from src.windows.editor_window import EditorWindow
+
+
+"""
+--profile-startup: 시작 단계별 시간과 첫 화면 표시(첫 paint 이벤트, 그 프레임을 다 그린 시점)까지의
+시간을 출력하고 종료한다. import 별 시간은 python -X importtime main.py --profile-startup 으로 볼 수 있다.
+"""
+class StartupProfiler(QObject):
+    def __init__(self):
+        super().__init__()
+        self.marks = []
+        self._painted = False
+
+    def mark(self, name: str):
+        self.marks.append((name, time.perf_counter()))
+
+    def eventFilter(self, obj, event):
+        if not self._painted and event.type() == QEvent.Paint:
+            self._painted = True
+            self.mark('first paint')
+            # 같은 프레임의 나머지 paint 이벤트가 처리된 뒤
+            QTimer.singleShot(0, self._on_frame_done)
+        return False
+
+    def _on_frame_done(self):
+        self.mark('first frame')
+        self.report()
+        QApplication.instance().quit()
+
+    def report(self):
+        previous = START_TIME
+        for name, at in self.marks:
+            print(f"{name:<16} {(at - previous) * 1000:8.1f} ms  (total {(at - START_TIME) * 1000:8.1f} ms)")
+            previous = at
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    profiler = StartupProfiler() if '--profile-startup' in sys.argv else None
+    if profiler:
+        profiler.mark('qapplication')
+        app.installEventFilter(profiler)
+    from src.windows.editor_window import EditorWindow
+    if profiler:
+        profiler.mark('import editor')
     window = EditorWindow()
+    if profiler:
+        profiler.mark('create window')
     window.show()
-    app.exec_()
\ No newline at end of file
+    if profiler:
+        profiler.mark('show')
+    app.exec_()
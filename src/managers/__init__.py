@@ -1,11 +1,52 @@
 from .file_manager import FileManager
 from .terminal_manager import TerminalManager
+from .terminal_buffer import ScrollbackBuffer, OutputCoalescer
+from .ansi_parser import AnsiParser
+from .shell_pool import ShellPool
 from .model_manager import ModelManager
+from .llm_providers import OpenAICompatibleProvider
+from .llm_telemetry import LLMTelemetry, CallMetrics
+from .llm_hedging import HedgedChat
 from .agent_manager import AgentManager
+from .agent_runner import AgentRunner
+from .response_cache import ResponseCache
+from .edit_applier import EditApplier
+from .agent_stream_parser import AgentStreamParser
+from .retrieval_index import RetrievalIndex
+from .ignore_rules import IgnoreRules
+from .file_tree_model import FileTreeModel
+from .large_file import LargeFileIndex
+from .file_saver import FileSaver
+from .buffer_manager import BufferManager, Buffer
+from .path_index import PathIndex
+from .trigram_index import TrigramIndex
+from .text_search import TextSearch
 
 __all__ = [
 	'FileManager',
 	'TerminalManager',
+	'ScrollbackBuffer',
+	'OutputCoalescer',
+	'AnsiParser',
+	'ShellPool',
 	'ModelManager',
+	'OpenAICompatibleProvider',
+	'LLMTelemetry',
+	'CallMetrics',
+	'HedgedChat',
 	'AgentManager',
+	'AgentRunner',
+	'ResponseCache',
+	'EditApplier',
+	'AgentStreamParser',
+	'RetrievalIndex',
+	'IgnoreRules',
+	'FileTreeModel',
+	'LargeFileIndex',
+	'FileSaver',
+	'BufferManager',
+	'Buffer',
+	'PathIndex',
+	'TrigramIndex',
+	'TextSearch',
 ]
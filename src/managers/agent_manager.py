@@ -1,5 +1,10 @@
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import os
+import re
+from .edit_applier import EditApplier
+from .code_chunker import CodeChunker
+from .languages import language_for
+from .llm_hedging import HedgedChat
 
 """파일 기반 에이전트 프롬프트 구성 및 응답 파싱"""
 class AgentManager:
@@ -7,13 +12,64 @@ class AgentManager:
     CODE_END = "<<END_FILE>>"
     DESC_BEGIN = "<<BEGIN_DESC>>"
     DESC_END = "<<END_DESC>>"
+    EDITS_BEGIN = "<<BEGIN_EDITS>>"
+    EDITS_END = "<<END_EDITS>>"
+    REGION_BEGIN = "<<BEGIN_REGION {}>>"
+    REGION_END = "<<END_REGION>>"
+
+    # 편집 프로토콜: 'full' = 전체 파일 재생성, 'edits' = SEARCH/REPLACE 블록
+    MODE_FULL = 'full'
+    MODE_EDITS = 'edits'
+    MODE_CHUNKS = 'chunks'
+    # 이 줄 수 이상이면 SEARCH/REPLACE 블록 방식 사용
+    EDIT_MODE_MIN_LINES = 150
+    # 이 줄 수 이상이면 관련 영역 + 개요만 보내는 청크 방식 사용
+    CHUNK_MODE_MIN_LINES = 2000
+    # 청크 방식에서 모델에 보낼 최대 코드 줄 수
+    CHUNK_BUDGET_LINES = 600
+    # 프로젝트 검색으로 덧붙일 참고 코드 예산 (대략 토큰 * 4 = 문자)
+    CONTEXT_BUDGET_TOKENS = 2000
+    CONTEXT_TOP_K = 6
+    # 코드 수정은 결정적으로 받는다 (같은 요청을 다시 보내면 응답 캐시에서 바로 답함)
+    TEMPERATURE = 0.0
 
     def __init__(self, model_manager):
         self.model_manager = model_manager
+        self.chunker = CodeChunker()
+        # 프로젝트 검색 인덱스 (RetrievalIndex). 폴더를 열면 에디터가 연결한다.
+        self.retriever = None
+        # $LLM_HEDGE_ALIASES 가 있으면 같은 요청을 여러 모델에 경쟁시킨다 (HedgedChat, 없으면 None)
+        self.hedger = HedgedChat.from_env(model_manager)
+
+    def run(self, user_prompt: str, file_path: str, file_content: str, on_token: Optional[Callable[[str], None]] = None, cancel_token=None, mode: Optional[str] = None, cursor_line: Optional[int] = None) -> Tuple[bool, str, str, str]:
+        mode = mode or self._choose_mode(file_content)
+        if mode == self.MODE_CHUNKS:
+            return self._run_chunks(user_prompt, file_path, file_content, on_token, cancel_token, cursor_line)
+        if mode == self.MODE_EDITS:
+            messages = self._attach_project_context(self._build_edit_messages(user_prompt, file_path, file_content), user_prompt, file_path)
+            ok, result = self._chat(messages, on_token, cancel_token, lambda text: self._edits_apply(text, file_content))
+            if not ok:
+                return False, result, "", ""
+            extracted_desc = self._extract_desc(result)
+            blocks = EditApplier.parse(self._extract_edits(result))
+            if blocks:
+                applied, new_content, error = EditApplier.apply(file_content, blocks)
+                if applied:
+                    return True, result, new_content, extracted_desc
+            elif self.EDITS_BEGIN in result and self.EDITS_END in result:
+                # 블록을 비워 보낸 경우: 적용할 변경 없음
+                return True, result, file_content, extracted_desc
+            else:
+                error = "편집 블록이 없습니다."
+            # 적용 실패 시 전체 파일 방식으로 재시도 (스트리밍 중이면 on_token 으로 알림)
+            if cancel_token is not None and cancel_token.cancelled:
+                return False, self.model_manager.CANCELLED_MESSAGE, "", ""
+            if on_token is not None:
+                on_token(f"\n\n[편집 블록 적용 실패: {error} 전체 파일 방식으로 다시 요청합니다]\n\n")
 
-    def run(self, user_prompt: str, file_path: str, file_content: str) -> Tuple[bool, str, str, str]:
-        messages = self._build_messages(user_prompt, file_path, file_content)
-        ok, result = self.model_manager.chat(messages)
+        messages = self._attach_project_context(self._build_messages(user_prompt, file_path, file_content), user_prompt, file_path)
+        # on_token 이 있으면 스트리밍으로 받아 조각 단위로 전달
+        ok, result = self._chat(messages, on_token, cancel_token, lambda text: bool(self._extract_code(text)))
         if not ok:
             return False, result, "", ""
         # 코드와 설명 각각 추출
@@ -22,6 +78,64 @@ class AgentManager:
         print("Extracted Description:", extracted_desc)
         return True, result, extracted_code, extracted_desc
 
+    def _chat(self, messages: List[Dict[str, str]], on_token, cancel_token, validate: Callable[[str], bool]) -> Tuple[bool, str]:
+        """헤징이 켜져 있으면 validate 를 통과한 첫 응답을, 아니면 기본 모델의 응답을 받는다."""
+        if self.hedger is not None:
+            return self.hedger.chat(messages, temperature=self.TEMPERATURE, on_token=on_token,
+                                    cancel_token=cancel_token, validate=validate)
+        return self.model_manager.chat(messages, temperature=self.TEMPERATURE, on_token=on_token, cancel_token=cancel_token)
+
+    def _edits_apply(self, text: str, file_content: str) -> bool:
+        """편집 블록이 원본에 그대로 적용되는지 (블록을 비워 보낸 경우도 유효)"""
+        blocks = EditApplier.parse(self._extract_edits(text))
+        if not blocks:
+            return self.EDITS_BEGIN in text and self.EDITS_END in text
+        return EditApplier.apply(file_content, blocks)[0]
+
+    def _choose_mode(self, file_content: str) -> str:
+        # 작은 파일은 전체 재생성이 더 안정적이고, 큰 파일은 출력 토큰을 줄이기 위해 블록 방식,
+        # 아주 큰 파일은 입력 자체를 줄이기 위해 청크 방식
+        line_count = file_content.count('\n') + 1
+        if line_count >= self.CHUNK_MODE_MIN_LINES:
+            return self.MODE_CHUNKS
+        if line_count >= self.EDIT_MODE_MIN_LINES:
+            return self.MODE_EDITS
+        return self.MODE_FULL
+
+    def _run_chunks(self, user_prompt: str, file_path: str, file_content: str, on_token, cancel_token, cursor_line: Optional[int]) -> Tuple[bool, str, str, str]:
+        """관련 영역만 보내고, 돌려받은 영역을 원본 파일의 같은 위치에 다시 끼워 넣는다."""
+        language = self._guess_language(os.path.basename(file_path))
+        lines = file_content.split('\n')
+        chunks = self.chunker.split(file_content, language)
+        selected = self.chunker.select(chunks, lines, user_prompt, cursor_line, self.CHUNK_BUDGET_LINES)
+        spans = self.chunker.regions(selected)
+
+        messages = self._build_chunk_messages(user_prompt, file_path, lines, self.chunker.outline(chunks), spans)
+        messages = self._attach_project_context(messages, user_prompt, file_path)
+        ok, result = self._chat(messages, on_token, cancel_token, lambda text: self.DESC_END in text or self.REGION_END in text)
+        if not ok:
+            return False, result, "", ""
+        extracted_desc = self._extract_desc(result)
+        replacements = self._extract_regions(result, len(spans))
+        if not replacements:
+            # 영역을 하나도 돌려주지 않았다면 변경 없음으로 간주
+            return True, result, file_content, extracted_desc
+        return True, result, self.chunker.splice(lines, spans, replacements), extracted_desc
+
+    def _attach_project_context(self, messages: List[Dict[str, str]], user_prompt: str, file_path: str) -> List[Dict[str, str]]:
+        """검색 인덱스가 있으면 프롬프트와 관련된 다른 파일의 코드 조각을 user 메시지 앞에 붙인다."""
+        if self.retriever is None or not self.retriever.ready:
+            return messages
+        snippets = self.retriever.snippets(user_prompt, self.CONTEXT_BUDGET_TOKENS * 4, k=self.CONTEXT_TOP_K, exclude=file_path)
+        if not snippets:
+            return messages
+        parts = ["참고용 프로젝트 코드 (수정 대상 아님, 필요할 때만 활용하세요):"]
+        for rel, start, end, text in snippets:
+            parts.append(f"--- {rel} (줄 {start + 1}-{end}) ---\n{text.rstrip()}")
+        context = '\n\n'.join(parts) + "\n\n"
+        messages[-1] = dict(messages[-1], content=context + messages[-1]['content'])
+        return messages
+
     def _build_messages(self, user_prompt: str, file_path: str, file_content: str) -> List[Dict[str, str]]:
         filename = os.path.basename(file_path)
         language = self._guess_language(filename)
@@ -61,6 +175,114 @@ class AgentManager:
             { 'role': 'user', 'content': user },
         ]
 
+    def _build_edit_messages(self, user_prompt: str, file_path: str, file_content: str) -> List[Dict[str, str]]:
+        filename = os.path.basename(file_path)
+        language = self._guess_language(filename)
+
+        system = (
+            "당신은 정확한 리팩토링과 버그 수정을 수행하는 전문 소프트웨어 엔지니어입니다. "
+            "사용자로부터 파일의 전체 내용과 지시사항을 받게 됩니다. "
+            "파일 전체를 다시 쓰지 말고, 바꿀 부분만 SEARCH/REPLACE 블록으로 반환하세요. "
+            f"설명은 반드시 {self.DESC_BEGIN}와 {self.DESC_END} 사이에 마크다운 형식으로 작성하세요. "
+            f"편집 블록은 반드시 {self.EDITS_BEGIN}와 {self.EDITS_END} 사이에 작성하세요. "
+            "SEARCH 부분은 원본 파일에 있는 줄을 공백까지 그대로 복사해야 하며, 파일 안에서 한 곳만 가리키도록 충분한 줄을 포함하세요. "
+            "마커 안에는 추가 설명이나 백틱(```)을 포함하지 마세요. "
+            "모든 설명은 한글로 작성하세요."
+        )
+
+        user = (
+            f"작업: {user_prompt}\n\n"
+            f"파일 경로: {file_path}\n"
+            f"언어: {language}\n\n"
+            "원본 파일 내용:\n" \
+            "```" + language + "\n" + file_content + "\n```\n\n" \
+            "제약 사항:\n" \
+            "- 변경이 필요한 부분만 블록으로 작성하세요. 블록은 파일 위에서 아래 순서로 나열하세요.\n" \
+            "- 새 코드를 파일 끝에 추가하려면 SEARCH 부분을 비워두세요.\n" \
+            "- 작업을 적용할 수 없는 경우 편집 블록을 비워두세요.\n\n" \
+            "반환 형식 (필수):\n" \
+            f"{self.DESC_BEGIN}\n" \
+            "<무엇이 변경되었고 왜 변경되었는지 한글로 설명. 마크다운 형식 사용 가능 (**, *, -, > 등)>\n" \
+            f"{self.DESC_END}\n\n" \
+            f"{self.EDITS_BEGIN}\n" \
+            f"{EditApplier.SEARCH}\n" \
+            "<원본 코드 줄>\n" \
+            f"{EditApplier.DIVIDER}\n" \
+            "<바뀐 코드 줄>\n" \
+            f"{EditApplier.REPLACE}\n" \
+            f"{self.EDITS_END}"
+        )
+
+        return [
+            { 'role': 'system', 'content': system },
+            { 'role': 'user', 'content': user },
+        ]
+
+    def _build_chunk_messages(self, user_prompt: str, file_path: str, lines: List[str], outline: str, spans: List[Tuple[int, int]]) -> List[Dict[str, str]]:
+        filename = os.path.basename(file_path)
+        language = self._guess_language(filename)
+
+        system = (
+            "당신은 정확한 리팩토링과 버그 수정을 수행하는 전문 소프트웨어 엔지니어입니다. "
+            "파일이 매우 커서 전체 구조 개요와 작업에 관련된 영역만 전달됩니다. "
+            "각 영역은 번호가 붙은 마커로 감싸져 있습니다. "
+            "수정이 필요한 영역만 같은 번호의 마커로 감싸 그 영역의 전체 새 내용을 반환하세요. "
+            f"설명은 반드시 {self.DESC_BEGIN}와 {self.DESC_END} 사이에 마크다운 형식으로 작성하세요. "
+            "마커 안에는 추가 설명이나 백틱(```)을 포함하지 마세요. "
+            "모든 설명은 한글로 작성하세요."
+        )
+
+        regions = []
+        for index, (start, end) in enumerate(spans):
+            regions.append(
+                f"{self.REGION_BEGIN.format(index)} (줄 {start + 1}-{end})\n"
+                + '\n'.join(lines[start:end]) + "\n"
+                + self.REGION_END
+            )
+
+        user = (
+            f"작업: {user_prompt}\n\n"
+            f"파일 경로: {file_path}\n"
+            f"언어: {language}\n"
+            f"전체 줄 수: {len(lines)}\n\n"
+            "파일 개요 (줄 범위: 종류 이름):\n" + outline + "\n\n"
+            "관련 영역:\n" + '\n\n'.join(regions) + "\n\n"
+            "제약 사항:\n" \
+            "- 전달되지 않은 영역은 수정할 수 없습니다. 필요한 경우 설명에 적어주세요.\n" \
+            "- 수정한 영역은 생략 없이 영역 전체 내용을 반환하세요.\n" \
+            "- 수정하지 않은 영역은 반환하지 마세요.\n\n" \
+            "반환 형식 (필수):\n" \
+            f"{self.DESC_BEGIN}\n" \
+            "<무엇이 변경되었고 왜 변경되었는지 한글로 설명. 마크다운 형식 사용 가능 (**, *, -, > 등)>\n" \
+            f"{self.DESC_END}\n\n" \
+            f"{self.REGION_BEGIN.format('<번호>')}\n" \
+            "<수정된 영역 전체 내용>\n" \
+            f"{self.REGION_END}"
+        )
+
+        return [
+            { 'role': 'system', 'content': system },
+            { 'role': 'user', 'content': user },
+        ]
+
+    def _extract_regions(self, text: str, count: int) -> Dict[int, str]:
+        regions: Dict[int, str] = {}
+        for match in re.finditer(r"<<BEGIN_REGION (\d+)>>[^\n]*\n([\s\S]*?)\n?<<END_REGION>>", text):
+            index = int(match.group(1))
+            if 0 <= index < count:
+                regions[index] = match.group(2)
+        return regions
+
+    def _extract_edits(self, text: str) -> str:
+        start = text.find(self.EDITS_BEGIN)
+        if start == -1:
+            # 마커 없이 블록만 보낸 경우도 허용
+            return text
+        end = text.find(self.EDITS_END, start)
+        if end == -1:
+            return text[start + len(self.EDITS_BEGIN):]
+        return text[start + len(self.EDITS_BEGIN):end]
+
     def _extract_code(self, text: str) -> str:
         # 우선 지정 마커로 추출
         start = text.find(self.CODE_BEGIN)
@@ -68,7 +290,6 @@ class AgentManager:
         if start != -1 and end != -1 and end > start:
             return text[start + len(self.CODE_BEGIN):end].strip('\n')
 
-        import re
         fence = re.search(r"```[a-zA-Z0-9_+-]*\n([\s\S]*?)```", text)
         if fence:
             return fence.group(1).strip('\n')
@@ -87,17 +308,4 @@ class AgentManager:
 
     @staticmethod
     def _guess_language(filename: str) -> str:
-        ext = os.path.splitext(filename)[1].lower()
-        return {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.json': 'json',
-            '.md': 'markdown',
-            '.c': 'c',
-            '.cpp': 'cpp',
-            '.h': 'c',
-            '.java': 'java',
-            '.html': 'html',
-            '.css': 'css',
-        }.get(ext, '')
+        return language_for(filename)
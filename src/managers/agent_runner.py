@@ -0,0 +1,104 @@
+import itertools
+from typing import Dict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .model_manager import CancelToken
+
+
+"""워커 스레드 -> GUI 스레드 시그널 중계 객체"""
+class _TaskSignals(QObject):
+    token = pyqtSignal(int, str)
+    finished = pyqtSignal(int, bool, str, str, str)
+
+
+"""AgentManager.run 을 QThreadPool 위에서 실행하는 작업 단위"""
+class _AgentTask(QRunnable):
+    def __init__(self, task_id: int, agent_manager, user_prompt: str, file_path: str, file_content: str, cancel_token: CancelToken, cursor_line=None):
+        super().__init__()
+        self.task_id = task_id
+        self.agent_manager = agent_manager
+        self.user_prompt = user_prompt
+        self.file_path = file_path
+        self.file_content = file_content
+        self.cancel_token = cancel_token
+        self.cursor_line = cursor_line
+        self.signals = _TaskSignals()
+        # 시그널 객체 수명은 러너가 관리
+        self.setAutoDelete(True)
+
+    def run(self):
+        try:
+            ok, raw, code, desc = self.agent_manager.run(
+                self.user_prompt,
+                self.file_path,
+                self.file_content,
+                on_token=lambda delta: self.signals.token.emit(self.task_id, delta),
+                cancel_token=self.cancel_token,
+                cursor_line=self.cursor_line,
+            )
+        except Exception as e:
+            ok, raw, code, desc = False, f"에이전트 실행 실패: {str(e)}", "", ""
+        self.signals.finished.emit(self.task_id, ok, raw, code, desc)
+
+
+"""
+에이전트 요청 백그라운드 실행기.
+
+- submit() 으로 요청을 스레드 풀에 올리고 task_id 를 돌려받는다 (동시에 여러 개 가능)
+- token_received(task_id, delta): 스트리밍 토큰
+- task_finished(task_id, ok, raw, code, desc): AgentManager.run 결과
+- cancel(task_id) / cancel_all(): 진행 중 HTTP 요청을 닫아 즉시 중단
+"""
+class AgentRunner(QObject):
+    token_received = pyqtSignal(int, str)
+    task_finished = pyqtSignal(int, bool, str, str, str)
+    active_count_changed = pyqtSignal(int)
+
+    def __init__(self, agent_manager, max_concurrent: int = 4):
+        super().__init__()
+        self.agent_manager = agent_manager
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_concurrent)
+        self._ids = itertools.count(1)
+        # task_id -> (CancelToken, _TaskSignals)
+        self._tasks: Dict[int, tuple] = {}
+
+    def submit(self, user_prompt: str, file_path: str, file_content: str, cursor_line=None) -> int:
+        task_id = next(self._ids)
+        token = CancelToken()
+        task = _AgentTask(task_id, self.agent_manager, user_prompt, file_path, file_content, token, cursor_line)
+        task.signals.token.connect(self.token_received)
+        task.signals.finished.connect(self._on_task_finished)
+        self._tasks[task_id] = (token, task.signals)
+        self.pool.start(task)
+        self.active_count_changed.emit(len(self._tasks))
+        return task_id
+
+    def cancel(self, task_id: int) -> bool:
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            return False
+        entry[0].cancel()
+        return True
+
+    def cancel_all(self):
+        for token, _ in list(self._tasks.values()):
+            token.cancel()
+
+    def active_count(self) -> int:
+        return len(self._tasks)
+
+    def is_cancelled(self, task_id: int) -> bool:
+        entry = self._tasks.get(task_id)
+        return bool(entry and entry[0].cancelled)
+
+    def shutdown(self, timeout_ms: int = 2000):
+        """창 종료 시 호출: 모든 요청을 취소하고 워커 종료를 잠시 기다린다."""
+        self.cancel_all()
+        self.pool.waitForDone(timeout_ms)
+
+    def _on_task_finished(self, task_id: int, ok: bool, raw: str, code: str, desc: str):
+        # 수신 측이 is_cancelled(task_id) 로 사용자 취소인지 확인할 수 있도록 알린 뒤에 제거
+        self.task_finished.emit(task_id, ok, raw, code, desc)
+        self._tasks.pop(task_id, None)
+        self.active_count_changed.emit(len(self._tasks))
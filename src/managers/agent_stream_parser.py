@@ -0,0 +1,170 @@
+from typing import List, Tuple
+
+
+"""
+스트리밍 에이전트 응답용 증분 파서.
+
+AgentManager 의 <<BEGIN_DESC>>/<<BEGIN_FILE>>/<<BEGIN_EDITS>> 마커와 ``` 펜스 대체 형식을
+조각 단위로 받아 상태 기계로 처리한다. 청크 경계에 걸친 마커는 마커의 접두사가 될 수 있는
+꼬리만 보류했다가 다음 청크와 합쳐 판단하므로, 누적 버퍼 전체를 다시 훑지 않는다.
+
+feed() 는 (종류, 조각) 이벤트 목록을 돌려준다.
+    'desc' / 'code' / 'edits' : 각 블록 내용 조각
+    'desc_reset' / 'code_reset' : 이전에 보낸 내용을 버려야 함 (재시도 응답, 마커가 펜스보다 우선)
+"""
+class AgentStreamParser:
+    DESC_BEGIN = "<<BEGIN_DESC>>"
+    DESC_END = "<<END_DESC>>"
+    CODE_BEGIN = "<<BEGIN_FILE>>"
+    CODE_END = "<<END_FILE>>"
+    EDITS_BEGIN = "<<BEGIN_EDITS>>"
+    EDITS_END = "<<END_EDITS>>"
+    FENCE = "```"
+
+    OUTSIDE = 'outside'
+    DESC = 'desc'
+    CODE = 'code'
+    EDITS = 'edits'
+    FENCE_HEADER = 'fence_header'
+    FENCE_BODY = 'fence'
+
+    def __init__(self):
+        self.state = self.OUTSIDE
+        self._pending = ""
+        self._skip_newline = False
+        self._desc_parts: List[str] = []
+        self._code_parts: List[str] = []
+        self._edits_parts: List[str] = []
+        self._seen_desc = False
+        self._seen_code_marker = False
+        self._seen_fence = False
+
+    # ---------- public ----------
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        events: List[Tuple[str, str]] = []
+        text = self._pending + chunk
+        self._pending = ""
+        pos = 0
+        length = len(text)
+        while pos < length:
+            markers = self._markers_for_state()
+            hit, marker = self._find_first(text, pos, markers)
+            if hit == -1:
+                # 마커의 접두사일 수 있는 꼬리는 다음 청크까지 보류
+                keep = self._partial_suffix(text, pos, markers)
+                self._emit(events, text[pos:length - keep])
+                self._pending = text[length - keep:]
+                break
+            self._emit(events, text[pos:hit])
+            pos = hit + len(marker)
+            self._transition(marker, events)
+        return events
+
+    def finish(self) -> List[Tuple[str, str]]:
+        """스트림 종료: 보류 중이던 꼬리를 현재 블록 내용으로 내보낸다."""
+        events: List[Tuple[str, str]] = []
+        if self._pending:
+            self._emit(events, self._pending)
+            self._pending = ""
+        return events
+
+    @property
+    def desc(self) -> str:
+        return ''.join(self._desc_parts).strip()
+
+    @property
+    def code(self) -> str:
+        return ''.join(self._code_parts).strip('\n')
+
+    @property
+    def edits(self) -> str:
+        return ''.join(self._edits_parts)
+
+    # ---------- internals ----------
+    def _markers_for_state(self) -> Tuple[str, ...]:
+        if self.state == self.DESC:
+            return (self.DESC_END,)
+        if self.state == self.CODE:
+            return (self.CODE_END,)
+        if self.state == self.EDITS:
+            return (self.EDITS_END,)
+        if self.state == self.FENCE_HEADER:
+            return ("\n",)
+        if self.state == self.FENCE_BODY:
+            return (self.FENCE,)
+        # 마커가 이미 나왔거나 펜스를 한 번 읽었다면 더 이상 펜스를 코드로 보지 않음
+        if self._seen_code_marker or self._seen_fence:
+            return (self.DESC_BEGIN, self.CODE_BEGIN, self.EDITS_BEGIN)
+        return (self.DESC_BEGIN, self.CODE_BEGIN, self.EDITS_BEGIN, self.FENCE)
+
+    @staticmethod
+    def _find_first(text: str, pos: int, markers: Tuple[str, ...]) -> Tuple[int, str]:
+        best, best_marker = -1, ""
+        for marker in markers:
+            i = text.find(marker, pos)
+            if i != -1 and (best == -1 or i < best):
+                best, best_marker = i, marker
+        return best, best_marker
+
+    @staticmethod
+    def _partial_suffix(text: str, pos: int, markers: Tuple[str, ...]) -> int:
+        """text[pos:] 의 접미사 중 어떤 마커의 (완전하지 않은) 접두사인 가장 긴 길이."""
+        longest = 0
+        avail = len(text) - pos
+        for marker in markers:
+            for k in range(min(len(marker) - 1, avail), longest, -1):
+                if text.endswith(marker[:k]):
+                    longest = k
+                    break
+        return longest
+
+    def _emit(self, events: List[Tuple[str, str]], fragment: str):
+        if not fragment:
+            return
+        if self._skip_newline:
+            self._skip_newline = False
+            if fragment[0] == '\n':
+                fragment = fragment[1:]
+                if not fragment:
+                    return
+        if self.state == self.DESC:
+            self._desc_parts.append(fragment)
+            events.append(('desc', fragment))
+        elif self.state in (self.CODE, self.FENCE_BODY):
+            self._code_parts.append(fragment)
+            events.append(('code', fragment))
+        elif self.state == self.EDITS:
+            self._edits_parts.append(fragment)
+            events.append(('edits', fragment))
+        # OUTSIDE / FENCE_HEADER 텍스트는 버림
+
+    def _transition(self, marker: str, events: List[Tuple[str, str]]):
+        self._skip_newline = False
+        if self.state == self.OUTSIDE:
+            if marker == self.DESC_BEGIN:
+                if self._seen_desc:
+                    # 두 번째 응답(재시도) 시작: 설명을 새로 씀
+                    self._desc_parts = []
+                    events.append(('desc_reset', ''))
+                self._seen_desc = True
+                self.state = self.DESC
+                self._skip_newline = True
+            elif marker == self.CODE_BEGIN:
+                if self._code_parts:
+                    # 펜스로 받은 코드보다 마커 블록이 우선
+                    self._code_parts = []
+                    events.append(('code_reset', ''))
+                self._seen_code_marker = True
+                self.state = self.CODE
+                self._skip_newline = True
+            elif marker == self.EDITS_BEGIN:
+                self._edits_parts = []
+                self.state = self.EDITS
+                self._skip_newline = True
+            elif marker == self.FENCE:
+                self._seen_fence = True
+                self.state = self.FENCE_HEADER
+        elif self.state == self.FENCE_HEADER:
+            self.state = self.FENCE_BODY
+        else:
+            self.state = self.OUTSIDE
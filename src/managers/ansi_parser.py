@@ -0,0 +1,316 @@
+import re
+from typing import List, Optional, Tuple
+
+# 스타일: None(기본) 또는 (fg, bg, bold, italic, underline, inverse)
+# 색은 None(기본) / 0~255 팔레트 번호 / (r, g, b)
+Style = Optional[tuple]
+Span = Tuple[str, Style]
+
+_DEFAULT_STYLE = (None, None, False, False, False, False)
+
+# ESC 로 시작하는 제어 시퀀스: CSI / OSC(ST 로 끝남) / 문자셋 지정 / 그 밖의 2글자 ESC.
+# 한 글자 제어문자(CR, BS, BEL)는 feed 에서 미리 ESC 두 글자로 바꿔 두므로 패턴이 항상 ESC 로 시작하고,
+# 덕분에 split 이 텍스트 구간을 정규식 엔진의 리터럴 검색으로 건너뛴다.
+_CONTROL = re.compile(r'(\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x1b]*\x1b\\|[()*+][^\x1b\n]|[^\[\]()*+\n\x1b]))')
+# 청크 끝에서 잘린(아직 끝나지 않은) ESC 시퀀스
+_INCOMPLETE = re.compile(r'\x1b(?:\[[0-?]*[ -/]*|\][^\x1b]*\x1b?|[()*+])?\Z')
+
+
+"""
+스트리밍 VT100/ANSI 파서.
+
+셸 출력 청크를 feed 로 넣으면 한 번 훑으면서
+- SGR(색/굵게/기울임/밑줄/반전)을 스타일로 바꾸고
+- CR 로 줄 처음에 돌아가 덮어쓰기, BS, 커서 좌우 이동(CSI C/D/G), 줄 지우기(CSI K)를 현재 줄에 적용하고
+- 나머지 제어 시퀀스(OSC, 커서 위치, 화면 지우기 등)는 버린다.
+
+청크 경계에서 잘린 ESC 시퀀스와 스타일/현재 줄 상태는 다음 feed 까지 유지된다.
+feed 결과는 (확정된 스팬, 현재 줄 스팬): 확정된 스팬은 '\n' 로 끝나는 줄들이고, 현재 줄은
+이후 CR 등으로 다시 바뀔 수 있어 매번 통째로 다시 그린다.
+"""
+class AnsiParser:
+    # 끝나지 않은 시퀀스를 이보다 길게 들고 있지 않음 (OSC 가 닫히지 않는 경우 등)
+    MAX_PENDING = 4096
+    # 줄바꿈 없이 이보다 길어지면 강제로 줄을 넘긴다
+    MAX_LINE_CHARS = 16384
+    # (현재 스타일, SGR 시퀀스) -> 새 스타일
+    _SGR_CACHE = {}
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._pending = ""
+        self._style: Style = None
+        self._line: List[Span] = []
+        self._line_len = 0
+        self._col = 0
+        self._out: List[Span] = []
+
+    @property
+    def style(self) -> Style:
+        return self._style
+
+    def feed(self, text: str) -> Tuple[List[Span], List[Span]]:
+        """text 를 처리하고 (이번에 확정된 스팬, 현재 줄 스팬)을 돌려준다."""
+        data = self._pending + text if self._pending else text
+        self._pending = ""
+        # PTY 출력의 줄바꿈은 대부분 \r\n - 미리 합쳐 두면 일반 텍스트가 한 묶음으로 끝난다
+        if '\r\n' in data:
+            data = data.replace('\r\n', '\n')
+        if '\r' in data:
+            data = data.replace('\r', '\x1b\r')
+        if '\x08' in data:
+            data = data.replace('\x08', '\x1b\x08')
+        if '\x07' in data:
+            # BEL 은 OSC 종료 문자로도 쓰이므로 ST(ESC \\)로 바꾼다 (단독 BEL 은 무시되는 2글자 ESC 가 됨)
+            data = data.replace('\x07', '\x1b\\')
+        if '\x00' in data:
+            data = data.replace('\x00', '')
+        parts = _CONTROL.split(data)
+        tail = parts[-1]
+        esc = tail.rfind('\x1b')
+        if esc >= 0 and _INCOMPLETE.match(tail, esc) and len(tail) - esc <= self.MAX_PENDING:
+            # 청크 끝에서 잘린 시퀀스는 다음 feed 로 미룬다
+            self._pending = tail[esc:]
+            parts[-1] = tail[:esc]
+        sgr_cache = self._SGR_CACHE
+        max_line = self.MAX_LINE_CHARS
+        count = len(parts)
+        for i in range(0, count, 2):
+            text = parts[i]
+            if text:
+                if '\x1b' in text:
+                    # 어떤 시퀀스로도 해석되지 않는 ESC 는 버린다
+                    text = text.replace('\x1b', '')
+                if '\n' in text:
+                    self._text(text)
+                elif self._col == self._line_len and self._line_len + len(text) <= max_line:
+                    # 가장 흔한 경우: 줄 끝에 이어 쓰기 (_put 의 빠른 경로를 펼쳐 둠)
+                    line = self._line
+                    style = self._style
+                    if line and line[-1][1] == style:
+                        line[-1] = (line[-1][0] + text, style)
+                    else:
+                        line.append((text, style))
+                    self._line_len += len(text)
+                    self._col = self._line_len
+                elif text:
+                    self._put(text)
+            if i + 1 == count:
+                break
+            seq = parts[i + 1]
+            kind = seq[1]
+            if kind == '[':
+                final = seq[-1]
+                if final == 'm':
+                    key = (self._style, seq)
+                    style = sgr_cache.get(key, key)
+                    if style is key:
+                        style = self._sgr(seq[2:-1])
+                        if len(sgr_cache) > 4096:
+                            sgr_cache.clear()
+                        sgr_cache[key] = style
+                    self._style = style
+                else:
+                    self._csi(seq[2:-1], final)
+            elif kind == '\r':
+                self._col = 0
+            elif kind == '\x08':
+                if self._col > 0:
+                    self._col -= 1
+        out = self._out
+        self._out = []
+        return out, list(self._line)
+
+    def break_line(self):
+        """현재 줄을 그대로 확정한다 (앞부분 출력이 잘려 나간 경우 등)."""
+        if self._line_len:
+            self._newline()
+
+    @classmethod
+    def plain(cls, text: str) -> str:
+        """text 전체를 해석한 결과를 스타일 없는 평문으로."""
+        parser = cls()
+        spans, line = parser.feed(text)
+        return ''.join(t for t, _ in spans) + ''.join(t for t, _ in line)
+
+    # ---- 텍스트 ----
+
+    def _text(self, text: str):
+        if '\n' not in text:
+            self._put(text)
+            return
+        first, _, rest = text.partition('\n')
+        if first:
+            self._put(first)
+        self._newline()
+        last = rest.rfind('\n')
+        if last >= 0:
+            # 가운데 줄들은 덮어쓸 일이 없으므로 그대로 확정
+            self._emit(rest[:last + 1], self._style)
+            rest = rest[last + 1:]
+        if rest:
+            self._put(rest)
+
+    def _put(self, text: str):
+        """커서 위치에 현재 스타일로 text(줄바꿈 없음)를 쓴다."""
+        style = self._style
+        col = self._col
+        size = len(text)
+        if col == self._line_len:
+            line = self._line
+            if line and line[-1][1] == style:
+                line[-1] = (line[-1][0] + text, style)
+            else:
+                line.append((text, style))
+            self._line_len += size
+            self._col = col + size
+            if self._line_len > self.MAX_LINE_CHARS:
+                self._newline()
+            return
+        if col > self._line_len:
+            # 커서가 줄 끝 너머로 이동해 있던 경우 공백으로 채움
+            self._col = self._line_len
+            self._put(' ' * (col - self._line_len))
+        self._splice(col, col + size, text, style)
+        self._col = col + size
+
+    def _splice(self, start: int, stop: int, text: str, style: Style):
+        """현재 줄의 [start, stop) 를 (text, style) 로 바꾼다."""
+        before: List[Span] = []
+        after: List[Span] = []
+        offset = 0
+        for seg_text, seg_style in self._line:
+            seg_end = offset + len(seg_text)
+            if seg_end <= start:
+                before.append((seg_text, seg_style))
+            elif offset >= stop:
+                after.append((seg_text, seg_style))
+            else:
+                if offset < start:
+                    before.append((seg_text[:start - offset], seg_style))
+                if seg_end > stop:
+                    after.append((seg_text[stop - offset:], seg_style))
+            offset = seg_end
+        line = before
+        if text:
+            after.insert(0, (text, style))
+        for span in after:
+            if line and line[-1][1] == span[1]:
+                line[-1] = (line[-1][0] + span[0], span[1])
+            else:
+                line.append(span)
+        self._line = line
+        self._line_len = sum(len(t) for t, _ in line)
+
+    def _newline(self):
+        line = self._line
+        out = self._out
+        if line:
+            first = line[0]
+            if out and out[-1][1] == first[1]:
+                out[-1] = (out[-1][0] + first[0], first[1])
+                out.extend(line[1:])
+            else:
+                out.extend(line)
+            last = out[-1]
+            out[-1] = (last[0] + '\n', last[1])
+        else:
+            self._emit('\n', out[-1][1] if out else self._style)
+        self._line = []
+        self._line_len = 0
+        self._col = 0
+
+    def _emit(self, text: str, style: Style):
+        out = self._out
+        if out and out[-1][1] == style:
+            out[-1] = (out[-1][0] + text, style)
+        else:
+            out.append((text, style))
+
+    # ---- 제어 시퀀스 ----
+
+    def _csi(self, params: str, final: str):
+        if final == 'K':
+            mode = self._number(params, 0)
+            if mode == 0:
+                if self._col < self._line_len:
+                    self._splice(self._col, self._line_len, '', None)
+            elif mode == 1:
+                self._splice(0, min(self._col + 1, self._line_len), ' ' * min(self._col + 1, self._line_len), None)
+            elif mode == 2:
+                self._line = []
+                self._line_len = 0
+        elif final == 'C':
+            self._col += max(1, self._number(params, 1))
+        elif final == 'D':
+            self._col = max(0, self._col - max(1, self._number(params, 1)))
+        elif final == 'G':
+            self._col = max(0, self._number(params, 1) - 1)
+
+    @staticmethod
+    def _number(params: str, default: int) -> int:
+        try:
+            return int(params.split(';', 1)[0]) if params else default
+        except ValueError:
+            return default
+
+    def _sgr(self, params: str) -> Style:
+        """현재 스타일에 SGR 파라미터를 적용한 새 스타일."""
+        if params and params[0] in '<=>?':
+            return self._style
+        fg, bg, bold, italic, underline, inverse = self._style or _DEFAULT_STYLE
+        try:
+            codes = [int(p) if p else 0 for p in params.replace(':', ';').split(';')] if params else [0]
+        except ValueError:
+            return self._style
+        i = 0
+        count = len(codes)
+        while i < count:
+            code = codes[i]
+            if code == 0:
+                fg, bg, bold, italic, underline, inverse = _DEFAULT_STYLE
+            elif code == 1:
+                bold = True
+            elif code == 3:
+                italic = True
+            elif code == 4:
+                underline = True
+            elif code == 7:
+                inverse = True
+            elif code == 22:
+                bold = False
+            elif code == 23:
+                italic = False
+            elif code == 24:
+                underline = False
+            elif code == 27:
+                inverse = False
+            elif 30 <= code <= 37:
+                fg = code - 30
+            elif 90 <= code <= 97:
+                fg = code - 90 + 8
+            elif code == 39:
+                fg = None
+            elif 40 <= code <= 47:
+                bg = code - 40
+            elif 100 <= code <= 107:
+                bg = code - 100 + 8
+            elif code == 49:
+                bg = None
+            elif code in (38, 48) and i + 1 < count:
+                color = None
+                if codes[i + 1] == 5 and i + 2 < count:
+                    color = codes[i + 2] & 0xFF
+                    i += 2
+                elif codes[i + 1] == 2 and i + 4 < count:
+                    color = (codes[i + 2] & 0xFF, codes[i + 3] & 0xFF, codes[i + 4] & 0xFF)
+                    i += 4
+                if code == 38:
+                    fg = color
+                else:
+                    bg = color
+            i += 1
+        style = (fg, bg, bold, italic, underline, inverse)
+        return None if style == _DEFAULT_STYLE else style
@@ -0,0 +1,223 @@
+import os
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QTextDocument
+from .file_saver import atomic_write
+from .cache_paths import cache_root
+
+
+"""열린 파일 하나의 편집 상태 (문서, 커서/스크롤 위치, 수정 여부)"""
+class Buffer:
+    __slots__ = ('path', 'name', 'document', 'cursor_position', 'scroll', 'swap_path', 'large_index', '_dirty')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.document: Optional[QTextDocument] = None  # 메모리에서 내려가면 None
+        self.cursor_position = 0
+        self.scroll = 0
+        self.swap_path: Optional[str] = None           # 수정된 채로 내려간 경우 스왑 파일
+        self.large_index = None                         # 대용량 읽기 전용 파일이면 LargeFileIndex
+        self._dirty = False
+
+    @property
+    def resident(self) -> bool:
+        return self.document is not None or self.large_index is not None
+
+    @property
+    def dirty(self) -> bool:
+        if self.document is not None:
+            return self.document.isModified()
+        return self._dirty
+
+
+"""
+열린 파일마다 QTextDocument 하나를 유지하는 버퍼 관리자.
+
+탭 전환은 문서를 에디터에 붙이기만 하므로 디스크 I/O 가 없고, 되돌리기 기록/커서/스크롤도 유지된다.
+메모리에 올린 문서의 합이 memory_budget 을 넘으면 가장 오래 쓰지 않은 버퍼부터 내린다.
+수정된 버퍼는 스왑 파일에 내용을 보관했다가 다시 열 때 복원한다 (되돌리기 기록은 사라짐).
+대용량 파일은 mmap 이라 예산에 포함하지 않는다.
+"""
+class BufferManager(QObject):
+    dirty_changed = pyqtSignal(str, bool)  # path, dirty
+    document_loaded = pyqtSignal(object)   # Buffer (새로 열거나 스왑/디스크에서 다시 올림)
+
+    MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, file_manager, memory_budget: Optional[int] = None, swap_dir: Optional[str] = None):
+        super().__init__()
+        self.file_manager = file_manager
+        self.memory_budget = memory_budget or self.MEMORY_BUDGET_BYTES
+        self.swap_dir = swap_dir or cache_root('swap')
+        # 앞쪽이 가장 오래 전에 쓴 버퍼
+        self._buffers: "OrderedDict[str, Buffer]" = OrderedDict()
+        self.current: Optional[Buffer] = None
+
+    def get(self, path: str) -> Optional[Buffer]:
+        return self._buffers.get(path)
+
+    def buffers(self) -> List[Buffer]:
+        return list(self._buffers.values())
+
+    def dirty_buffers(self) -> List[Buffer]:
+        return [b for b in self._buffers.values() if b.dirty]
+
+    def open(self, path: str) -> Tuple[Optional[Buffer], Optional[str]]:
+        """
+        버퍼를 열거나 기존 버퍼를 현재 버퍼로 만든다.
+        이미 메모리에 있으면 디스크를 읽지 않는다. returns: (Buffer, None) / (None, 오류)
+        """
+        buffer = self._buffers.get(path)
+        if buffer is None:
+            buffer = Buffer(path)
+        if not buffer.resident:
+            error = self._load(buffer)
+            if error:
+                return None, error
+        self._activate(buffer)
+        return buffer, None
+
+    def open_large(self, path: str, index) -> Buffer:
+        """대용량 파일 버퍼 (LargeFileIndex 소유권을 넘겨받음)"""
+        buffer = self._buffers.get(path)
+        if buffer is not None:
+            self.close(path)
+        buffer = Buffer(path)
+        buffer.large_index = index
+        self._activate(buffer)
+        return buffer
+
+    def close(self, path: str):
+        buffer = self._buffers.pop(path, None)
+        if buffer is None:
+            return
+        if buffer is self.current:
+            self.current = None
+        self._release(buffer)
+        self._remove_swap(buffer)
+
+    def close_all(self):
+        for path in list(self._buffers):
+            self.close(path)
+
+    def rename(self, old_path: str, new_path: str):
+        buffer = self._buffers.pop(old_path, None)
+        if buffer is None:
+            return
+        buffer.path = new_path
+        buffer.name = os.path.basename(new_path)
+        self._buffers[new_path] = buffer
+
+    def text(self, buffer: Buffer) -> str:
+        """버퍼 내용 (메모리에서 내려갔으면 스왑 또는 디스크에서 읽음)"""
+        if buffer.document is not None:
+            return buffer.document.toPlainText()
+        if buffer.swap_path:
+            with open(buffer.swap_path, 'r', encoding='utf-8', newline='') as f:
+                return f.read()
+        content, error = self.file_manager.read_file(buffer.path)
+        if error:
+            raise OSError(error)
+        return content
+
+    def mark_saved(self, buffer: Buffer):
+        if buffer.document is not None:
+            buffer.document.setModified(False)
+            return
+        self._remove_swap(buffer)
+        if buffer._dirty:
+            buffer._dirty = False
+            self.dirty_changed.emit(buffer.path, False)
+
+    def mark_dirty(self, buffer: Buffer):
+        if buffer.document is not None:
+            buffer.document.setModified(True)
+
+    def memory_usage(self) -> int:
+        return sum(self._document_bytes(b.document) for b in self._buffers.values() if b.document is not None)
+
+    def _activate(self, buffer: Buffer):
+        self._buffers[buffer.path] = buffer
+        self._buffers.move_to_end(buffer.path)
+        self.current = buffer
+        self._evict_over_budget()
+
+    def _load(self, buffer: Buffer) -> Optional[str]:
+        if buffer.swap_path:
+            try:
+                with open(buffer.swap_path, 'r', encoding='utf-8', newline='') as f:
+                    content = f.read()
+            except OSError as e:
+                return str(e)
+            self._remove_swap(buffer)
+            self._attach_document(buffer, content, modified=True)
+            return None
+        content, error = self.file_manager.read_file(buffer.path)
+        if error:
+            return error
+        self._attach_document(buffer, content, modified=False)
+        return None
+
+    def _attach_document(self, buffer: Buffer, content: str, modified: bool):
+        document = QTextDocument(self)
+        document.setPlainText(content)
+        document.setModified(modified)
+        # 이름이 바뀌어도 현재 경로로 알리도록 버퍼를 참조
+        document.modificationChanged.connect(lambda dirty: self.dirty_changed.emit(buffer.path, dirty))
+        buffer.document = document
+        buffer._dirty = modified
+        self.document_loaded.emit(buffer)
+
+    def _evict_over_budget(self):
+        usage = self.memory_usage()
+        if usage <= self.memory_budget:
+            return
+        for buffer in list(self._buffers.values()):
+            if usage <= self.memory_budget:
+                break
+            if buffer is self.current or buffer.document is None:
+                continue
+            size = self._document_bytes(buffer.document)
+            if self._evict(buffer):
+                usage -= size
+
+    def _evict(self, buffer: Buffer) -> bool:
+        document = buffer.document
+        if document.isModified():
+            os.makedirs(self.swap_dir, exist_ok=True)
+            digest = hashlib.sha1(buffer.path.encode('utf-8')).hexdigest()
+            swap_path = os.path.join(self.swap_dir, f"{digest}.{os.getpid()}.swp")
+            try:
+                atomic_write(swap_path, document.toPlainText())
+            except OSError:
+                return False  # 스왑에 못 쓰면 내용을 잃지 않도록 메모리에 둔다
+            buffer.swap_path = swap_path
+            buffer._dirty = True
+        else:
+            buffer._dirty = False
+        self._release(buffer)
+        return True
+
+    def _release(self, buffer: Buffer):
+        if buffer.document is not None:
+            buffer.document.deleteLater()
+            buffer.document = None
+        if buffer.large_index is not None:
+            buffer.large_index.close()
+            buffer.large_index = None
+
+    def _remove_swap(self, buffer: Buffer):
+        if buffer.swap_path:
+            try:
+                os.remove(buffer.swap_path)
+            except OSError:
+                pass
+            buffer.swap_path = None
+
+    @staticmethod
+    def _document_bytes(document: QTextDocument) -> int:
+        # UTF-16 본문 + 레이아웃/되돌리기 기록 여유분
+        return document.characterCount() * 4
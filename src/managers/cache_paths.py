@@ -0,0 +1,12 @@
+import os
+
+
+def cache_root(sub: str = '') -> str:
+    """
+    에디터 캐시 디렉토리 (색인, 스왑, 컴파일된 UI, 응답 캐시, 텔레메트리 로그).
+    $EDITOR_CACHE_DIR 또는 ~/.cache/ai-code-editor, sub 를 주면 그 아래 하위 경로.
+    예전 이름인 $LLM_CACHE_DIR 도 설정되어 있으면 따른다.
+    """
+    root = os.getenv('EDITOR_CACHE_DIR') or os.getenv('LLM_CACHE_DIR') \
+        or os.path.join(os.path.expanduser('~'), '.cache', 'ai-code-editor')
+    return os.path.join(root, sub) if sub else root
@@ -0,0 +1,223 @@
+import re
+import ast
+from typing import Dict, List, Optional, Tuple
+
+
+"""
+큰 파일을 심볼 단위 청크로 나누고, 프롬프트/커서와 관련된 영역만 골라내는 도구.
+
+청크는 dict: { 'name': str, 'kind': str, 'start': int, 'end': int }  (0-based 줄, end 미포함)
+- python: ast 로 최상위 def/class 단위 (큰 클래스는 메서드 단위로 다시 분할)
+- 중괄호 언어: 줄 단위 중괄호 깊이로 최상위 블록 분할
+- 그 외: 들여쓰기 0 인 줄 기준 분할
+"""
+class CodeChunker:
+    BRACE_LANGUAGES = ('javascript', 'typescript', 'c', 'cpp', 'java', 'css', 'json')
+    # 청크 하나의 최대 줄 수 (넘으면 창 단위로 자름)
+    MAX_CHUNK_LINES = 200
+    # 이보다 작은 인접 청크는 합침
+    MIN_CHUNK_LINES = 5
+
+    _WORD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+    _STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`(?:\\.|[^`\\])*`')
+    _NAME_RE = re.compile(r"(?:class|def|function|interface|struct|enum|fn)\s+([A-Za-z_][A-Za-z0-9_]*)|([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+
+    # ---------- 분할 ----------
+    def split(self, content: str, language: str) -> List[Dict]:
+        lines = content.split('\n')
+        chunks: Optional[List[Dict]] = None
+        if language == 'python':
+            chunks = self._split_python(content, lines)
+        if chunks is None:
+            if language in self.BRACE_LANGUAGES:
+                chunks = self._split_braces(lines)
+            else:
+                chunks = self._split_indent(lines)
+        return self._normalize(chunks, lines)
+
+    def _split_python(self, content: str, lines: List[str]) -> Optional[List[Dict]]:
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return None
+        chunks: List[Dict] = []
+        for node in tree.body:
+            start, end = self._node_span(node)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                chunks.append({ 'name': node.name, 'kind': 'function', 'start': start, 'end': end })
+            elif isinstance(node, ast.ClassDef):
+                if end - start > self.MAX_CHUNK_LINES:
+                    chunks.extend(self._split_python_class(node, start, end))
+                else:
+                    chunks.append({ 'name': node.name, 'kind': 'class', 'start': start, 'end': end })
+            else:
+                chunks.append({ 'name': '', 'kind': 'module', 'start': start, 'end': end })
+        return chunks
+
+    def _split_python_class(self, node: ast.ClassDef, start: int, end: int) -> List[Dict]:
+        chunks: List[Dict] = []
+        cursor = start
+        for child in node.body:
+            c_start, c_end = self._node_span(child)
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            if c_start > cursor:
+                # 클래스 헤더/속성 등 메서드 사이 영역
+                chunks.append({ 'name': node.name, 'kind': 'class', 'start': cursor, 'end': c_start })
+            chunks.append({ 'name': f"{node.name}.{child.name}", 'kind': 'method', 'start': c_start, 'end': c_end })
+            cursor = c_end
+        if cursor < end:
+            chunks.append({ 'name': node.name, 'kind': 'class', 'start': cursor, 'end': end })
+        return chunks
+
+    @staticmethod
+    def _node_span(node) -> Tuple[int, int]:
+        start = node.lineno
+        for deco in getattr(node, 'decorator_list', []):
+            start = min(start, deco.lineno)
+        end = getattr(node, 'end_lineno', None) or node.lineno
+        return start - 1, end
+
+    def _split_braces(self, lines: List[str]) -> List[Dict]:
+        chunks: List[Dict] = []
+        depth = 0
+        start = 0
+        for i, line in enumerate(lines):
+            code = self._strip_strings(line)
+            before = depth
+            depth += code.count('{') - code.count('}')
+            if depth < 0:
+                depth = 0
+            if before > 0 and depth == 0:
+                chunks.append({ 'name': self._guess_name(lines, start, i + 1), 'kind': 'block', 'start': start, 'end': i + 1 })
+                start = i + 1
+        if start < len(lines):
+            chunks.append({ 'name': self._guess_name(lines, start, len(lines)), 'kind': 'block', 'start': start, 'end': len(lines) })
+        return chunks
+
+    def _split_indent(self, lines: List[str]) -> List[Dict]:
+        chunks: List[Dict] = []
+        start = 0
+        for i in range(1, len(lines)):
+            line = lines[i]
+            if line and not line[0].isspace() and lines[i - 1].strip() == '':
+                chunks.append({ 'name': self._guess_name(lines, start, i), 'kind': 'block', 'start': start, 'end': i })
+                start = i
+        chunks.append({ 'name': self._guess_name(lines, start, len(lines)), 'kind': 'block', 'start': start, 'end': len(lines) })
+        return chunks
+
+    def _normalize(self, chunks: List[Dict], lines: List[str]) -> List[Dict]:
+        """빈틈 메우기 -> 작은 청크 병합 -> 큰 청크 분할. 결과는 파일 전체를 빈틈없이 덮는다."""
+        total = len(lines)
+        filled: List[Dict] = []
+        cursor = 0
+        for c in sorted(chunks, key=lambda c: c['start']):
+            if c['start'] > cursor:
+                filled.append({ 'name': '', 'kind': 'module', 'start': cursor, 'end': c['start'] })
+            start = max(c['start'], cursor)
+            if c['end'] > start:
+                filled.append(dict(c, start=start))
+                cursor = c['end']
+        if cursor < total:
+            filled.append({ 'name': '', 'kind': 'module', 'start': cursor, 'end': total })
+
+        merged: List[Dict] = []
+        for c in filled:
+            if merged and (c['end'] - c['start'] < self.MIN_CHUNK_LINES or merged[-1]['end'] - merged[-1]['start'] < self.MIN_CHUNK_LINES) \
+                    and c['end'] - merged[-1]['start'] <= self.MAX_CHUNK_LINES:
+                prev = merged[-1]
+                prev['end'] = c['end']
+                if not prev['name']:
+                    prev['name'], prev['kind'] = c['name'], c['kind']
+                continue
+            merged.append(dict(c))
+
+        result: List[Dict] = []
+        for c in merged:
+            if c['end'] - c['start'] <= self.MAX_CHUNK_LINES:
+                result.append(c)
+                continue
+            for s in range(c['start'], c['end'], self.MAX_CHUNK_LINES):
+                result.append(dict(c, start=s, end=min(c['end'], s + self.MAX_CHUNK_LINES)))
+        return result
+
+    # ---------- 선택 ----------
+    def select(self, chunks: List[Dict], lines: List[str], prompt: str, cursor_line: Optional[int], budget_lines: int) -> List[Dict]:
+        """
+        프롬프트 단어와의 겹침, 커서 위치로 점수를 매겨 budget_lines 안에서 청크를 고른다.
+        커서가 있는 청크는 항상 포함된다. 반환은 파일 순서.
+        """
+        words = { w.lower() for w in self._WORD_RE.findall(prompt) if len(w) > 2 }
+        scored = []
+        for index, c in enumerate(chunks):
+            score = 0.0
+            name = c['name'].lower()
+            if name and any(w in name for w in words):
+                score += 10.0
+            body_words = { w.lower() for w in self._WORD_RE.findall('\n'.join(lines[c['start']:c['end']])) }
+            score += len(words & body_words)
+            if cursor_line is not None:
+                if c['start'] <= cursor_line < c['end']:
+                    score += 1000.0
+                else:
+                    # 커서와 가까울수록 약간 가산
+                    distance = min(abs(cursor_line - c['start']), abs(cursor_line - c['end']))
+                    score += 2.0 / (1 + distance / 50.0)
+            scored.append((score, index))
+
+        scored.sort(key=lambda t: (-t[0], t[1]))
+        chosen = []
+        used = 0
+        for score, index in scored:
+            c = chunks[index]
+            size = c['end'] - c['start']
+            if used + size > budget_lines and chosen:
+                continue
+            if score <= 0 and chosen:
+                break
+            chosen.append(index)
+            used += size
+        return [chunks[i] for i in sorted(chosen)]
+
+    @staticmethod
+    def regions(selected: List[Dict]) -> List[Tuple[int, int]]:
+        """선택된 청크를 연속 구간으로 합친다."""
+        spans: List[Tuple[int, int]] = []
+        for c in selected:
+            if spans and spans[-1][1] == c['start']:
+                spans[-1] = (spans[-1][0], c['end'])
+            else:
+                spans.append((c['start'], c['end']))
+        return spans
+
+    @staticmethod
+    def outline(chunks: List[Dict]) -> str:
+        rows = []
+        for c in chunks:
+            label = c['name'] or '(module)'
+            rows.append(f"- {c['start'] + 1}-{c['end']}: {c['kind']} {label}")
+        return '\n'.join(rows)
+
+    @staticmethod
+    def splice(lines: List[str], spans: List[Tuple[int, int]], replacements: Dict[int, str]) -> str:
+        """spans[i] 구간을 replacements[i] 로 교체 (뒤에서부터 적용해 줄 번호 유지)."""
+        result = list(lines)
+        for index in sorted(replacements, reverse=True):
+            start, end = spans[index]
+            result[start:end] = replacements[index].split('\n')
+        return '\n'.join(result)
+
+    # ---------- helpers ----------
+    @classmethod
+    def _strip_strings(cls, line: str) -> str:
+        # 문자열/한 줄 주석 안의 중괄호는 세지 않도록 대충 제거
+        line = cls._STRING_RE.sub('', line)
+        cut = line.find('//')
+        return line if cut == -1 else line[:cut]
+
+    def _guess_name(self, lines: List[str], start: int, end: int) -> str:
+        for line in lines[start:min(end, start + 5)]:
+            m = self._NAME_RE.search(line)
+            if m:
+                return m.group(1) or m.group(2)
+        return ''
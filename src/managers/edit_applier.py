@@ -0,0 +1,173 @@
+import difflib
+from typing import List, Optional, Tuple
+
+
+"""SEARCH/REPLACE 편집 블록 파싱 및 적용"""
+class EditApplier:
+    SEARCH = "<<<<<<< SEARCH"
+    DIVIDER = "======="
+    REPLACE = ">>>>>>> REPLACE"
+
+    # 퍼지 매칭 최소 유사도 (difflib ratio)
+    FUZZY_THRESHOLD = 0.88
+    # 퍼지 매칭에서 1등과 2등 후보 간 최소 차이 (모호한 위치 방지)
+    FUZZY_MARGIN = 0.03
+
+    @classmethod
+    def parse(cls, text: str) -> List[Tuple[str, str]]:
+        """
+        텍스트에서 (search, replace) 블록 목록을 추출한다.
+        형식:
+            <<<<<<< SEARCH
+            기존 코드
+            =======
+            새 코드
+            >>>>>>> REPLACE
+        """
+        blocks: List[Tuple[str, str]] = []
+        lines = text.split('\n')
+        i = 0
+        while i < len(lines):
+            if lines[i].strip() != cls.SEARCH:
+                i += 1
+                continue
+            search: List[str] = []
+            replace: List[str] = []
+            i += 1
+            while i < len(lines) and lines[i].strip() != cls.DIVIDER:
+                search.append(lines[i])
+                i += 1
+            i += 1
+            while i < len(lines) and lines[i].strip() != cls.REPLACE:
+                replace.append(lines[i])
+                i += 1
+            if i >= len(lines):
+                # 닫히지 않은 블록은 버림 (잘린 응답)
+                break
+            blocks.append(('\n'.join(search), '\n'.join(replace)))
+            i += 1
+        return blocks
+
+    @classmethod
+    def apply(cls, content: str, blocks: List[Tuple[str, str]]) -> Tuple[bool, str, str]:
+        """
+        블록을 순서대로 적용한다.
+        returns: (success, 새 내용, 실패 사유). 하나라도 실패하면 원본 내용을 그대로 돌려준다.
+        """
+        updated = content
+        for index, (search, replace) in enumerate(blocks, 1):
+            result = cls._apply_one(updated, search, replace)
+            if result is None:
+                preview = search.strip().split('\n')[0][:80]
+                return False, content, f"{index}번째 블록의 위치를 찾지 못했습니다: {preview}"
+            updated = result
+        return True, updated, ""
+
+    @classmethod
+    def _apply_one(cls, content: str, search: str, replace: str) -> Optional[str]:
+        # 빈 SEARCH 는 파일 끝에 추가
+        if not search.strip():
+            if content and not content.endswith('\n'):
+                content += '\n'
+            return content + replace
+
+        lines = content.split('\n')
+        search_lines = search.split('\n')
+        replace_lines = replace.split('\n')
+
+        # 1) 줄 단위로 정확히 한 번 등장 (부분 문자열 매칭은 다른 줄 중간에 잘못 적용될 수 있음)
+        span = cls._find_unique(lines, search_lines, lambda s: s)
+        if span is not None:
+            return cls._splice(lines, span, replace_lines)
+
+        # 2) 줄 끝 공백 무시
+        span = cls._find_unique(lines, search_lines, lambda s: s.rstrip())
+        if span is not None:
+            return cls._splice(lines, span, replace_lines)
+
+        # 3) 들여쓰기 무시 -> 원본 들여쓰기에 맞춰 재들여쓰기
+        span = cls._find_unique(lines, search_lines, lambda s: s.strip())
+        if span is not None:
+            return cls._splice(lines, span, cls._reindent(lines[span[0]:span[1]], search_lines, replace_lines))
+
+        # 4) 유사도 기반 위치 탐색
+        span = cls._find_fuzzy(lines, search_lines)
+        if span is not None:
+            return cls._splice(lines, span, cls._reindent(lines[span[0]:span[1]], search_lines, replace_lines))
+        return None
+
+    @staticmethod
+    def _find_unique(lines: List[str], search_lines: List[str], norm) -> Optional[Tuple[int, int]]:
+        target = [norm(s) for s in search_lines]
+        # 앞뒤 빈 줄은 앵커에서 제외
+        while target and not target[0]:
+            target.pop(0)
+        while target and not target[-1]:
+            target.pop()
+        if not target:
+            return None
+        normed = [norm(s) for s in lines]
+        size = len(target)
+        found = None
+        first = target[0]
+        for start in range(len(normed) - size + 1):
+            if normed[start] != first or normed[start:start + size] != target:
+                continue
+            if found is not None:
+                return None  # 모호함
+            found = (start, start + size)
+        return found
+
+    @classmethod
+    def _find_fuzzy(cls, lines: List[str], search_lines: List[str]) -> Optional[Tuple[int, int]]:
+        target = [s.strip() for s in search_lines if s.strip()]
+        if not target:
+            return None
+        normed = [s.strip() for s in lines]
+        size = len(search_lines)
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        # 줄 단위가 아닌 문자 단위로 비교해야 오타 한두 글자를 허용할 수 있음
+        matcher.set_seq2('\n'.join(target))
+        candidates: List[Tuple[float, int]] = []
+        for start in range(0, max(1, len(lines) - size + 1)):
+            window = '\n'.join(s for s in normed[start:start + size] if s)
+            matcher.set_seq1(window)
+            if matcher.real_quick_ratio() < cls.FUZZY_THRESHOLD or matcher.quick_ratio() < cls.FUZZY_THRESHOLD:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= cls.FUZZY_THRESHOLD:
+                candidates.append((ratio, start))
+        if not candidates:
+            return None
+        best, best_start = max(candidates)
+        # 겹치는 창(같은 영역을 한두 줄 민 것)은 경쟁 후보로 치지 않음
+        rivals = [r for r, st in candidates if abs(st - best_start) > size // 2]
+        if rivals and best - max(rivals) < cls.FUZZY_MARGIN:
+            return None
+        return best_start, best_start + size
+
+    @staticmethod
+    def _reindent(original: List[str], search_lines: List[str], replace_lines: List[str]) -> List[str]:
+        """모델이 들여쓰기를 다르게 쓴 경우 원본 기준으로 보정."""
+        def indent_of(block):
+            for s in block:
+                if s.strip():
+                    return s[:len(s) - len(s.lstrip())]
+            return ''
+        have = indent_of(search_lines)
+        want = indent_of(original)
+        if have == want:
+            return replace_lines
+        result = []
+        for s in replace_lines:
+            if s.startswith(have):
+                result.append(want + s[len(have):])
+            elif s.strip():
+                result.append(want + s.lstrip())
+            else:
+                result.append(s)
+        return result
+
+    @staticmethod
+    def _splice(lines: List[str], span: Tuple[int, int], replace_lines: List[str]) -> str:
+        return '\n'.join(lines[:span[0]] + replace_lines + lines[span[1]:])
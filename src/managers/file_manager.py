@@ -1,79 +1,160 @@
 import os
-from PyQt5.QtWidgets import QTreeWidgetItem
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from .file_tree_model import FileTreeModel
+from .file_watcher import FileWatcher
+from .large_file import LargeFileIndex
+from .file_saver import FileSaver, atomic_write
+from .path_index import PathIndex
+from .trigram_index import TrigramIndex
 
 class FileManager:
+    # 이보다 큰 파일은 에디터 대신 읽기 전용 대용량 뷰로 연다
+    LARGE_FILE_BYTES = 8 * 1024 * 1024
+    SNIFF_BYTES = 8192
+
     def __init__(self):
-        self.item_map = {}  # { path: QTreeWidgetItem }
+        self.model = FileTreeModel()
+        # 로드된(펼친) 폴더만 감시하고, 변경은 모아서 트리에 diff 로 반영
+        self.watcher = FileWatcher()
+        self.model.directory_loaded.connect(self.watcher.watch_directory)
+        self.model.directories_unloaded.connect(self.watcher.unwatch_directories)
+        self.watcher.directories_changed.connect(self.model.refresh_directories)
+        # 빠른 열기(Ctrl+P)용 전체 파일 경로 색인 (트리와 달리 펼치지 않은 폴더까지 백그라운드로 수집)
+        self.path_index = PathIndex()
+        self.watcher.directories_changed.connect(self.path_index.refresh_directories)
+        # 프로젝트 전체 검색용 트라이그램 색인 (저장/외부 변경 시 해당 파일만 갱신)
+        self.search_index = TrigramIndex()
+        self.watcher.directories_changed.connect(self.search_index.refresh_directories)
+        # 무시 규칙: None 이면 IgnoreRules.DEFAULT_PATTERNS, .gitignore 도 함께 적용
+        self.ignore_patterns: Optional[List[str]] = None
+        self.use_gitignore: bool = True
+        # path -> 마지막으로 읽거나 쓴 시점의 (mtime_ns, size, sha1). 저장 충돌/외부 변경 판별용
+        self._disk_state: Dict[str, Tuple[int, int, str]] = {}
+        self.saver = FileSaver(self.changed_on_disk, self._record_disk_state)
+        self.saver.save_finished.connect(self._on_saved)
     
     def load_folder_tree(self, file_list_widget, folder_path):
-        file_list_widget.clear()
-        self.item_map.clear()
-        
-        for root, dirs, files in os.walk(folder_path):
-            rel = os.path.relpath(root, folder_path)
-            if rel == '.':
-                parent = None
-            else:
-                parent = self.item_map.get(rel)
-                if parent is None:
-                    parent = QTreeWidgetItem(file_list_widget)
-                    parent.setText(0, os.path.basename(rel))
-                    self.item_map[rel] = parent
+        # 최상위 한 단계만 백그라운드로 읽고, 나머지는 펼칠 때 로드
+        # 열린 탭은 폴더를 바꿔도 남아 있으므로 파일 감시는 그대로 두고 폴더 감시만 해제
+        self.watcher.clear_directories()
+        self.model.set_root(folder_path, self.ignore_patterns, self.use_gitignore)
+        self.path_index.build(folder_path, self.ignore_patterns, self.use_gitignore)
+        self.search_index.build(folder_path, self.ignore_patterns, self.use_gitignore)
+        if file_list_widget.model() is not self.model:
+            file_list_widget.setModel(self.model)
+    
+    def watch_file(self, file_path):
+        """열린 파일의 외부 변경 감시 (watcher.file_changed 로 알림)."""
+        self.watcher.watch_file(file_path)
 
-            for dir in dirs:
-                key = os.path.normpath(os.path.join(rel if rel != '.' else '', dir))
-                if parent is None:
-                    dir_item = QTreeWidgetItem(file_list_widget)
-                    dir_item.setText(0, f"📁 {dir}")
-                    dir_item.setData(0, 1, dir)
-                else:
-                    dir_item = QTreeWidgetItem(parent)
-                    dir_item.setText(0, f"📁 {dir}")
-                    dir_item.setData(0, 1, dir)
-                self.item_map[key] = dir_item
+    def unwatch_file(self, file_path):
+        self.watcher.unwatch_file(file_path)
+
+    def sniff_file(self, file_path):
+        """
+        파일을 통째로 읽기 전에 종류 판별.
+        returns: ('text' | 'large' | 'binary', size) / 실패 시 (None, 오류 메시지)
+        """
+        try:
+            size = os.path.getsize(file_path)
+            with open(file_path, 'rb') as f:
+                head = f.read(self.SNIFF_BYTES)
+        except Exception as e:
+            return None, str(e)
+        if b'\0' in head:
+            return 'binary', size
+        try:
+            head.decode('utf-8')
+        except UnicodeDecodeError as e:
+            # 잘린 멀티바이트 문자만 문제라면 텍스트로 취급
+            if e.start < len(head) - 3:
+                return 'binary', size
+        if size > self.LARGE_FILE_BYTES:
+            return 'large', size
+        return 'text', size
+
+    def open_large_file(self, file_path):
+        """대용량 파일 mmap 색인 시작. returns: (LargeFileIndex, None) / (None, 오류)"""
+        try:
+            index = LargeFileIndex(file_path)
+        except Exception as e:
+            return None, str(e)
+        index.start()
+        return index, None
 
-            for file in files:
-                if parent is None:
-                    file_item = QTreeWidgetItem(file_list_widget)
-                    file_item.setText(0, file)
-                    file_item.setData(0, 1, file)
-                else:
-                    file_item = QTreeWidgetItem(parent)
-                    file_item.setText(0, file)
-                    file_item.setData(0, 1, file)
-    
     def read_file(self, file_path):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read(), None
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            self._record_disk_state(file_path, data)
+            # 텍스트 모드와 같은 줄바꿈 정규화
+            return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n'), None
         except Exception as e:
             return None, str(e)
     
     def save_file(self, file_path, content):
+        """동기 저장 (원자적 교체)."""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            atomic_write(file_path, content)
+            self._record_disk_state(file_path)
+            self.search_index.update_file(file_path)
             return True, None
         except Exception as e:
             return False, str(e)
+
+    def save_file_async(self, file_path, content, force=False):
+        """
+        워커 스레드에서 원자적 저장. 마지막으로 읽은 뒤 디스크 파일이 바뀌었으면 거부한다 (force=True 면 덮어씀).
+        결과는 saver.save_finished(path, success, error, conflict) 로 전달.
+        """
+        self.saver.save(file_path, content, force)
+
+    def _on_saved(self, file_path, success, error, conflict):
+        if success:
+            self.search_index.update_file(file_path)
+
+    def changed_on_disk(self, file_path):
+        """마지막으로 읽거나 저장한 뒤 다른 프로세스가 파일을 바꿨는지 (mtime 이 달라도 내용이 같으면 False)."""
+        state = self._disk_state.get(file_path)
+        if state is None:
+            return False
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False  # 삭제된 경우는 저장으로 다시 만들면 됨
+        if st.st_mtime_ns == state[0] and st.st_size == state[1]:
+            return False
+        try:
+            with open(file_path, 'rb') as f:
+                return hashlib.sha1(f.read()).hexdigest() != state[2]
+        except OSError:
+            return True
+
+    def _record_disk_state(self, file_path, data=None):
+        try:
+            if data is None:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            st = os.stat(file_path)
+            self._disk_state[file_path] = (st.st_mtime_ns, st.st_size, hashlib.sha1(data).hexdigest())
+        except OSError:
+            self._disk_state.pop(file_path, None)
     
-    def get_file_path_from_item(self, item, folder_path):
-        path_parts = []
-        current = item
-        while current is not None:
-            # 저장된 실제 이름 가져오기
-            actual_name = current.data(0, 1)
-            if actual_name:
-                path_parts.insert(0, actual_name)
-            current = current.parent()
-        
-        return os.path.join(folder_path, *path_parts)
+    def get_file_path_from_item(self, item, folder_path=None):
+        # 노드가 절대 경로를 들고 있으므로 부모를 따라 올라갈 필요 없음
+        return self.model.path(item)
+
+    def is_directory_item(self, item):
+        return self.model.is_dir(item)
     
     def create_file(self, file_path):
         """새 파일 생성"""
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write("")
+            self.model.insert_path(file_path, False)
+            self.path_index.add_path(file_path)
             return True, None
         except Exception as e:
             return False, str(e)
@@ -82,6 +163,7 @@ class FileManager:
         """새 폴더 생성"""
         try:
             os.makedirs(folder_path, exist_ok=True)
+            self.model.insert_path(folder_path, True)
             return True, None
         except Exception as e:
             return False, str(e)
@@ -94,6 +176,9 @@ class FileManager:
                 shutil.rmtree(item_path)
             else:
                 os.remove(item_path)
+            self.model.remove_path(item_path)
+            self.path_index.remove_path(item_path)
+            self.search_index.remove_path(item_path)
             return True, None
         except Exception as e:
             return False, str(e)
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import threading
+from typing import Callable, Dict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+"""임시 파일에 쓰고 fsync 후 rename 으로 교체하는 원자적 저장"""
+def atomic_write(file_path: str, content: str):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(file_path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            # 원본 권한 유지 (새 파일이면 무시)
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        except OSError:
+            pass
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if os.name != 'nt':
+        # rename 자체도 디스크에 남도록 폴더 fsync
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+"""워커 스레드 -> GUI 스레드 시그널 중계"""
+class _SaveSignals(QObject):
+    finished = pyqtSignal(str, bool, str, bool)  # path, success, error, conflict
+
+
+"""저장 작업 하나"""
+class _SaveTask(QRunnable):
+    def __init__(self, file_path: str, content: str, check_conflict: Callable[[str], bool], on_written: Callable[[str], None], signals: _SaveSignals):
+        super().__init__()
+        self.file_path = file_path
+        self.content = content
+        self.check_conflict = check_conflict
+        self.on_written = on_written
+        self.signals = signals
+
+    def run(self):
+        try:
+            if self.check_conflict(self.file_path):
+                self.signals.finished.emit(self.file_path, False, "마지막으로 읽은 뒤 디스크의 파일이 변경되었습니다.", True)
+                return
+            atomic_write(self.file_path, self.content)
+            self.on_written(self.file_path)
+            self.signals.finished.emit(self.file_path, True, "", False)
+        except Exception as e:
+            self.signals.finished.emit(self.file_path, False, str(e), False)
+
+
+"""
+비동기 저장기.
+
+저장은 스레드 하나짜리 풀에서 순서대로 처리되므로 같은 파일의 저장이 뒤바뀌지 않는다.
+결과는 save_finished(path, success, error, conflict) 시그널로 GUI 스레드에 전달된다.
+"""
+class FileSaver(QObject):
+    save_finished = pyqtSignal(str, bool, str, bool)
+
+    def __init__(self, check_conflict: Callable[[str], bool], on_written: Callable[[str], None]):
+        super().__init__()
+        self.check_conflict = check_conflict
+        self.on_written = on_written
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+        self._signals = _SaveSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def save(self, file_path: str, content: str, force: bool = False):
+        with self._lock:
+            self._pending[file_path] = self._pending.get(file_path, 0) + 1
+        check = (lambda path: False) if force else self.check_conflict
+        self.pool.start(_SaveTask(file_path, content, check, self.on_written, self._signals))
+
+    def is_saving(self, file_path: str) -> bool:
+        with self._lock:
+            return self._pending.get(file_path, 0) > 0
+
+    def wait(self, timeout_ms: int = 5000) -> bool:
+        return self.pool.waitForDone(timeout_ms)
+
+    def _on_finished(self, file_path: str, success: bool, error: str, conflict: bool):
+        with self._lock:
+            left = self._pending.get(file_path, 1) - 1
+            if left > 0:
+                self._pending[file_path] = left
+            else:
+                self._pending.pop(file_path, None)
+        self.save_finished.emit(file_path, success, error, conflict)
@@ -0,0 +1,354 @@
+import os
+import itertools
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+
+from .ignore_rules import IgnoreRules
+
+
+"""트리 노드 (필요한 필드만 __slots__ 로 유지)"""
+class _Node:
+    __slots__ = ('name', 'path', 'parent', 'is_dir', 'children', 'loaded', 'loading', 'row')
+
+    def __init__(self, name: str, path: str, parent: Optional['_Node'], is_dir: bool):
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.is_dir = is_dir
+        self.children: List['_Node'] = []
+        self.loaded = not is_dir
+        self.loading = False
+        self.row = 0
+
+
+"""워커 스레드 -> 모델 시그널 중계"""
+class _ListingSignals(QObject):
+    done = pyqtSignal(int, str, object, bool)  # generation, dir path, [(name, is_dir)], refresh
+
+
+"""os.scandir 로 폴더 한 단계만 읽는 작업"""
+class _ListDirTask(QRunnable):
+    def __init__(self, generation: int, path: str, rules: Optional[IgnoreRules], signals: _ListingSignals, refresh: bool = False):
+        super().__init__()
+        self.generation = generation
+        self.path = path
+        self.rules = rules
+        self.signals = signals
+        self.refresh = refresh
+
+    def run(self):
+        entries: List[Tuple[str, bool]] = []
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if self.rules is not None and self.rules.is_ignored(entry.path, is_dir):
+                        continue
+                    entries.append((entry.name, is_dir))
+        except OSError:
+            pass
+        # 폴더 먼저, 이름순
+        entries.sort(key=lambda e: (not e[1], e[0].lower()))
+        self.signals.done.emit(self.generation, self.path, entries, self.refresh)
+
+
+"""
+지연 로딩 파일 트리 모델.
+
+- 폴더는 펼칠 때(fetchMore) 백그라운드에서 os.scandir 로 한 단계만 읽는다
+- 무시 규칙(IgnoreRules, .gitignore 포함)에 걸리는 항목은 만들지 않는다
+- path -> 노드 사전으로 경로 조회/삽입/삭제가 O(1)
+- refresh_directories() 는 이미 로드된 폴더를 다시 읽어 바뀐 행만 삽입/삭제한다
+"""
+class FileTreeModel(QAbstractItemModel):
+    PathRole = Qt.UserRole + 1
+    IsDirRole = Qt.UserRole + 2
+
+    directory_loaded = pyqtSignal(str)
+    directories_unloaded = pyqtSignal(list)
+
+    # 한 폴더에서 이보다 많이 바뀌면 행 단위 diff 대신 그 폴더의 자식을 통째로 교체
+    BULK_CHANGE_THRESHOLD = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root: Optional[_Node] = None
+        self.rules: Optional[IgnoreRules] = None
+        self._nodes: Dict[str, _Node] = {}
+        self._generation = itertools.count(1)
+        self._current_generation = 0
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(2)
+        self._signals = _ListingSignals()
+        self._signals.done.connect(self._on_listing_done)
+
+    # ---------- public ----------
+    def set_root(self, folder_path: str, ignore_patterns: Optional[List[str]] = None, use_gitignore: bool = True):
+        folder_path = os.path.abspath(folder_path)
+        self.beginResetModel()
+        self._current_generation = next(self._generation)
+        self.rules = IgnoreRules(folder_path, ignore_patterns, use_gitignore)
+        self.root = _Node(os.path.basename(folder_path), folder_path, None, True)
+        self._nodes = { folder_path: self.root }
+        self.endResetModel()
+        self._start_listing(self.root)
+
+    def clear(self):
+        self.beginResetModel()
+        self._current_generation = next(self._generation)
+        self.root = None
+        self._nodes = {}
+        self.endResetModel()
+
+    def path(self, index: QModelIndex) -> str:
+        node = self._node(index)
+        return node.path if node is not None else ""
+
+    def is_dir(self, index: QModelIndex) -> bool:
+        node = self._node(index)
+        return bool(node and node.is_dir)
+
+    def index_for_path(self, path: str) -> QModelIndex:
+        node = self._nodes.get(os.path.abspath(path))
+        if node is None or node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def insert_path(self, path: str, is_dir: bool) -> bool:
+        """새로 생긴 항목을 (부모가 이미 로드된 경우에만) 정렬 위치에 끼워 넣는다."""
+        path = os.path.abspath(path)
+        parent = self._nodes.get(os.path.dirname(path))
+        if parent is None or not parent.loaded or path in self._nodes:
+            return False
+        if self.rules is not None and self.rules.is_ignored(path, is_dir):
+            return False
+        node = _Node(os.path.basename(path), path, parent, is_dir)
+        key = (not is_dir, node.name.lower())
+        row = 0
+        while row < len(parent.children) and (not parent.children[row].is_dir, parent.children[row].name.lower()) < key:
+            row += 1
+        self.beginInsertRows(self._index_of(parent), row, row)
+        parent.children.insert(row, node)
+        self._renumber(parent, row)
+        self._nodes[path] = node
+        self.endInsertRows()
+        return True
+
+    def refresh_directories(self, paths: List[str]):
+        """로드된 폴더만 백그라운드에서 다시 읽는다 (결과는 diff 로 반영)."""
+        for path in paths:
+            node = self._nodes.get(os.path.abspath(path))
+            if node is not None and node.is_dir and node.loaded:
+                self.pool.start(_ListDirTask(self._current_generation, node.path, self.rules, self._signals, True))
+            elif node is None and not os.path.isdir(path):
+                # 감시 중이던 폴더 자체가 사라짐
+                self.remove_path(path)
+
+    def remove_path(self, path: str) -> bool:
+        node = self._nodes.get(os.path.abspath(path))
+        if node is None or node.parent is None:
+            return False
+        parent = node.parent
+        row = node.row
+        self.beginRemoveRows(self._index_of(parent), row, row)
+        del parent.children[row]
+        self._renumber(parent, row)
+        self._forget(node)
+        self.endRemoveRows()
+        return True
+
+    # ---------- QAbstractItemModel ----------
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        parent_node = self._node(parent) if parent.isValid() else self.root
+        if parent_node is None or column != 0 or not (0 <= row < len(parent_node.children)):
+            return QModelIndex()
+        return self.createIndex(row, 0, parent_node.children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        node = self._node(index)
+        if node is None or node.parent is None or node.parent is self.root:
+            return QModelIndex()
+        return self.createIndex(node.parent.row, 0, node.parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        node = self._node(parent) if parent.isValid() else self.root
+        return len(node.children) if node is not None else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self._node(parent) if parent.isValid() else self.root
+        if node is None or not node.is_dir:
+            return False
+        # 아직 읽지 않은 폴더는 펼침 표시를 보여줌
+        return bool(node.children) or not node.loaded
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self._node(parent) if parent.isValid() else self.root
+        return bool(node and node.is_dir and not node.loaded and not node.loading)
+
+    def fetchMore(self, parent: QModelIndex):
+        node = self._node(parent) if parent.isValid() else self.root
+        if node is not None and node.is_dir and not node.loaded and not node.loading:
+            self._start_listing(node)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        node = self._node(index)
+        if node is None:
+            return None
+        if role == Qt.DisplayRole:
+            return f"📁 {node.name}" if node.is_dir else node.name
+        if role == Qt.ToolTipRole or role == self.PathRole:
+            return node.path
+        if role == self.IsDirRole:
+            return node.is_dir
+        return None
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    # ---------- internals ----------
+    @staticmethod
+    def _node(index: QModelIndex) -> Optional[_Node]:
+        return index.internalPointer() if index.isValid() else None
+
+    def _index_of(self, node: _Node) -> QModelIndex:
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    @staticmethod
+    def _renumber(parent: _Node, start: int):
+        for row in range(start, len(parent.children)):
+            parent.children[row].row = row
+
+    def _forget(self, node: _Node):
+        unloaded = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._nodes.pop(current.path, None)
+            if current.is_dir and current.loaded:
+                unloaded.append(current.path)
+            stack.extend(current.children)
+        if unloaded:
+            self.directories_unloaded.emit(unloaded)
+
+    def _start_listing(self, node: _Node):
+        node.loading = True
+        self.pool.start(_ListDirTask(self._current_generation, node.path, self.rules, self._signals))
+
+    def _on_listing_done(self, generation: int, path: str, entries, refresh: bool):
+        if generation != self._current_generation:
+            return  # 다른 폴더를 연 뒤 도착한 결과
+        node = self._nodes.get(path)
+        if node is None:
+            return
+        if refresh:
+            if node.loaded:
+                self._apply_diff(node, entries)
+            return
+        if node.loaded:
+            return
+        node.loading = False
+        node.loaded = True
+        if entries:
+            self.beginInsertRows(self._index_of(node), 0, len(entries) - 1)
+            for row, (name, is_dir) in enumerate(entries):
+                child = _Node(name, os.path.join(path, name), node, is_dir)
+                child.row = row
+                node.children.append(child)
+                self._nodes[child.path] = child
+            self.endInsertRows()
+        else:
+            # 빈 폴더: 펼침 표시 갱신
+            index = self._index_of(node)
+            if index.isValid():
+                self.dataChanged.emit(index, index)
+        self.directory_loaded.emit(path)
+
+    def _apply_diff(self, node: _Node, entries: List[Tuple[str, bool]]):
+        """새 목록과 현재 자식을 비교해 사라진 행은 삭제, 새 행은 삽입 (연속 구간 단위)."""
+        wanted = { name: is_dir for name, is_dir in entries }
+        current = { c.name: c.is_dir for c in node.children }
+        # 이름은 같지만 파일<->폴더가 바뀐 경우도 삭제 후 삽입
+        removed_rows = [c.row for c in node.children if wanted.get(c.name) != c.is_dir]
+        added = [(name, is_dir) for name, is_dir in entries if current.get(name) != is_dir]
+        if not removed_rows and not added:
+            return
+        parent_index = self._index_of(node)
+
+        if len(removed_rows) + len(added) > self.BULK_CHANGE_THRESHOLD:
+            self._replace_children(node, parent_index, entries)
+            return
+
+        # 삭제: 뒤쪽 구간부터 지워야 앞쪽 행 번호가 유지된다
+        for first, last in reversed(self._runs(removed_rows)):
+            self.beginRemoveRows(parent_index, first, last)
+            gone = node.children[first:last + 1]
+            del node.children[first:last + 1]
+            self._renumber(node, first)
+            for child in gone:
+                self._forget(child)
+            self.endRemoveRows()
+
+        # 삽입: 최종 정렬 순서에서 새 항목이 이어진 구간마다 한 번씩
+        if added:
+            added_names = { name for name, _ in added }
+            row = 0
+            pending: List[_Node] = []
+            for name, is_dir in entries:
+                if name in added_names:
+                    pending.append(_Node(name, os.path.join(node.path, name), node, is_dir))
+                    continue
+                if pending:
+                    self._insert_run(node, parent_index, row, pending)
+                    row += len(pending)
+                    pending = []
+                row += 1
+            if pending:
+                self._insert_run(node, parent_index, row, pending)
+
+    def _insert_run(self, node: _Node, parent_index: QModelIndex, row: int, new_nodes: List[_Node]):
+        self.beginInsertRows(parent_index, row, row + len(new_nodes) - 1)
+        node.children[row:row] = new_nodes
+        self._renumber(node, row)
+        for child in new_nodes:
+            self._nodes[child.path] = child
+        self.endInsertRows()
+
+    def _replace_children(self, node: _Node, parent_index: QModelIndex, entries: List[Tuple[str, bool]]):
+        """대량 변경: 기존 하위 노드는 (이름과 종류가 같으면) 재사용하고 행은 한 번에 교체."""
+        old = { (c.name, c.is_dir): c for c in node.children }
+        if node.children:
+            self.beginRemoveRows(parent_index, 0, len(node.children) - 1)
+            kept = { (name, is_dir) for name, is_dir in entries }
+            for key, child in old.items():
+                if key not in kept:
+                    self._forget(child)
+            node.children = []
+            self.endRemoveRows()
+        if entries:
+            self.beginInsertRows(parent_index, 0, len(entries) - 1)
+            for row, (name, is_dir) in enumerate(entries):
+                child = old.get((name, is_dir)) or _Node(name, os.path.join(node.path, name), node, is_dir)
+                child.row = row
+                node.children.append(child)
+                self._nodes[child.path] = child
+            self.endInsertRows()
+
+    @staticmethod
+    def _runs(rows: List[int]) -> List[Tuple[int, int]]:
+        runs: List[Tuple[int, int]] = []
+        for row in sorted(rows):
+            if runs and runs[-1][1] == row - 1:
+                runs[-1] = (runs[-1][0], row)
+            else:
+                runs.append((row, row))
+        return runs
@@ -0,0 +1,85 @@
+import os
+from typing import List, Set
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+
+"""
+파일 시스템 변경 감시.
+
+QFileSystemWatcher 이벤트를 바로 처리하지 않고 DEBOUNCE_MS 동안 모아서 한 번에 내보낸다.
+git checkout 처럼 수천 개의 이벤트가 몰려도 폴더별로 한 번씩만 알리므로 GUI 가 멈추지 않는다.
+타이머는 재시작하지 않으므로 이벤트가 계속 들어와도 최대 DEBOUNCE_MS 마다 한 번은 반영된다.
+"""
+class FileWatcher(QObject):
+    directories_changed = pyqtSignal(list)  # 내용이 바뀐 폴더 경로 목록
+    file_changed = pyqtSignal(str)          # 감시 중인 파일이 바뀌거나 삭제됨
+
+    DEBOUNCE_MS = 200
+
+    def __init__(self):
+        super().__init__()
+        self._watcher = QFileSystemWatcher()
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._dirty_dirs: Set[str] = set()
+        self._dirty_files: Set[str] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._flush)
+
+    def watch_directory(self, path: str):
+        if path not in self._watcher.directories():
+            self._watcher.addPath(path)
+
+    def unwatch_directories(self, paths: List[str]):
+        watched = set(self._watcher.directories())
+        targets = [p for p in paths if p in watched]
+        if targets:
+            self._watcher.removePaths(targets)
+
+    def watch_file(self, path: str):
+        """열린 파일 감시 추가 (탭마다 하나씩)."""
+        if path and os.path.isfile(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+    def unwatch_file(self, path: str):
+        self._dirty_files.discard(path)
+        if path in self._watcher.files():
+            self._watcher.removePath(path)
+
+    def clear_directories(self):
+        """폴더 감시만 모두 해제 (다른 폴더를 열 때). 열린 탭의 파일 감시는 유지한다."""
+        paths = self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        self._dirty_dirs.clear()
+
+    def clear(self):
+        paths = self._watcher.directories() + self._watcher.files()
+        if paths:
+            self._watcher.removePaths(paths)
+        self._dirty_dirs.clear()
+        self._dirty_files.clear()
+        self._timer.stop()
+
+    def _on_directory_changed(self, path: str):
+        self._dirty_dirs.add(path)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _on_file_changed(self, path: str):
+        self._dirty_files.add(path)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _flush(self):
+        dirs, self._dirty_dirs = sorted(self._dirty_dirs), set()
+        files, self._dirty_files = sorted(self._dirty_files), set()
+        if dirs:
+            self.directories_changed.emit(dirs)
+        for path in files:
+            # 에디터의 저장 방식(임시 파일 후 교체 등)에 따라 감시가 풀릴 수 있으므로 다시 등록
+            if os.path.isfile(path) and path not in self._watcher.files():
+                self._watcher.addPath(path)
+            self.file_changed.emit(path)
@@ -0,0 +1,116 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+"""
+.gitignore 스타일 무시 규칙.
+
+- 기본 패턴(DEFAULT_PATTERNS) + 폴더별 .gitignore 를 지원
+- 지원 문법: 주석(#), 부정(!), 디렉토리 전용(끝의 /), 루트 고정(앞의 /), *, ?, **
+- 규칙은 정규식으로 한 번만 컴파일해 두고, .gitignore 는 폴더별로 한 번만 읽는다
+"""
+class IgnoreRules:
+    DEFAULT_PATTERNS = [
+        '.git/', '.hg/', '.svn/', 'node_modules/', 'venv/', '.venv/', '__pycache__/',
+        '.mypy_cache/', '.pytest_cache/', '.tox/', '.DS_Store', '*.pyc',
+    ]
+
+    def __init__(self, root: str, patterns: Optional[List[str]] = None, use_gitignore: bool = True):
+        self.root = os.path.abspath(root)
+        self.use_gitignore = use_gitignore
+        self._base = [r for r in (self._compile(p, '') for p in (patterns if patterns is not None else self.DEFAULT_PATTERNS)) if r]
+        # rel_dir -> 그 폴더의 .gitignore 규칙 (regex, negate, dir_only)
+        self._per_dir: Dict[str, List[Tuple[re.Pattern, bool, bool]]] = {}
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        rel = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+        if rel == '.' or rel.startswith('../'):
+            return False
+        ignored = False
+        for regex, negate, dir_only in self._rules_for(rel):
+            m = regex.match(rel)
+            if m is None:
+                continue
+            # 디렉토리 전용 규칙은 파일이면 상위 폴더가 일치한 경우에만 적용
+            if dir_only and not is_dir and not m.group('rest'):
+                continue
+            ignored = not negate
+        return ignored
+
+    def _rules_for(self, rel: str) -> List[Tuple[re.Pattern, bool, bool]]:
+        rules = list(self._base)
+        if not self.use_gitignore:
+            return rules
+        # 루트부터 상위 폴더 순서로 .gitignore 규칙을 쌓는다 (가까운 폴더가 우선)
+        parts = rel.split('/')[:-1]
+        for depth in range(len(parts) + 1):
+            rules.extend(self._load_dir('/'.join(parts[:depth])))
+        return rules
+
+    def _load_dir(self, rel_dir: str) -> List[Tuple[re.Pattern, bool, bool]]:
+        cached = self._per_dir.get(rel_dir)
+        if cached is not None:
+            return cached
+        rules = []
+        path = os.path.join(self.root, rel_dir, '.gitignore')
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    rule = self._compile(line.rstrip('\n'), rel_dir)
+                    if rule:
+                        rules.append(rule)
+        except OSError:
+            pass
+        self._per_dir[rel_dir] = rules
+        return rules
+
+    @staticmethod
+    def _compile(pattern: str, base: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+        pattern = pattern.rstrip()
+        if not pattern or pattern.startswith('#'):
+            return None
+        negate = pattern.startswith('!')
+        if negate:
+            pattern = pattern[1:]
+        dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        if not pattern:
+            return None
+        # 중간에 / 가 있으면 .gitignore 위치 기준 고정, 없으면 아무 깊이에서나 일치
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+
+        out = []
+        i = 0
+        while i < len(pattern):
+            c = pattern[i]
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                out.append('.*')
+                i += 2
+                continue
+            if c == '*':
+                out.append('[^/]*')
+            elif c == '?':
+                out.append('[^/]')
+            elif c == '[':
+                end = pattern.find(']', i + 1)
+                if end == -1:
+                    out.append(re.escape(c))
+                else:
+                    out.append(pattern[i:end + 1])
+                    i = end + 1
+                    continue
+            else:
+                out.append(re.escape(c))
+            i += 1
+        body = ''.join(out)
+        prefix = (re.escape(base) + '/') if base else ''
+        if not anchored:
+            prefix += '(?:.*/)?'
+        # 폴더가 일치하면 그 아래 전부 일치
+        return re.compile('^' + prefix + body + '(?P<rest>/.*)?$'), negate, dir_only
@@ -0,0 +1,21 @@
+import os
+
+# 확장자 -> 언어 이름 (에이전트 프롬프트의 코드 블록 언어, 구문 강조 규칙 선택에 쓴다)
+EXTENSION_LANGUAGES = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.json': 'json',
+    '.md': 'markdown',
+    '.c': 'c',
+    '.cpp': 'cpp',
+    '.h': 'c',
+    '.java': 'java',
+    '.html': 'html',
+    '.css': 'css',
+}
+
+
+def language_for(filename: str) -> str:
+    """파일 이름(또는 경로)의 확장자로 언어 이름을 추정. 모르면 빈 문자열."""
+    return EXTENSION_LANGUAGES.get(os.path.splitext(filename)[1].lower(), '')
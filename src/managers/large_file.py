@@ -0,0 +1,143 @@
+import os
+import mmap
+import threading
+from array import array
+from typing import List, Optional, Tuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+"""
+대용량 파일 읽기 전용 접근.
+
+파일을 mmap 으로 열고, 백그라운드 스레드에서 줄 시작 위치를 STRIDE 줄마다 하나씩만 기록한다
+(줄 400만 개 기준 약 0.5MB). 특정 줄 범위는 가장 가까운 기록 지점에서 최대 STRIDE-1 줄만 건너뛰어 읽는다.
+"""
+class LargeFileIndex(QObject):
+    progress = pyqtSignal(int)   # 지금까지 색인된 줄 수
+    finished = pyqtSignal(int)   # 전체 줄 수
+
+    STRIDE = 64
+    # 한 줄에서 화면에 보여줄 최대 바이트 (한 줄짜리 거대 JSON 대비)
+    MAX_LINE_BYTES = 4096
+    PROGRESS_EVERY = 1 << 16
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        # _sparse[i] = (i * STRIDE) 번째 줄의 시작 오프셋
+        self._sparse = array('Q', [0])
+        self._line_count = 0
+        self.done = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 색인 스레드가 mmap 을 읽는 중에 close 되면 스레드가 끝날 때 대신 닫는다
+        self._lock = threading.Lock()
+        self._building = False
+        self._closing = False
+
+    @property
+    def line_count(self) -> int:
+        return self._line_count
+
+    def start(self):
+        self._building = True
+        self._thread = threading.Thread(target=self._build, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1)
+        with self._lock:
+            self._closing = True
+            if self._building:
+                # 아직 스캔 중 (join 시간 초과): 색인 스레드가 끝나면서 닫는다
+                return
+        self._release()
+
+    def _release(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def get_lines(self, start: int, count: int) -> List[str]:
+        """[start, start+count) 줄을 디코딩해서 반환 (색인된 범위까지만)."""
+        mm = self._mm
+        if mm is None or count <= 0:
+            return []
+        end_line = min(start + count, self._line_count)
+        if start >= end_line:
+            return []
+        block = start // self.STRIDE
+        if block >= len(self._sparse):
+            return []
+        pos = self._sparse[block]
+        for _ in range(start - block * self.STRIDE):
+            nl = mm.find(b'\n', pos)
+            if nl == -1:
+                return []
+            pos = nl + 1
+        lines = []
+        for _ in range(end_line - start):
+            nl = mm.find(b'\n', pos)
+            stop = self.size if nl == -1 else nl
+            raw = mm[pos:min(stop, pos + self.MAX_LINE_BYTES)]
+            text = raw.decode('utf-8', errors='replace').rstrip('\r')
+            if stop - pos > self.MAX_LINE_BYTES:
+                text += ' …'
+            lines.append(text)
+            if nl == -1:
+                break
+            pos = nl + 1
+        return lines
+
+    def offset_of(self, line: int) -> Tuple[int, int]:
+        """디버그/점프용: line 이 속한 기록 지점 (블록 번호, 오프셋)."""
+        block = min(line // self.STRIDE, len(self._sparse) - 1)
+        return block, self._sparse[block]
+
+    def _build(self):
+        try:
+            self._scan()
+        finally:
+            with self._lock:
+                self._building = False
+                closing = self._closing
+            if closing:
+                self._release()
+
+    def _scan(self):
+        mm = self._mm
+        if mm is None:
+            self.done = True
+            self.finished.emit(0)
+            return
+        pos = 0
+        lines = 0
+        find = mm.find
+        sparse = self._sparse
+        stride = self.STRIDE
+        report = self.PROGRESS_EVERY
+        while not self._stop.is_set():
+            nl = find(b'\n', pos)
+            if nl == -1:
+                # 마지막 줄 (개행으로 끝나지 않는 경우)
+                if pos < self.size:
+                    lines += 1
+                break
+            lines += 1
+            pos = nl + 1
+            if lines % stride == 0:
+                sparse.append(pos)
+            if lines % report == 0:
+                self._line_count = lines
+                self.progress.emit(lines)
+        if self._stop.is_set():
+            return
+        self._line_count = lines
+        self.done = True
+        self.finished.emit(lines)
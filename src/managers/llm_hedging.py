@@ -0,0 +1,227 @@
+import os
+import time
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .model_manager import CancelToken
+
+
+"""헤지 요청 하나의 진행 상태 (어느 시도가 on_token 을 쓰고 있는지, 시도별 취소 토큰)"""
+class _Race:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tokens: List[CancelToken] = []
+        self.aliases: List[str] = []
+        # 처음 토큰을 보낸 시도만 on_token 으로 중계한다
+        self.owner: Optional[int] = None
+        self.done = False
+
+    def claim(self, index: int) -> bool:
+        with self.lock:
+            if self.owner is None:
+                self.owner = index
+            return self.owner == index and not self.done
+
+    def finish(self, winner: Optional[int] = None):
+        """승자를 뺀 나머지 시도를 모두 취소한다."""
+        with self.lock:
+            self.done = True
+            tokens = [token for i, token in enumerate(self.tokens) if i != winner]
+        for token in tokens:
+            token.cancel()
+
+
+"""
+같은 chat 요청을 여러 모델 별칭에 경쟁시켜 꼬리 지연을 줄이는 헤징 실행기.
+
+- 먼저 model_alias(없으면 기본 모델)로 보내고, delay 안에 첫 토큰(스트림)이나 응답(비스트림)이 없으면
+  aliases 의 다음 별칭으로 같은 요청을 한 번 더 보낸다. delay 가 0 이면 바로 보낸다.
+- validate 를 통과한 응답이 먼저 도착한 쪽이 이기고 나머지는 CancelToken 으로 닫는다.
+  진행 중인 시도가 실패하거나 검증에 떨어지면 다음 별칭을 기다리지 않고 바로 보낸다.
+- delay 를 정하지 않으면 텔레메트리의 최근 p95 (스트림은 TTFT, 비스트림은 전체 지연) 를 쓴다.
+- budget: 호출마다 budget 만큼 헤지 권한이 쌓이고(최대 burst) 헤지 하나에 1 씩 쓴다 → 길게 보면 호출의 budget 비율만 헤지.
+  max_inflight: 동시에 진행 중인 헤지 요청 수 상한. 둘 중 하나라도 막히면 첫 요청만 기다린다.
+- on_token 은 처음 토큰을 보낸 시도의 것만 전달하고, 다른 시도가 이기면 안내 문구 뒤에 그 전체 텍스트를 보낸다.
+설정: $LLM_HEDGE_ALIASES (쉼표 구분, 없으면 꺼짐), $LLM_HEDGE_DELAY_MS, $LLM_HEDGE_BUDGET, $LLM_HEDGE_MAX_INFLIGHT
+"""
+class HedgedChat:
+    DEFAULT_DELAY_MS = 2000.0
+    MIN_DELAY_MS = 50.0
+    # 텔레메트리로 delay 를 정하기 위한 최소 표본 수
+    MIN_SAMPLES = 20
+    POLL_SECONDS = 0.05
+    SWITCH_NOTICE = "\n\n[{alias} 응답이 먼저 완료되어 그 결과로 교체합니다]\n\n"
+
+    def __init__(self, model_manager, aliases: List[str], delay_ms: Optional[float] = None, budget: float = 0.1,
+                 burst: float = 2.0, max_inflight: int = 2):
+        self.model_manager = model_manager
+        self.aliases = list(aliases)
+        self.delay_ms = delay_ms
+        self.budget = budget
+        self.burst = burst
+        self.max_inflight = max_inflight
+        self._lock = threading.Lock()
+        self._credits = burst
+        self._inflight = 0
+        self._stats = {'calls': 0, 'hedges': 0, 'hedge_wins': 0, 'failovers': 0, 'invalid': 0,
+                       'skipped_budget': 0, 'skipped_inflight': 0}
+
+    @classmethod
+    def from_env(cls, model_manager) -> Optional['HedgedChat']:
+        aliases = [a.strip() for a in os.getenv('LLM_HEDGE_ALIASES', '').split(',') if a.strip()]
+        if not aliases:
+            return None
+        delay = os.getenv('LLM_HEDGE_DELAY_MS')
+        return cls(model_manager, aliases,
+                   delay_ms=float(delay) if delay else None,
+                   budget=float(os.getenv('LLM_HEDGE_BUDGET', '0.1')),
+                   max_inflight=int(os.getenv('LLM_HEDGE_MAX_INFLIGHT', '2')))
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats, inflight=self._inflight, credits=round(self._credits, 2))
+
+    def hedge_delay(self, alias: str, stream: bool) -> float:
+        """다음 별칭을 보내기 전 기다릴 시간 (초)."""
+        if self.delay_ms is not None:
+            return max(0.0, self.delay_ms) / 1000
+        summary = self.model_manager.telemetry.summary(alias)
+        p95 = summary['ttft_p95_ms'] if stream else summary['latency_p95_ms']
+        if p95 is None or summary['window'] < self.MIN_SAMPLES:
+            return self.DEFAULT_DELAY_MS / 1000
+        return max(self.MIN_DELAY_MS, p95) / 1000
+
+    def chat(self, messages: List[Dict[str, str]], model_alias: Optional[str] = None, temperature: float = 0.2,
+             max_tokens: Optional[int] = None, on_token: Optional[Callable[[str], None]] = None,
+             cancel_token: Optional[CancelToken] = None, validate: Optional[Callable[[str], bool]] = None) -> Tuple[bool, str]:
+        """
+        ModelManager.chat 과 같은 인자/반환값. validate(text) 가 False 인 성공 응답은 이긴 것으로 치지 않는다.
+        아무 시도도 검증을 통과하지 못하면 성공했던 응답(없으면 첫 시도의 오류)을 그대로 돌려준다.
+        """
+        manager = self.model_manager
+        primary = model_alias or manager.default_model_alias
+        candidates = [primary] + [a for a in self.aliases if a != primary and a in manager.models]
+        if len(candidates) == 1:
+            return manager.chat(messages, primary, temperature, max_tokens, on_token, cancel_token)
+        with self._lock:
+            self._stats['calls'] += 1
+            self._credits = min(self.burst, self._credits + self.budget)
+
+        stream = on_token is not None
+        delay = self.hedge_delay(primary, stream)
+        race = _Race()
+        results: queue.Queue = queue.Queue()
+        request = (messages, temperature, max_tokens, on_token)
+
+        self._start(race, results, primary, request, hedge=False)
+        pending = 1
+        hedging = True
+        deadline = time.perf_counter() + delay
+        winner: Optional[Tuple[int, str]] = None
+        fallback: Optional[Tuple[int, bool, str]] = None
+
+        while pending or len(race.tokens) < len(candidates):
+            if cancel_token is not None and cancel_token.cancelled:
+                race.finish()
+                return False, manager.CANCELLED_MESSAGE
+            more = len(race.tokens) < len(candidates)
+            if pending == 0:
+                # 진행 중인 시도가 없으면 다음 별칭으로 바로 넘긴다 (중복 요청이 아니므로 예산을 쓰지 않음)
+                self._start(race, results, candidates[len(race.tokens)], request, hedge=False)
+                self._count('failovers')
+                pending += 1
+                continue
+            # 스트림은 첫 토큰이 오기 시작하면 더 헤지하지 않는다
+            waiting = hedging and more and (not stream or race.owner is None)
+            timeout = self.POLL_SECONDS
+            if waiting:
+                timeout = min(timeout, max(0.0, deadline - time.perf_counter()))
+            try:
+                index, ok, text = results.get(timeout=timeout)
+            except queue.Empty:
+                if waiting and time.perf_counter() >= deadline:
+                    if self._acquire_hedge():
+                        self._start(race, results, candidates[len(race.tokens)], request, hedge=True)
+                        pending += 1
+                        deadline = time.perf_counter() + delay
+                    else:
+                        hedging = False
+                continue
+
+            pending -= 1
+            if ok and (validate is None or validate(text)):
+                winner = (index, text)
+                break
+            if ok:
+                self._count('invalid')
+            if fallback is None or (ok and not fallback[1]):
+                fallback = (index, ok, text)
+            if pending and more and hedging:
+                # 먼저 끝난 시도가 실패했으니 기다리지 않고 다음 별칭을 보낸다
+                deadline = time.perf_counter()
+
+        race.finish(winner[0] if winner is not None else None)
+        if cancel_token is not None and cancel_token.cancelled:
+            return False, manager.CANCELLED_MESSAGE
+        if winner is not None:
+            index, text = winner
+            if index > 0:
+                self._count('hedge_wins')
+            self._replay(race, index, text, on_token)
+            return True, text
+        # 검증을 통과한 응답이 없으면 성공 응답(검증 실패)이나 첫 오류를 그대로 돌려준다
+        index, ok, text = fallback
+        if ok:
+            self._replay(race, index, text, on_token)
+        return ok, text
+
+    def _start(self, race: _Race, results: queue.Queue, alias: str, request: tuple, hedge: bool):
+        messages, temperature, max_tokens, on_token = request
+        index = len(race.tokens)
+        token = CancelToken()
+        race.tokens.append(token)
+        race.aliases.append(alias)
+
+        def forward(delta: str):
+            if race.claim(index):
+                on_token(delta)
+
+        def run():
+            try:
+                ok, text = self.model_manager.chat(messages, alias, temperature, max_tokens,
+                                                   forward if on_token is not None else None, token)
+            except Exception as e:
+                ok, text = False, f"요청 실패: {str(e)}"
+            finally:
+                if hedge:
+                    with self._lock:
+                        self._inflight -= 1
+            results.put((index, ok, text))
+
+        threading.Thread(target=run, name=f"llm-hedge-{alias}", daemon=True).start()
+
+    def _acquire_hedge(self) -> bool:
+        with self._lock:
+            if self._inflight >= self.max_inflight:
+                self._stats['skipped_inflight'] += 1
+                return False
+            if self._credits < 1:
+                self._stats['skipped_budget'] += 1
+                return False
+            self._credits -= 1
+            self._inflight += 1
+            self._stats['hedges'] += 1
+            return True
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _replay(self, race: _Race, index: int, text: str, on_token: Optional[Callable[[str], None]]):
+        """이긴 시도가 화면에 스트리밍하던 시도가 아니면 그 결과를 통째로 다시 보낸다."""
+        if on_token is None or race.owner == index:
+            return
+        if race.owner is not None:
+            on_token(self.SWITCH_NOTICE.format(alias=race.aliases[index]))
+        on_token(text)
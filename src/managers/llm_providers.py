@@ -0,0 +1,85 @@
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class OpenAICompatibleProvider:
+    """
+    OpenAI 호환 /chat/completions 엔드포인트를 쓰는 프로바이더 (Cerebras, 로컬 서버 등).
+
+    ModelManager.register_provider 로 등록하면 모델 별칭이 이 프로바이더를 가리킬 수 있다.
+    HTTP 재시도/세션/응답 처리는 ModelManager 의 것을 쓰고, 여기서는 URL/인증/페이로드만 정한다.
+    다른 형식의 API 는 이 클래스를 상속해 chat 을 바꾸면 된다.
+    """
+
+    def __init__(self, name: str, base_url: str, api_key_env: Optional[str] = None, api_key: Optional[str] = None,
+                 label: Optional[str] = None, headers: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        # api_key_env 가 있으면 키가 필수, 둘 다 없으면 인증 없이 요청 (로컬 서버)
+        self.api_key_env = api_key_env
+        self._api_key = api_key
+        self.label = label or name
+        self.extra_headers = dict(headers or {})
+
+    @property
+    def chat_completions_url(self) -> str:
+        return f"{self.base_url}/chat/completions"
+
+    def api_key(self) -> Optional[str]:
+        if self._api_key:
+            return self._api_key
+        return os.getenv(self.api_key_env) if self.api_key_env else None
+
+    def headers(self, api_key: Optional[str]) -> Dict[str, str]:
+        headers = {'Content-Type': 'application/json'}
+        if api_key:
+            headers['Authorization'] = f'Bearer {api_key}'
+        headers.update(self.extra_headers)
+        return headers
+
+    def build_payload(self, messages: List[Dict[str, str]], model: str, temperature: float, max_tokens: Optional[int], stream: bool) -> Dict:
+        payload: Dict = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+        }
+        if max_tokens is not None:
+            payload['max_tokens'] = max_tokens
+        if stream:
+            payload['stream'] = True
+        return payload
+
+    def chat(self, manager, messages: List[Dict[str, str]], model: str, temperature: float, max_tokens: Optional[int],
+             on_token: Optional[Callable[[str], None]] = None, cancel_token=None, metrics=None) -> Tuple[bool, str]:
+        api_key = self.api_key()
+        if self.api_key_env and not api_key:
+            return False, f"{self.api_key_env} 가 설정되지 않았습니다. 프로젝트 루트의 .env 에 설정해주세요."
+
+        payload = self.build_payload(messages, model, temperature, max_tokens, on_token is not None)
+        if cancel_token is not None and cancel_token.cancelled:
+            return False, manager.CANCELLED_MESSAGE
+
+        try:
+            resp = manager._post_with_retry(self.name, self.chat_completions_url, self.headers(api_key), payload, cancel_token, metrics)
+            if resp is None:
+                return False, manager.CANCELLED_MESSAGE
+            return manager._read_response(resp, payload, on_token, cancel_token, self.label, metrics)
+        except Exception as e:
+            if cancel_token is not None and cancel_token.cancelled:
+                return False, manager.CANCELLED_MESSAGE
+            return False, f"요청 실패: {str(e)}"
+
+
+def cerebras() -> OpenAICompatibleProvider:
+    return OpenAICompatibleProvider('cerebras', 'https://api.cerebras.ai/v1', api_key_env='LLAMA_API_KEY', label='Cerebras')
+
+
+def local_from_env() -> Optional[OpenAICompatibleProvider]:
+    """
+    $LLM_LOCAL_URL (예: http://127.0.0.1:8808/v1) 이 있으면 그 OpenAI 호환 서버를 'local' 프로바이더로.
+    benchmarks/mock_llm_server.py 나 vLLM / llama.cpp 서버 등을 가리킬 수 있다. 키는 $LLM_LOCAL_API_KEY (선택).
+    """
+    url = os.getenv('LLM_LOCAL_URL')
+    if not url:
+        return None
+    return OpenAICompatibleProvider('local', url, api_key=os.getenv('LLM_LOCAL_API_KEY'), label='Local')
@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .cache_paths import cache_root
+
+
+class CallMetrics:
+    """chat 호출 하나를 진행하면서 프로바이더/HTTP 단계가 채우는 측정값."""
+
+    __slots__ = ('started', 'first_token_at', 'retries', 'request_bytes', 'status', 'prompt_tokens', 'completion_tokens', 'chunks')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.retries = 0
+        self.request_bytes = 0
+        self.status: Optional[int] = None
+        # 서버가 usage 를 주면 그 값, 아니면 None (스트림 조각 수로 추정)
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self.chunks = 0
+
+    def token(self):
+        """스트림에서 내용 조각을 하나 받았을 때."""
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.chunks += 1
+
+    def usage(self, usage: Optional[Dict]):
+        if usage:
+            self.prompt_tokens = usage.get('prompt_tokens', self.prompt_tokens)
+            self.completion_tokens = usage.get('completion_tokens', self.completion_tokens)
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+"""
+LLM 호출 텔레메트리.
+
+ModelManager.chat 이 호출마다 record 로 넘기는 기록(별칭, 토큰 수, 요청 크기, TTFT, 지연, 재시도, 캐시 적중)을
+- JSONL 파일에 한 줄씩 쓰고 (max_bytes 를 넘으면 .1, .2 … 로 밀어내며 backups 개까지 보관)
+- 별칭마다 최근 WINDOW 개로 p50/p95 를 계산할 수 있게 들고 있고
+- recorded 시그널로 알린다 (워커 스레드에서 호출되므로 GUI 에서는 큐 연결로 받음).
+기본 로그 위치: $LLM_TELEMETRY_LOG 또는 cache_root()/telemetry/llm_calls.jsonl,
+LLM_TELEMETRY=0 이면 파일에 쓰지 않는다.
+"""
+class LLMTelemetry(QObject):
+    recorded = pyqtSignal(dict)
+
+    WINDOW = 200
+    MAX_BYTES = 5 * 1024 * 1024
+    BACKUPS = 3
+    _EMPTY_TOTALS = {'calls': 0, 'errors': 0, 'cancelled': 0, 'cache_hits': 0, 'retries': 0}
+
+    def __init__(self, log_path: Optional[str] = None, max_bytes: int = MAX_BYTES, backups: int = BACKUPS, parent=None):
+        super().__init__(parent)
+        if log_path is None and os.getenv('LLM_TELEMETRY', '1') != '0':
+            log_path = os.getenv('LLM_TELEMETRY_LOG') or cache_root(os.path.join('telemetry', 'llm_calls.jsonl'))
+        self.log_path = log_path or None
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._recent: Dict[str, Deque[Dict]] = {}
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    def record(self, entry: Dict):
+        """호출 기록 하나 (키: ts, alias, provider, model, ok, error, cancelled, stream, cache_hit, prompt_tokens,
+        completion_tokens, tokens_estimated, request_bytes, ttft_ms, latency_ms, tokens_per_sec, retries, status)"""
+        alias = entry.get('alias', '')
+        with self._lock:
+            totals = self._totals.setdefault(alias, dict(self._EMPTY_TOTALS))
+            totals['calls'] += 1
+            if entry.get('cancelled'):
+                # 사용자 취소나 헤징에서 진 요청은 오류로 치지 않는다
+                totals['cancelled'] += 1
+            elif not entry.get('ok'):
+                totals['errors'] += 1
+            totals['cache_hits'] += 1 if entry.get('cache_hit') else 0
+            totals['retries'] += entry.get('retries') or 0
+            if entry.get('ok') and not entry.get('cache_hit'):
+                # 지연 분포는 실제로 모델에 다녀온 호출만
+                self._recent.setdefault(alias, deque(maxlen=self.WINDOW)).append(entry)
+            if self.log_path:
+                self._write(entry)
+        self.recorded.emit(entry)
+
+    def summary(self, alias: str) -> Dict:
+        """별칭의 누적 횟수와 최근 WINDOW 개 호출의 p50/p95 (기록이 없으면 None)."""
+        with self._lock:
+            recent = list(self._recent.get(alias, ()))
+            totals = dict(self._totals.get(alias, self._EMPTY_TOTALS))
+        latency = [e['latency_ms'] for e in recent]
+        ttft = [e['ttft_ms'] for e in recent if e.get('ttft_ms') is not None]
+        tps = [e['tokens_per_sec'] for e in recent if e.get('tokens_per_sec')]
+        return dict(
+            totals,
+            alias=alias,
+            window=len(recent),
+            latency_p50_ms=_percentile(latency, 0.5),
+            latency_p95_ms=_percentile(latency, 0.95),
+            ttft_p50_ms=_percentile(ttft, 0.5),
+            ttft_p95_ms=_percentile(ttft, 0.95),
+            tokens_per_sec_p50=_percentile(tps, 0.5),
+        )
+
+    def summaries(self) -> List[Dict]:
+        with self._lock:
+            aliases = list(self._totals)
+        return [self.summary(alias) for alias in aliases]
+
+    def _write(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n'
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+            if self.max_bytes and os.path.exists(self.log_path) and os.path.getsize(self.log_path) + len(line) > self.max_bytes:
+                self._rotate()
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            print(f"LLM 텔레메트리 기록 실패: {e}")
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.log_path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.log_path, f"{self.log_path}.1")
+        else:
+            os.remove(self.log_path)
@@ -1,11 +1,66 @@
 import os
 import json
-from typing import List, Dict, Optional, Tuple
+import time
+import random
+import threading
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 
-try:
-    import requests
-except ImportError:  # pragma: no cover
-    requests = None  # type: ignore
+from .response_cache import ResponseCache
+from .cache_paths import cache_root
+from . import llm_providers
+from .llm_providers import OpenAICompatibleProvider
+from .llm_telemetry import CallMetrics, LLMTelemetry
+
+# requests 는 import 에만 100ms 가까이 걸려 에디터 시작을 늦추므로 첫 요청 때 불러온다
+requests = None  # type: ignore
+
+
+def _import_requests():
+    global requests
+    if requests is None:
+        try:
+            import requests as module
+        except ImportError:  # pragma: no cover
+            return None
+        requests = module
+    return requests
+
+
+class CancelToken:
+    """
+    진행 중인 chat 요청을 취소하기 위한 토큰.
+    cancel() 은 다른 스레드에서 호출해도 안전하며, 연결된 HTTP 응답을 닫아 스트림 읽기를 즉시 중단시킨다.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._response = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+        with self._lock:
+            resp = self._response
+        if resp is not None:
+            try:
+                resp.close()
+            except Exception:
+                pass
+
+    def wait(self, seconds: float) -> bool:
+        """최대 seconds 동안 대기. 그 사이 취소되면 True."""
+        return self._event.wait(seconds)
+
+    def bind(self, response):
+        """현재 진행 중인 응답 객체를 연결 (None 이면 해제)."""
+        with self._lock:
+            self._response = response
+        if response is not None and self.cancelled:
+            response.close()
 
 
 class ModelManager:
@@ -14,19 +69,30 @@ class ModelManager:
 
     - 기본 프로바이더: Cerebras Cloud (OpenAI Chat Completions 호환)
     - 환경 변수: LLAMA_API_KEY (.env 에서 로드 시도)
-    - 모델 확장 가능: register_model / set_default_model
+    - 로컬 서버: LLM_LOCAL_URL / LLM_LOCAL_MODELS 로 OpenAI 호환 서버(benchmarks/mock_llm_server.py 등)를 등록
+    - 확장 가능: register_provider / register_model / set_default_model
+    - 스트리밍: chat(..., on_token=cb) 로 토큰 단위 수신 (SSE)
+    - 취소: chat(..., cancel_token=CancelToken()) 후 다른 스레드에서 cancel()
+    - 연결: 프로바이더별 keep-alive 세션 풀 재사용, 429/5xx 는 Retry-After (없으면 지수 백오프+지터) 만큼 기다려 재시도
+      (Retry-After 가 LLM_RETRY_AFTER_MAX 초를 넘으면 재시도하지 않음)
+    - 캐시: 결정적 요청(temperature <= cache_max_temperature)은 디스크 캐시에서 즉시 응답 (LLM_CACHE=0 으로 끔,
+      기준 온도는 LLM_CACHE_MAX_TEMPERATURE)
+    - 텔레메트리: 호출마다 토큰 수/요청 크기/TTFT/지연/재시도/캐시 적중을 telemetry 에 기록
     """
 
+    CANCELLED_MESSAGE = "요청이 취소되었습니다."
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
     def __init__(self):
         self._load_env_if_exists()
 
-        # provider -> { 'endpoint': str, 'headers_fn': callable }
-        self.providers: Dict[str, Dict] = {
-            'cerebras': {
-                'chat_completions_url': 'https://api.cerebras.ai/v1/chat/completions',
-                'headers_fn': self._cerebras_headers,
-            }
-        }
+        # provider -> requests.Session (커넥션 재사용)
+        self._sessions: Dict = {}
+        self._sessions_lock = threading.Lock()
+
+        # provider 이름 -> 프로바이더 (register_provider 로 추가)
+        self.providers: Dict[str, OpenAICompatibleProvider] = {}
+        self.register_provider(llm_providers.cerebras())
 
         # 등록된 모델들: alias -> { provider, model }
         self.models: Dict[str, Dict[str, str]] = {
@@ -36,7 +102,47 @@ class ModelManager:
 
         self.default_model_alias: str = 'gpt-oss-120b'
 
+        # $LLM_LOCAL_URL 의 로컬 OpenAI 호환 서버: $LLM_LOCAL_MODELS (쉼표 구분) 를 별칭으로 등록하고 기본 모델로
+        local = llm_providers.local_from_env()
+        if local is not None:
+            self.register_provider(local)
+            names = [m.strip() for m in os.getenv('LLM_LOCAL_MODELS', 'mock-model').split(',') if m.strip()]
+            for name in names:
+                self.register_model(name, local.name, name)
+            if names:
+                self.default_model_alias = names[0]
+        if os.getenv('LLM_DEFAULT_MODEL') in self.models:
+            self.default_model_alias = os.getenv('LLM_DEFAULT_MODEL')
+
+        # HTTP 설정: (connect, read) 타임아웃, 재시도/백오프
+        self.connect_timeout: float = float(os.getenv('LLM_CONNECT_TIMEOUT', '5'))
+        self.read_timeout: float = float(os.getenv('LLM_READ_TIMEOUT', '60'))
+        self.max_retries: int = int(os.getenv('LLM_MAX_RETRIES', '3'))
+        self.backoff_base: float = 0.5
+        self.backoff_max: float = 20.0
+        # 서버가 Retry-After 로 이보다 오래 기다리라고 하면 재시도하지 않고 그 응답(429 등)을 돌려준다
+        self.retry_after_max: float = float(os.getenv('LLM_RETRY_AFTER_MAX', '30'))
+        self.pool_maxsize: int = 8
+
+        # 호출별 측정 기록 (JSONL 로그 + 모델별 p50/p95)
+        self.telemetry = LLMTelemetry()
+
+        # 응답 캐시 (선택)
+        self.cache: Optional[ResponseCache] = None
+        # 이 온도 이하의 요청만 캐시 ($LLM_CACHE_MAX_TEMPERATURE, 에이전트 요청은 온도 0 으로 보냄)
+        self.cache_max_temperature: float = float(os.getenv('LLM_CACHE_MAX_TEMPERATURE', '0'))
+        if os.getenv('LLM_CACHE', '1') != '0':
+            self.enable_cache()
+
     # ---------- public APIs ----------
+    def register_provider(self, provider: OpenAICompatibleProvider):
+        """프로바이더 등록 (같은 이름이면 교체). 기존 keep-alive 세션은 닫는다."""
+        self.providers[provider.name] = provider
+        with self._sessions_lock:
+            session = self._sessions.pop(provider.name, None)
+        if session is not None:
+            session.close()
+
     def register_model(self, alias: str, provider: str, model_name: str):
         if provider not in self.providers:
             raise ValueError(f"Unknown provider: {provider}")
@@ -47,12 +153,48 @@ class ModelManager:
             raise ValueError(f"Unknown model alias: {alias}")
         self.default_model_alias = alias
 
-    def chat(self, messages: List[Dict[str, str]], model_alias: Optional[str] = None, temperature: float = 0.2, max_tokens: Optional[int] = None) -> Tuple[bool, str]:
+    def set_timeouts(self, connect: float, read: float):
+        self.connect_timeout = connect
+        self.read_timeout = read
+
+    def enable_cache(self, path: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024, ttl: float = 7 * 24 * 3600) -> bool:
+        """응답 캐시 활성화. 기본 위치: cache_root() ($EDITOR_CACHE_DIR 또는 ~/.cache/ai-code-editor)"""
+        if path is None:
+            path = cache_root('responses.sqlite3')
+        try:
+            self.cache = ResponseCache(path, max_bytes=max_bytes, ttl=ttl)
+            return True
+        except Exception as e:
+            print(f"응답 캐시 비활성화: {e}")
+            self.cache = None
+            return False
+
+    def disable_cache(self):
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def cache_stats(self) -> Dict[str, float]:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def close(self):
+        """열려 있는 세션(커넥션 풀) 정리."""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+        self.disable_cache()
+
+    def chat(self, messages: List[Dict[str, str]], model_alias: Optional[str] = None, temperature: float = 0.2, max_tokens: Optional[int] = None, on_token: Optional[Callable[[str], None]] = None, cancel_token: Optional[CancelToken] = None, use_cache: bool = True) -> Tuple[bool, str]:
         """
         Chat completion 호출.
-        returns: (success, text or error)
+        캐시가 켜져 있고 결정적 요청이면 캐시 적중 시 네트워크 없이 바로 반환한다 (on_token 은 전체 텍스트로 한 번 호출).
+        on_token 이 주어지면 stream=True 로 요청하고, 도착하는 토큰 조각마다 on_token(delta) 를 호출한다.
+        cancel_token 이 취소되면 진행 중인 요청을 닫고 (False, 취소 메시지) 를 반환한다.
+        returns: (success, 전체 text or error)
         """
-        if requests is None:
+        if _import_requests() is None:
             return False, "'requests' 라이브러리가 필요합니다. pip install requests 로 설치하세요."
 
         alias = model_alias or self.default_model_alias
@@ -63,50 +205,235 @@ class ModelManager:
         provider = model_info['provider']
         model_name = model_info['model']
 
-        if provider == 'cerebras':
-            return self._chat_cerebras(messages, model_name, temperature, max_tokens)
-        else:
+        metrics = CallMetrics()
+        cache_key = None
+        if use_cache and self.cache is not None and temperature <= self.cache_max_temperature:
+            cache_key = ResponseCache.make_key(provider, model_name, messages, temperature, max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if on_token is not None:
+                    on_token(cached)
+                self._record(metrics, alias, provider, model_name, on_token is not None, True, cached, cache_hit=True)
+                return True, cached
+
+        handler = self.providers.get(provider)
+        if handler is None:
             return False, f"지원되지 않는 프로바이더: {provider}"
+        ok, text = handler.chat(self, messages, model_name, temperature, max_tokens, on_token, cancel_token, metrics)
+        self._record(metrics, alias, provider, model_name, on_token is not None, ok, text)
 
-    # ---------- providers ----------
-    def _chat_cerebras(self, messages: List[Dict[str, str]], model: str, temperature: float, max_tokens: Optional[int]) -> Tuple[bool, str]:
-        api_key = os.getenv('LLAMA_API_KEY')
-        if not api_key:
-            return False, "LLAMA_API_KEY 가 설정되지 않았습니다. 프로젝트 루트의 .env 에 설정해주세요."
-
-        url = self.providers['cerebras']['chat_completions_url']
-        headers = self.providers['cerebras']['headers_fn'](api_key)
-        payload: Dict = {
-            'model': model,
-            'messages': messages,
-            'temperature': temperature,
-        }
-        if max_tokens is not None:
-            payload['max_tokens'] = max_tokens
+        if ok and cache_key is not None:
+            try:
+                self.cache.put(cache_key, text)
+            except Exception as e:
+                print(f"응답 캐시 저장 실패: {e}")
+        return ok, text
 
+    # ---------- telemetry ----------
+    def _record(self, metrics: CallMetrics, alias: str, provider: str, model: str, stream: bool, ok: bool, text: str, cache_hit: bool = False):
+        """호출 하나를 telemetry 에 기록. usage 가 없으면 토큰 수는 스트림 조각 수 / 글자 수로 추정한다."""
+        now = time.perf_counter()
+        latency = (now - metrics.started) * 1000
+        ttft = (metrics.first_token_at - metrics.started) * 1000 if metrics.first_token_at is not None else None
+        completion = metrics.completion_tokens
+        estimated = completion is None and ok and not cache_hit
+        if estimated:
+            completion = metrics.chunks or max(1, len(text) // 4)
+        prompt = metrics.prompt_tokens
+        if prompt is None and metrics.request_bytes:
+            prompt = metrics.request_bytes // 4
+        # 생성 속도: 스트림이면 첫 토큰 이후 구간, 아니면 전체 지연 기준
+        generation = (now - (metrics.first_token_at or metrics.started))
+        tokens_per_sec = completion / generation if ok and not cache_hit and completion and generation > 0 else None
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=60)
-            if resp.status_code != 200:
-                return False, f"Cerebras API 오류: {resp.status_code} {resp.text}"
-            data = resp.json()
-            # OpenAI 호환: choices[0].message.content
-            content = data.get('choices', [{}])[0].get('message', {}).get('content')
-            if not content:
-                # 일부 구현은 'text'를 사용
-                content = data.get('choices', [{}])[0].get('text')
-            if not content:
-                return False, f"응답 파싱 실패: {json.dumps(data)[:500]}"
-            return True, content
+            self.telemetry.record({
+                'ts': round(time.time(), 3),
+                'alias': alias,
+                'provider': provider,
+                'model': model,
+                'ok': ok,
+                'error': None if ok else text[:200],
+                'cancelled': not ok and text == self.CANCELLED_MESSAGE,
+                'stream': stream,
+                'cache_hit': cache_hit,
+                'prompt_tokens': prompt,
+                'completion_tokens': completion,
+                'tokens_estimated': estimated,
+                'request_bytes': metrics.request_bytes,
+                'ttft_ms': round(ttft, 1) if ttft is not None else None,
+                'latency_ms': round(latency, 1),
+                'tokens_per_sec': round(tokens_per_sec, 1) if tokens_per_sec else None,
+                'retries': metrics.retries,
+                'status': metrics.status,
+            })
         except Exception as e:
-            return False, f"요청 실패: {str(e)}"
+            print(f"LLM 텔레메트리 오류: {e}")
+
+    # ---------- responses ----------
+    def _read_response(self, resp, payload: Dict, on_token: Optional[Callable[[str], None]], cancel_token: Optional[CancelToken] = None, label: str = 'LLM', metrics: Optional[CallMetrics] = None) -> Tuple[bool, str]:
+        """
+        응답 본문 처리. stream 요청이면 SSE 토큰 조각을 on_token 으로 넘기고 누적된 전체 텍스트를 반환.
+        응답 객체는 cancel_token 에 연결되어 취소 시 즉시 닫힌다.
+        """
+        with resp:
+            if cancel_token is not None:
+                cancel_token.bind(resp)
+            try:
+                if metrics is not None:
+                    metrics.status = resp.status_code
+                if resp.status_code != 200:
+                    return False, f"{label} API 오류: {resp.status_code} {resp.text}"
+                if not payload.get('stream'):
+                    data = resp.json()
+                    if metrics is not None:
+                        metrics.usage(data.get('usage'))
+                    return self._parse_completion(data)
+                parts: List[str] = []
+                # 바이트 그대로 줄을 나누고 줄마다 UTF-8 로 디코딩한다. charset 없는 text/event-stream 은 requests 가
+                # ISO-8859-1 로 풀어서, 한글 UTF-8 안의 0x85 바이트가 NEL 줄바꿈으로 취급되어 이벤트가 잘린다
+                for data in self._iter_sse(resp.iter_lines()):
+                    if cancel_token is not None and cancel_token.cancelled:
+                        return False, self.CANCELLED_MESSAGE
+                    if metrics is not None and data.get('usage'):
+                        # 마지막 조각(또는 choices 가 빈 별도 조각)에 오는 usage
+                        metrics.usage(data['usage'])
+                    choice = (data.get('choices') or [{}])[0]
+                    delta = choice.get('delta', {}).get('content') or choice.get('text')
+                    if delta:
+                        if metrics is not None:
+                            metrics.token()
+                        parts.append(delta)
+                        on_token(delta)
+                if cancel_token is not None and cancel_token.cancelled:
+                    return False, self.CANCELLED_MESSAGE
+                content = ''.join(parts)
+                if not content:
+                    return False, "응답 파싱 실패: 스트림에서 내용을 받지 못했습니다."
+                return True, content
+            finally:
+                if cancel_token is not None:
+                    cancel_token.bind(None)
+
+    # ---------- http ----------
+    def _get_session(self, provider: str):
+        """프로바이더별 keep-alive 세션. 최초 사용 시 생성하고 이후 재사용."""
+        with self._sessions_lock:
+            session = self._sessions.get(provider)
+            if session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[provider] = session
+            return session
+
+    def _post_with_retry(self, provider: str, url: str, headers: Dict[str, str], payload: Dict, cancel_token: Optional[CancelToken] = None, metrics: Optional[CallMetrics] = None):
+        """
+        세션으로 POST. 연결 오류와 429/5xx 는 max_retries 까지 재시도한다.
+        Retry-After 가 있으면 그만큼 기다리고, retry_after_max 를 넘으면 재시도하지 않는다.
+        본문은 stream=True 로 지연 읽기하므로 재시도 판단은 상태 코드만으로 이루어진다.
+        returns: 최종 응답 (취소되면 None)
+        """
+        session = self._get_session(provider)
+        timeout = (self.connect_timeout, self.read_timeout)
+        # 본문은 한 번만 직렬화 (재시도에 재사용, 크기는 텔레메트리용)
+        body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode('utf-8')
+        headers = dict(headers)
+        headers.setdefault('Content-Type', 'application/json')
+        if metrics is not None:
+            metrics.request_bytes = len(body)
+        attempt = 0
+        while True:
+            if attempt and metrics is not None:
+                metrics.retries = attempt
+            try:
+                resp = session.post(url, headers=headers, data=body, timeout=timeout, stream=True)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries or (cancel_token is not None and cancel_token.cancelled):
+                    raise
+                delay = self._backoff_delay(attempt)
+            else:
+                if resp.status_code not in self.RETRY_STATUS or attempt >= self.max_retries:
+                    return resp
+                delay = self._retry_after(resp.headers.get('Retry-After'))
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                elif delay > self.retry_after_max:
+                    # 서버가 정한 시간보다 일찍 보내면 남은 재시도도 429 로 끝나므로 바로 포기한다
+                    return resp
+                # 본문을 비워야 커넥션이 풀로 반환되어 재사용된다
+                _ = resp.content
+                resp.close()
+
+            attempt += 1
+            if cancel_token is not None:
+                if cancel_token.wait(delay):
+                    return None
+            else:
+                time.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # full jitter: [0, min(max, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Retry-After 헤더(초 또는 HTTP-date)를 대기 시간(초)으로 변환. 서버 값을 줄이지 않는다."""
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            from email.utils import parsedate_to_datetime
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return max(0.0, seconds)
 
     # ---------- helpers ----------
     @staticmethod
-    def _cerebras_headers(api_key: str) -> Dict[str, str]:
-        return {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {api_key}',
-        }
+    def _parse_completion(data: Dict) -> Tuple[bool, str]:
+        # OpenAI 호환: choices[0].message.content
+        content = data.get('choices', [{}])[0].get('message', {}).get('content')
+        if not content:
+            # 일부 구현은 'text'를 사용
+            content = data.get('choices', [{}])[0].get('text')
+        if not content:
+            return False, f"응답 파싱 실패: {json.dumps(data)[:500]}"
+        return True, content
+
+    @staticmethod
+    def _iter_sse(lines) -> Iterator[Dict]:
+        """Server-Sent Events 라인 스트림에서 'data:' JSON 이벤트를 순서대로 꺼낸다."""
+        buf: List[str] = []
+        for line in lines:
+            if line is None:
+                continue
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', errors='ignore')
+            if line == '':
+                # 빈 줄 = 이벤트 경계
+                if buf:
+                    data = '\n'.join(buf)
+                    buf = []
+                    if data.strip() == '[DONE]':
+                        return
+                    try:
+                        yield json.loads(data)
+                    except ValueError:
+                        continue
+                continue
+            if line.startswith(':'):
+                continue  # comment / keep-alive
+            if line.startswith('data:'):
+                buf.append(line[5:].lstrip(' '))
+        if buf:
+            data = '\n'.join(buf)
+            if data.strip() != '[DONE]':
+                try:
+                    yield json.loads(data)
+                except ValueError:
+                    pass
 
     def _load_env_if_exists(self):
         """프로젝트 루트의 .env 파일을 간단히 로드 (python-dotenv 없이)."""
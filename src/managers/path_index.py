@@ -0,0 +1,457 @@
+import os
+import re
+import sys
+import heapq
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .ignore_rules import IgnoreRules
+
+_NONZERO = re.compile(b'[^\x00]')
+# 단어 첫 글자: 맨 앞, 구분자 뒤, camelCase 의 대문자 (file_manager.py -> fmp)
+_WORD_START = re.compile(r'(?:^|(?<=[^a-zA-Z0-9]))[a-zA-Z0-9]|(?<=[a-z])[A-Z]')
+# 바이트 값 -> 켜진 비트 위치
+_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+"""
+빠른 열기(Ctrl+P)용 파일 경로 인덱스.
+
+- 경로는 폴더 문자열(중복 없이 한 번만 저장)의 id 와 intern 한 파일 이름으로 나눠 배열에 담는다
+- 소문자 상대 경로/파일 이름/단어 첫 글자를 길이 순으로 정렬해 '\n' 으로 이어 붙인 문자열과,
+  글자마다 그 글자를 가진 파일 id 비트셋(큰 정수)을 미리 만들어 둔다
+- 검색은 파일 이름 안의 연속 일치와 단어 첫 글자 일치를 정규식으로(C 에서 실행) 찾고, 나머지는
+  비트셋 AND 로 q 의 글자를 모두 가진 파일만 골라 부분열인지 확인한다. 짧은 경로가 앞에 있으므로
+  MAX_CANDIDATES 개가 모이면 멈춰도 좋은 후보가 빠지지 않고, 글자를 이어 칠 때는 직전 결과에서 좁힌다
+- 후보만 파이썬에서 점수를 매겨 상위 결과를 고른다 (20만 경로에서 입력 한 글자당 수 ms)
+- 빌드 이후 추가된 파일은 별도 목록에서 선형으로 검사하고, 삭제는 표시만 해 둔다.
+  쌓인 변경이 MAX_PENDING 을 넘으면 백그라운드에서 다시 정렬해 합친다
+"""
+class PathIndex(QObject):
+    build_finished = pyqtSignal(int)  # 색인된 파일 수
+
+    MAX_CANDIDATES = 300
+    MAX_PENDING = 2000
+    # 폴더 변경 반영 시 이보다 많이 바뀌면 전체를 다시 만든다
+    MAX_INCREMENTAL = 5000
+
+    def __init__(self):
+        super().__init__()
+        self.root: str = ""
+        self._rules: Optional[IgnoreRules] = None
+        self._build_args: Tuple[Optional[List[str]], bool] = (None, True)
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self._reset()
+
+    def _reset(self):
+        self._dirs: List[str] = [""]              # 폴더 id -> 상대 경로
+        self._dir_ids: Dict[str, int] = {"": 0}
+        self._file_dir = array('I')               # 파일 id -> 폴더 id
+        self._file_name: List[str] = []           # 파일 id -> 이름
+        self._ids: Dict[Tuple[int, str], int] = {}
+        self._dir_files: Dict[int, Set[str]] = {}  # 폴더 id -> 바로 아래 파일 이름 (변경 반영용)
+        self._path_blob = ""                      # 소문자 상대 경로 (id 순, '\n' 구분)
+        self._name_blob = ""
+        self._path_offsets = array('I')           # 각 줄의 시작 위치
+        self._name_offsets = array('I')
+        self._initials_blob = ""                  # 파일 이름의 단어 첫 글자들
+        self._initials_offsets = array('I')
+        self._char_bits: Dict[str, int] = {}      # 글자 -> 그 글자가 들어 있는 파일 id 비트셋
+        self._compacted = 0                       # blob 에 들어간 파일 수 (이후 id 는 추가분)
+        self._removed: Set[int] = set()
+        # 직전 검색의 부분열 일치 (query, 일치 id, 여기까지 훑음) - 글자를 덧붙여 입력할 때 이어서 좁힌다
+        self._last_scan: Tuple[str, List[int], int] = ("", [], 0)
+
+    # ---------- public ----------
+    @property
+    def building(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.root) and not self.building
+
+    def __len__(self) -> int:
+        return len(self._file_name) - len(self._removed)
+
+    def build(self, root: str, patterns: Optional[List[str]] = None, use_gitignore: bool = True):
+        """root 아래 파일 경로 수집을 백그라운드에서 시작 (진행 중인 작업은 중단)."""
+        self.cancel()
+        root = os.path.abspath(root)
+        self._rules = IgnoreRules(root, patterns, use_gitignore)
+        self._build_args = (patterns, use_gitignore)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._build, args=(root, self._rules, self._cancel), daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._cancel.set()
+            self._thread.join(2)
+        self._thread = None
+
+    def clear(self):
+        self.cancel()
+        with self._lock:
+            self.root = ""
+            self._reset()
+
+    def search(self, query: str, limit: int = 50) -> List[str]:
+        """query 글자가 순서대로 들어 있는 경로 중 점수 상위 limit 개 (상대 경로)."""
+        q = ''.join(query.lower().split()).replace('/', os.sep)
+        if not q:
+            return []
+        with self._lock:
+            candidates = self._candidates(q)
+            scored = []
+            for file_id in candidates:
+                rel = self._rel_of(file_id)
+                score = self._score(q, rel, len(self._dirs[self._file_dir[file_id]]))
+                if score is not None:
+                    scored.append((score, -file_id, rel))
+        return [rel for _, _, rel in heapq.nlargest(limit, scored)]
+
+    def add_path(self, path: str):
+        """파일 하나 추가 (앱에서 새로 만든 파일 등)."""
+        rel = self._rel(path)
+        if rel is None or (self._rules is not None and self._rules.is_ignored(path, False)):
+            return
+        with self._lock:
+            self._add(*self._split(rel))
+        self._maybe_compact()
+
+    def remove_path(self, path: str):
+        """파일 또는 폴더(하위 전체) 제거."""
+        rel = self._rel(path)
+        if rel is None:
+            return
+        with self._lock:
+            rel_dir, name = self._split(rel)
+            if not self._remove(self._dir_ids.get(rel_dir), name):
+                self._remove_dir(rel)
+        self._maybe_compact()
+
+    def refresh_directories(self, paths: List[str]):
+        """내용이 바뀐 폴더들을 다시 읽어 바로 아래 파일/폴더의 추가·삭제를 반영 (백그라운드)."""
+        if not self.root:
+            return
+        threading.Thread(target=self._refresh, args=(list(paths), self._rules), daemon=True).start()
+
+    # ---------- build ----------
+    def _build(self, root: str, rules: IgnoreRules, cancel: threading.Event):
+        entries = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            if cancel.is_set():
+                return
+            dirnames[:] = [d for d in dirnames if not rules.is_ignored(os.path.join(dirpath, d), True)]
+            rel_dir = os.path.relpath(dirpath, root)
+            if rel_dir == '.':
+                rel_dir = ""
+            for name in filenames:
+                if not rules.is_ignored(os.path.join(dirpath, name), False):
+                    entries.append((rel_dir, name))
+        if cancel.is_set():
+            return
+        state = self._compose(entries)
+        with self._lock:
+            if cancel.is_set():
+                return
+            self.root = root
+            self._apply(state)
+        self.build_finished.emit(len(entries))
+
+    def _compose(self, entries: Iterable[Tuple[str, str]]):
+        """(폴더, 이름) 목록으로 배열과 검색용 문자열을 만든다 (잠금 밖에서 실행)."""
+        entries = sorted(entries, key=lambda e: (len(e[0]) + len(e[1]), e[0], e[1]))
+        dirs: List[str] = [""]
+        dir_ids: Dict[str, int] = {"": 0}
+        file_dir = array('I')
+        file_name: List[str] = []
+        ids: Dict[Tuple[int, str], int] = {}
+        dir_files: Dict[int, Set[str]] = {}
+        paths: List[str] = []
+        names: List[str] = []
+        initials: List[str] = []
+        nbytes = len(entries) // 8 + 1
+        char_bytes: Dict[str, bytearray] = {}
+        for rel_dir, name in entries:
+            dir_id = dir_ids.get(rel_dir)
+            if dir_id is None:
+                dir_id = dir_ids[rel_dir] = len(dirs)
+                dirs.append(rel_dir)
+            name = sys.intern(name)
+            ids[(dir_id, name)] = len(file_name)
+            dir_files.setdefault(dir_id, set()).add(name)
+            file_dir.append(dir_id)
+            file_name.append(name)
+            lower = os.path.join(rel_dir, name).lower()
+            paths.append(lower)
+            names.append(name.lower())
+            initials.append(''.join(_WORD_START.findall(name)).lower())
+            file_id = len(file_name) - 1
+            byte, bit = file_id >> 3, 1 << (file_id & 7)
+            for ch in set(lower):
+                bits = char_bytes.get(ch)
+                if bits is None:
+                    bits = char_bytes[ch] = bytearray(nbytes)
+                bits[byte] |= bit
+        char_bits = {ch: int.from_bytes(bits, 'little') for ch, bits in char_bytes.items()}
+        return (dirs, dir_ids, file_dir, file_name, ids, dir_files,
+                '\n'.join(paths), '\n'.join(names), '\n'.join(initials),
+                self._offsets(paths), self._offsets(names), self._offsets(initials), char_bits)
+
+    def _apply(self, state):
+        (self._dirs, self._dir_ids, self._file_dir, self._file_name, self._ids, self._dir_files,
+         self._path_blob, self._name_blob, self._initials_blob,
+         self._path_offsets, self._name_offsets, self._initials_offsets, self._char_bits) = state
+        self._compacted = len(self._file_name)
+        self._removed = set()
+        self._last_scan = ("", [], 0)
+
+    def _maybe_compact(self):
+        with self._lock:
+            pending = len(self._file_name) - self._compacted + len(self._removed)
+        if pending > self.MAX_PENDING and self.ready:
+            self._thread = threading.Thread(target=self._compact, daemon=True)
+            self._thread.start()
+
+    def _compact(self):
+        with self._lock:
+            generation = len(self._file_name), len(self._removed)
+            entries = [(self._dirs[self._file_dir[i]], self._file_name[i])
+                       for i in range(len(self._file_name)) if i not in self._removed]
+        state = self._compose(entries)
+        with self._lock:
+            # 그 사이 바뀌었으면 다음 기회에 다시
+            if (len(self._file_name), len(self._removed)) == generation:
+                self._apply(state)
+
+    def _refresh(self, paths: List[str], rules: Optional[IgnoreRules]):
+        changes = 0
+        for path in paths:
+            rel_dir = self._rel(path)
+            if rel_dir is None or rules is None:
+                continue
+            rel_dir = "" if rel_dir == '.' else rel_dir
+            try:
+                with os.scandir(path) as it:
+                    listing = [(e.name, e.is_dir()) for e in it]
+            except OSError:
+                with self._lock:
+                    changes += self._remove_dir(rel_dir)
+                continue
+            files = {name for name, is_dir in listing if not is_dir and not rules.is_ignored(os.path.join(path, name), False)}
+            subdirs = {name for name, is_dir in listing if is_dir and not rules.is_ignored(os.path.join(path, name), True)}
+            new_dirs = []
+            with self._lock:
+                dir_id = self._dir_ids.get(rel_dir)
+                known_files = set(self._dir_files.get(dir_id, ()))
+                prefix = rel_dir + os.sep if rel_dir else ""
+                known_dirs = {d[len(prefix):].split(os.sep, 1)[0] for d in self._dirs
+                              if d.startswith(prefix) and d != rel_dir and self._dir_files.get(self._dir_ids[d])}
+                for name in files - known_files:
+                    self._add(rel_dir, name)
+                    changes += 1
+                for name in known_files - files:
+                    self._remove(dir_id, name)
+                    changes += 1
+                for name in known_dirs - subdirs:
+                    changes += self._remove_dir(os.path.join(rel_dir, name))
+                new_dirs = [name for name in subdirs - known_dirs]
+            for name in new_dirs:
+                # 새로 생긴 폴더 (git checkout 등) 는 통째로 훑는다
+                for dirpath, dirnames, filenames in os.walk(os.path.join(path, name)):
+                    dirnames[:] = [d for d in dirnames if not rules.is_ignored(os.path.join(dirpath, d), True)]
+                    sub_rel = os.path.relpath(dirpath, self.root)
+                    with self._lock:
+                        for filename in filenames:
+                            if not rules.is_ignored(os.path.join(dirpath, filename), False):
+                                self._add(sub_rel, filename)
+                                changes += 1
+                    if changes > self.MAX_INCREMENTAL:
+                        break
+            if changes > self.MAX_INCREMENTAL:
+                break
+        if changes > self.MAX_INCREMENTAL:
+            self.build(self.root, *self._build_args)
+        elif changes:
+            self._maybe_compact()
+
+    def _add(self, rel_dir: str, name: str):
+        dir_id = self._dir_ids.get(rel_dir)
+        if dir_id is None:
+            dir_id = self._dir_ids[rel_dir] = len(self._dirs)
+            self._dirs.append(rel_dir)
+        name = sys.intern(name)
+        if (dir_id, name) in self._ids:
+            return
+        self._ids[(dir_id, name)] = len(self._file_name)
+        self._dir_files.setdefault(dir_id, set()).add(name)
+        self._file_dir.append(dir_id)
+        self._file_name.append(name)
+
+    def _remove(self, dir_id: Optional[int], name: str) -> bool:
+        file_id = self._ids.pop((dir_id, name), None)
+        if file_id is None:
+            return False
+        self._removed.add(file_id)
+        self._dir_files[dir_id].discard(name)
+        return True
+
+    def _remove_dir(self, rel_dir: str) -> int:
+        prefix = rel_dir + os.sep
+        count = 0
+        for dir_id, d in enumerate(self._dirs):
+            if d == rel_dir or d.startswith(prefix):
+                for name in list(self._dir_files.get(dir_id, ())):
+                    count += self._remove(dir_id, name)
+        return count
+
+    # ---------- search ----------
+    def _candidates(self, q: str) -> List[int]:
+        seen: Dict[int, None] = {}
+        limit = self.MAX_CANDIDATES
+        removed = self._removed
+        # 1) 파일 이름에 그대로 들어 있는 것, 2) 파일 이름의 단어 첫 글자에 들어 있는 것 (fm -> file_manager)
+        if os.sep not in q:
+            for blob, offsets in ((self._name_blob, self._name_offsets), (self._initials_blob, self._initials_offsets)):
+                for m in re.finditer(re.escape(q), blob):
+                    file_id = bisect_right(offsets, m.start()) - 1
+                    if file_id not in removed:
+                        seen[file_id] = None
+                        if len(seen) >= limit:
+                            break
+        # 3) 전체 경로에 글자가 순서대로 들어 있는 것
+        pattern = self._subsequence_pattern(q)
+        if len(seen) < limit:
+            for file_id in self._scan(q, pattern, limit - len(seen)):
+                seen[file_id] = None
+        # 4) 빌드 이후 추가된 파일
+        for file_id in range(self._compacted, len(self._file_name)):
+            if file_id not in removed and pattern.match(self._rel_of(file_id).lower()):
+                seen[file_id] = None
+        return list(seen)
+
+    def _scan(self, q: str, pattern: re.Pattern, limit: int) -> List[int]:
+        """
+        blob 에 들어간 파일 중 q 가 부분열인 것을 짧은 경로부터 limit 개.
+        글자별 비트셋을 AND 해 q 의 글자를 모두 가진 파일만 정규식으로 확인하고,
+        q 가 직전 검색어를 이어 쓴 것이면 직전 일치 안에서만 다시 확인한 뒤 멈췄던 곳부터 계속 훑는다.
+        """
+        total = self._compacted
+        if not total:
+            return []
+        offsets = self._path_offsets  # 끝에 len(blob) + 1 이 붙어 있어 offsets[i + 1] - 1 이 줄 끝
+        blob = self._path_blob
+        removed = self._removed
+        match = pattern.match
+
+        prev_query, prev_ids, start = self._last_scan
+        found: List[int] = []
+        if prev_query and q.startswith(prev_query):
+            found = [i for i in prev_ids if match(blob, offsets[i], offsets[i + 1] - 1) and i not in removed]
+        else:
+            start = 0
+        if len(found) < limit and start < total:
+            mask = -1 << start
+            for ch in set(q):
+                mask &= self._char_bits.get(ch, 0)
+                if not mask:
+                    break
+            data = mask.to_bytes(total // 8 + 1, 'little') if mask else b''
+            start, first_byte = total, start >> 3
+            for m in _NONZERO.finditer(data, first_byte):
+                base = m.start() << 3
+                for bit in _BITS[data[m.start()]]:
+                    i = base + bit
+                    if match(blob, offsets[i], offsets[i + 1] - 1) and i not in removed:
+                        found.append(i)
+                if len(found) >= limit:
+                    # 이 바이트까지는 모두 확인했으므로 다음 입력은 그 뒤부터 훑으면 된다
+                    start = base + 8
+                    break
+        self._last_scan = (q, found, start)
+        return found[:limit]
+
+    @staticmethod
+    def _score(q: str, rel: str, dir_len: int) -> Optional[float]:
+        """
+        높을수록 좋은 점수. 파일 이름 안의 연속 일치 > 파일 이름 안의 부분열 > 경로 전체의 부분열 순이고,
+        단어 경계/연속 글자에 가산점, 사이 간격과 긴 경로에 감점.
+        """
+        lower = rel.lower()
+        name_start = dir_len + 1 if dir_len else 0
+        name = lower[name_start:]
+        i = name.find(q)
+        if i >= 0:
+            score = 200.0
+            if i == 0:
+                score += 40
+                if len(q) == len(name) or name[len(q)] == '.':
+                    score += 60  # 확장자만 빼고 정확히 일치
+            elif not name[i - 1].isalnum():
+                score += 20
+            return score - len(name) - len(rel) * 0.1
+
+        for start, bonus in ((name_start, 80.0), (0, 0.0)):
+            score = bonus
+            pos = start
+            prev = -2
+            for ch in q:
+                j = lower.find(ch, pos)
+                if j < 0:
+                    score = None
+                    break
+                if j == prev + 1:
+                    score += 8
+                elif j == 0 or not lower[j - 1].isalnum() or (rel[j].isupper() and rel[j - 1].islower()):
+                    score += 6
+                else:
+                    score -= min(j - pos, 10) * 0.5
+                if j >= name_start:
+                    score += 2
+                prev = j
+                pos = j + 1
+            if score is not None:
+                return score - len(rel) * 0.1
+        return None
+
+    # ---------- helpers ----------
+    def _rel_of(self, file_id: int) -> str:
+        rel_dir = self._dirs[self._file_dir[file_id]]
+        name = self._file_name[file_id]
+        return rel_dir + os.sep + name if rel_dir else name
+
+    def _rel(self, path: Optional[str]) -> Optional[str]:
+        if not path or not self.root:
+            return None
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        return None if rel.startswith('..') else rel
+
+    @staticmethod
+    def _split(rel: str) -> Tuple[str, str]:
+        rel_dir, name = os.path.split(rel)
+        return rel_dir, name
+
+    @staticmethod
+    def _subsequence_pattern(q: str) -> re.Pattern:
+        # [^a]*a[^b]*b... : 다음 글자가 처음 나오는 곳까지만 건너뛰므로 되추적 없이 줄 길이에 비례
+        parts = []
+        for ch in q:
+            parts.append('[^\n' + re.escape(ch) + ']*' + re.escape(ch))
+        return re.compile(''.join(parts))
+
+    @staticmethod
+    def _offsets(lines: List[str]) -> array:
+        offsets = array('I')
+        pos = 0
+        for line in lines:
+            offsets.append(pos)
+            pos += len(line) + 1
+        offsets.append(pos)
+        return offsets
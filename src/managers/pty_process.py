@@ -0,0 +1,210 @@
+import os
+import sys
+import signal
+import struct
+import subprocess
+from typing import List, Optional
+from PyQt5.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+
+# POSIX 전용 모듈: Windows 에서는 없으므로 available() 가 False 가 되고 TerminalManager 는 QProcess 를 쓴다
+try:
+    import fcntl
+    import termios
+except ImportError:  # pragma: no cover
+    fcntl = termios = None
+
+
+def available() -> bool:
+    """이 플랫폼에서 PtyProcess 를 쓸 수 있는지 (현재는 Linux 만)."""
+    return sys.platform.startswith('linux') and hasattr(os, 'openpty') and fcntl is not None
+
+
+def default_shell() -> str:
+    return '/bin/zsh' if os.path.exists('/bin/zsh') else '/bin/bash'
+
+
+def _make_controlling_tty():
+    # start_new_session 으로 setsid 된 뒤 자식에서 실행: stdin(PTY slave)을 제어 터미널로
+    fcntl.ioctl(0, termios.TIOCSCTTY, 0)
+
+
+"""
+PTY 위에서 셸을 실행하는 프로세스 (Linux).
+
+os.openpty 로 만든 slave 를 자식의 표준 입출력/제어 터미널로 주고, master 는 논블로킹으로 두어
+QSocketNotifier 가 읽을 수 있다고 알릴 때만 읽는다. 쓰기도 논블로킹이라 다 못 쓴 부분은
+쓸 수 있게 될 때 이어서 쓴다. 창 크기는 TIOCSWINSZ 로 알리고(커널이 SIGWINCH 를 보냄),
+Ctrl+C 는 PTY 의 포그라운드 프로세스 그룹에 SIGINT 로 보낸다.
+"""
+class PtyProcess(QObject):
+    data_received = pyqtSignal(bytes)
+    finished = pyqtSignal(int)  # 종료 코드 (시그널로 끝났으면 -시그널 번호)
+
+    READ_BYTES = 65536
+    # 알림 한 번에 읽는 최대량 (출력이 쏟아져도 이벤트 루프가 다른 일을 할 수 있도록)
+    MAX_READ_PER_EVENT = 1 << 20
+    REAP_INTERVAL_MS = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pid: Optional[int] = None
+        self.fd: Optional[int] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._read_notifier: Optional[QSocketNotifier] = None
+        self._write_notifier: Optional[QSocketNotifier] = None
+        self._write_buffer = bytearray()
+
+    @property
+    def is_running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self, program: str, args: List[str], cwd: str, env: Optional[dict] = None,
+              rows: int = 24, cols: int = 80) -> bool:
+        master, slave = os.openpty()
+        try:
+            self._set_size(slave, rows, cols)
+            child_env = dict(os.environ if env is None else env)
+            child_env.setdefault('TERM', 'xterm-256color')
+            proc = subprocess.Popen(
+                [program] + list(args), cwd=cwd, env=child_env,
+                stdin=slave, stdout=slave, stderr=slave,
+                start_new_session=True, preexec_fn=_make_controlling_tty, close_fds=True)
+        except OSError:
+            os.close(master)
+            return False
+        finally:
+            os.close(slave)
+        self._proc = proc
+        self.pid = proc.pid
+        self.fd = master
+        os.set_blocking(master, False)
+        self._read_notifier = QSocketNotifier(master, QSocketNotifier.Read, self)
+        self._read_notifier.activated.connect(self._on_readable)
+        self._write_notifier = QSocketNotifier(master, QSocketNotifier.Write, self)
+        self._write_notifier.setEnabled(False)
+        self._write_notifier.activated.connect(self._on_writable)
+        return True
+
+    def write(self, data: bytes):
+        if self.fd is None or not data:
+            return
+        if self._write_buffer:
+            self._write_buffer += data
+            return
+        try:
+            written = os.write(self.fd, data)
+        except BlockingIOError:
+            written = 0
+        except OSError:
+            return
+        if written < len(data):
+            self._write_buffer += data[written:]
+            self._write_notifier.setEnabled(True)
+
+    def resize(self, rows: int, cols: int):
+        if self.fd is not None and rows > 0 and cols > 0:
+            try:
+                self._set_size(self.fd, rows, cols)
+            except OSError:
+                pass
+
+    def interrupt(self):
+        """Ctrl+C: 포그라운드 프로세스 그룹(실행 중인 명령, 없으면 셸)에 SIGINT."""
+        self.send_signal(signal.SIGINT)
+
+    def send_signal(self, sig: int):
+        if self.fd is None or not self.is_running:
+            return
+        try:
+            pgrp = os.tcgetpgrp(self.fd)
+        except OSError:
+            pgrp = self.pid
+        try:
+            os.killpg(pgrp, sig)
+        except OSError:
+            pass
+
+    def terminate(self, timeout_ms: int = 1000):
+        """터미널을 닫듯이 세션에 SIGHUP, 끝나지 않으면 SIGKILL 후 정리."""
+        if self._proc is None:
+            return
+        for sig in (signal.SIGHUP, signal.SIGKILL):
+            if self._proc.poll() is not None:
+                break
+            try:
+                os.killpg(self.pid, sig)
+            except OSError:
+                pass
+            try:
+                self._proc.wait(timeout_ms / 1000)
+            except subprocess.TimeoutExpired:
+                pass
+        self._close()
+
+    # ---- 내부 ----
+
+    @staticmethod
+    def _set_size(fd: int, rows: int, cols: int):
+        fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack('HHHH', rows, cols, 0, 0))
+
+    def _on_readable(self):
+        chunks = []
+        total = 0
+        eof = False
+        while total < self.MAX_READ_PER_EVENT:
+            try:
+                data = os.read(self.fd, self.READ_BYTES)
+            except BlockingIOError:
+                break
+            except OSError:
+                # 모든 slave 가 닫히면 master 읽기는 EIO
+                eof = True
+                break
+            if not data:
+                eof = True
+                break
+            chunks.append(data)
+            total += len(data)
+        if chunks:
+            self.data_received.emit(b''.join(chunks))
+        if eof and self._read_notifier is not None:
+            self._read_notifier.setEnabled(False)
+            self._reap()
+
+    def _on_writable(self):
+        try:
+            written = os.write(self.fd, self._write_buffer)
+        except BlockingIOError:
+            return
+        except OSError:
+            written = len(self._write_buffer)
+        del self._write_buffer[:written]
+        if not self._write_buffer:
+            self._write_notifier.setEnabled(False)
+
+    def _reap(self):
+        if self._proc is None:
+            return
+        code = self._proc.poll()
+        if code is not None:
+            self._close()
+            self.finished.emit(code)
+        else:
+            # slave 가 먼저 닫히고 셸이 아직 끝나는 중
+            QTimer.singleShot(self.REAP_INTERVAL_MS, self._reap)
+
+    def _close(self):
+        for notifier in (self._read_notifier, self._write_notifier):
+            if notifier is not None:
+                notifier.setEnabled(False)
+                notifier.deleteLater()
+        self._read_notifier = self._write_notifier = None
+        self._write_buffer.clear()
+        if self.fd is not None:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = None
+        self._proc = None
+        self.pid = None
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+
+class ResponseCache:
+    """
+    LLM 응답 디스크 캐시 (SQLite 단일 파일).
+
+    - 키: (provider, model, messages, temperature, max_tokens) 의 sha256
+    - 값: zlib 압축된 응답 텍스트
+    - 만료: ttl 초가 지난 항목은 조회 시 무시/삭제
+    - 용량: max_bytes 를 넘으면 마지막 접근 시각이 오래된 순(LRU)으로 삭제
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # 워커 스레드에서도 쓰므로 연결 하나를 잠금으로 보호
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' value BLOB NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int]) -> str:
+        raw = json.dumps([provider, model, messages, temperature, max_tokens], ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT value, created FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created = row
+            if self.ttl and now - created > self.ttl:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return zlib.decompress(value).decode('utf-8')
+
+    def put(self, key: str, text: str):
+        blob = zlib.compress(text.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                (key, blob, len(blob), now, now),
+            )
+            self._evict_locked(now)
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, total = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'entries': entries,
+                'bytes': total,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _evict_locked(self, now: float):
+        if self.ttl:
+            self._conn.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl,))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 오래 접근하지 않은 순으로 초과분만큼 삭제
+        rows = self._conn.execute('SELECT key, size FROM responses ORDER BY accessed ASC').fetchall()
+        victims = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', victims)
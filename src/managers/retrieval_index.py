@@ -0,0 +1,312 @@
+import os
+import re
+import math
+import heapq
+import pickle
+import hashlib
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .ignore_rules import IgnoreRules
+from .cache_paths import cache_root
+
+
+"""
+프로젝트 폴더용 BM25 어휘 검색 인덱스.
+
+- 파일을 CHUNK_LINES 줄 단위 청크로 나눠 역색인(term -> {chunk_id: tf})을 만든다
+- IgnoreRules(.gitignore 포함)에 걸리는 폴더/파일은 건너뛴다
+- build() 는 백그라운드 스레드에서 실행되고, 끝나면 build_finished 시그널을 보낸다
+- 인덱스는 캐시 디렉토리에 저장되어 다음 실행 때 바뀐 파일만 다시 색인한다
+- update_file() 로 저장 시점에 해당 파일만 갱신
+"""
+class RetrievalIndex(QObject):
+    build_finished = pyqtSignal(int)  # 색인된 파일 수
+
+    VERSION = 1
+    CHUNK_LINES = 40
+    MAX_FILE_BYTES = 1024 * 1024
+    # 너무 흔한 단어는 점수에 기여가 거의 없으면서 비용만 크므로 건너뜀
+    MAX_DF_RATIO = 0.3
+    K1 = 1.2
+    B = 0.75
+
+    _TOKEN_RE = re.compile(r"\w+")
+    _CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        super().__init__()
+        self.cache_dir = cache_dir or cache_root('index')
+        self.root: str = ""
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self._reset()
+
+    def _reset(self):
+        # rel_path -> (mtime, size, [chunk_id])
+        self.files: Dict[str, Tuple[float, int, List[int]]] = {}
+        # chunk_id -> (rel_path, start_line, end_line, length, {term: tf})
+        self.chunks: Dict[int, Tuple[str, int, int, int, Dict[str, int]]] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.total_length = 0
+        self.next_id = 0
+
+    # ---------- public ----------
+    @property
+    def ready(self) -> bool:
+        return bool(self.root) and (self._thread is None or not self._thread.is_alive())
+
+    def build(self, root: str):
+        """root 폴더 색인을 백그라운드에서 시작 (진행 중인 작업은 중단)."""
+        self.cancel()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._build, args=(os.path.abspath(root), self._cancel), daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._cancel.set()
+            self._thread.join(2)
+        self._thread = None
+
+    def update_file(self, path: str):
+        """저장된 파일 하나만 다시 색인 (백그라운드)."""
+        if not self.root:
+            return
+        threading.Thread(target=self._update_and_save, args=(path,), daemon=True).start()
+
+    def search(self, query: str, k: int = 5, exclude: Optional[str] = None) -> List[Tuple[float, str, int, int]]:
+        """BM25 상위 k 개 청크. returns: [(score, rel_path, start_line, end_line)]"""
+        terms = set(self._tokenize(query))
+        exclude_rel = self._rel(exclude) if exclude else None
+        with self._lock:
+            n = len(self.chunks)
+            if not n or not terms:
+                return []
+            avgdl = self.total_length / n
+            scores: Dict[int, float] = {}
+            for term in terms:
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                df = len(posting)
+                if df > n * self.MAX_DF_RATIO and len(terms) > 1:
+                    continue
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                for chunk_id, tf in posting.items():
+                    length = self.chunks[chunk_id][3]
+                    norm = tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * length / avgdl))
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * norm
+            top = heapq.nlargest(k + 8, scores.items(), key=lambda item: item[1])
+            results = []
+            for chunk_id, score in top:
+                rel, start, end, _, _ = self.chunks[chunk_id]
+                if rel == exclude_rel:
+                    continue
+                results.append((score, rel, start, end))
+                if len(results) >= k:
+                    break
+            return results
+
+    def snippets(self, query: str, budget_chars: int, k: int = 8, exclude: Optional[str] = None) -> List[Tuple[str, int, int, str]]:
+        """search 결과의 본문을 읽어 budget_chars 안에서 반환. returns: [(rel_path, start, end, text)]"""
+        out = []
+        used = 0
+        for _, rel, start, end in self.search(query, k, exclude):
+            text = self._read_lines(os.path.join(self.root, rel), start, end)
+            if not text.strip():
+                continue
+            if used + len(text) > budget_chars:
+                if out:
+                    break
+                text = text[:budget_chars]
+            out.append((rel, start, end, text))
+            used += len(text)
+        return out
+
+    # ---------- build ----------
+    def _build(self, root: str, cancel: threading.Event):
+        with self._lock:
+            if root != self.root:
+                self._reset()
+                self.root = root
+                self._load()
+        # 파일 트리와 같은 무시 규칙(.gitignore 포함) 사용
+        rules = IgnoreRules(root)
+        seen = set()
+        for dirpath, dirnames, filenames in os.walk(root):
+            if cancel.is_set():
+                return
+            dirnames[:] = [d for d in dirnames if not rules.is_ignored(os.path.join(dirpath, d), True)]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if rules.is_ignored(path, False):
+                    continue
+                rel = os.path.relpath(path, root)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if st.st_size > self.MAX_FILE_BYTES:
+                    continue
+                seen.add(rel)
+                known = self.files.get(rel)
+                if known and known[0] == st.st_mtime and known[1] == st.st_size:
+                    continue
+                self._index_file(rel, path, st)
+        with self._lock:
+            for rel in [r for r in self.files if r not in seen]:
+                self._remove_file(rel)
+        self._save()
+        self.build_finished.emit(len(self.files))
+
+    def _update_and_save(self, path: str):
+        rel = self._rel(path)
+        if rel is None:
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._remove_file(rel)
+            self._save()
+            return
+        if st.st_size <= self.MAX_FILE_BYTES:
+            self._index_file(rel, path, st)
+            self._save()
+
+    def _index_file(self, rel: str, path: str, st):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        if b'\0' in data[:8192]:
+            return  # 바이너리
+        lines = data.decode('utf-8', errors='ignore').split('\n')
+        # 토큰화는 잠금 밖에서
+        pieces = []
+        for start in range(0, len(lines), self.CHUNK_LINES):
+            end = min(len(lines), start + self.CHUNK_LINES)
+            tf: Dict[str, int] = {}
+            length = 0
+            # 같은 단어는 한 번만 쪼개도록 단어 빈도부터 센다
+            for word, count in Counter(self._TOKEN_RE.findall('\n'.join(lines[start:end]))).items():
+                for token in self._split_word(word):
+                    tf[token] = tf.get(token, 0) + count
+                    length += count
+            if length:
+                pieces.append((start, end, length, tf))
+        with self._lock:
+            self._remove_file(rel)
+            ids = []
+            for start, end, length, tf in pieces:
+                chunk_id = self.next_id
+                self.next_id += 1
+                self.chunks[chunk_id] = (rel, start, end, length, tf)
+                self.total_length += length
+                for term, count in tf.items():
+                    self.postings.setdefault(term, {})[chunk_id] = count
+                ids.append(chunk_id)
+            self.files[rel] = (st.st_mtime, st.st_size, ids)
+
+    def _remove_file(self, rel: str):
+        entry = self.files.pop(rel, None)
+        if not entry:
+            return
+        for chunk_id in entry[2]:
+            chunk = self.chunks.pop(chunk_id, None)
+            if chunk is None:
+                continue
+            self.total_length -= chunk[3]
+            for term in chunk[4]:
+                posting = self.postings.get(term)
+                if posting is not None:
+                    posting.pop(chunk_id, None)
+                    if not posting:
+                        del self.postings[term]
+
+    # ---------- persistence ----------
+    def _cache_path(self) -> str:
+        digest = hashlib.sha1(self.root.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest}.bm25")
+
+    def _load(self):
+        path = self._cache_path()
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+            return
+        if data.get('version') != self.VERSION or data.get('root') != self.root:
+            return
+        self.files = data['files']
+        self.chunks = data['chunks']
+        self.next_id = data['next_id']
+        # 역색인은 저장하지 않고 청크에서 다시 만든다 (파일 크기 절반)
+        for chunk_id, (_, _, _, length, tf) in self.chunks.items():
+            self.total_length += length
+            for term, count in tf.items():
+                self.postings.setdefault(term, {})[chunk_id] = count
+
+    def _save(self):
+        with self._lock:
+            data = {
+                'version': self.VERSION,
+                'root': self.root,
+                'files': dict(self.files),
+                'chunks': dict(self.chunks),
+                'next_id': self.next_id,
+            }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._cache_path()
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"인덱스 저장 실패: {e}")
+
+    # ---------- helpers ----------
+    def _rel(self, path: Optional[str]) -> Optional[str]:
+        if not path or not self.root:
+            return None
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        return None if rel.startswith('..') else rel
+
+    @classmethod
+    def _tokenize(cls, text: str) -> List[str]:
+        tokens = []
+        for word in cls._TOKEN_RE.findall(text):
+            tokens.extend(cls._split_word(word))
+        return tokens
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _split_word(word: str) -> Tuple[str, ...]:
+        """식별자를 통째로 + camelCase/snake_case 조각으로도 색인."""
+        lower = word.lower()
+        tokens = [lower] if len(lower) > 1 else []
+        parts = [p.lower() for piece in word.split('_') for p in RetrievalIndex._CAMEL_RE.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(p for p in parts if len(p) > 1 and p != lower)
+        return tuple(tokens)
+
+    @staticmethod
+    def _read_lines(path: str, start: int, end: int) -> str:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                out = []
+                for i, line in enumerate(f):
+                    if i >= end:
+                        break
+                    if i >= start:
+                        out.append(line)
+            return ''.join(out)
+        except OSError:
+            return ""
@@ -0,0 +1,82 @@
+import os
+from typing import List, Optional
+from PyQt5.QtCore import QObject, QTimer
+
+from . import pty_process
+from .pty_process import PtyProcess
+
+
+"""
+미리 띄워 둔 대화형 셸 풀.
+
+셸 시작(rc 파일 읽기 등)은 시간이 걸리므로 size 개의 셸을 홈 디렉토리에서 미리 띄워 두고,
+터미널을 열 때 take 로 하나를 넘겨준다 (TerminalManager 가 원하는 폴더로 cd 해서 씀).
+대기 중인 셸의 출력은 읽어서 버리고, 하나가 빠지면 REFILL_DELAY_MS 뒤에 다시 채운다.
+PTY 를 쓸 수 없는 플랫폼에서는 비어 있다.
+"""
+class ShellPool(QObject):
+    POOL_SIZE = int(os.getenv('TERMINAL_POOL_SIZE', '2'))
+    REFILL_DELAY_MS = 500
+
+    def __init__(self, size: Optional[int] = None, working_directory: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.size = (self.POOL_SIZE if size is None else size) if pty_process.available() else 0
+        self.working_directory = working_directory or os.path.expanduser('~')
+        self._idle: List[PtyProcess] = []
+        self._refill_timer = QTimer(self)
+        self._refill_timer.setSingleShot(True)
+        self._refill_timer.timeout.connect(self.fill)
+        self._closed = False
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def warm(self, delay_ms: int = 0):
+        """이벤트 루프가 돈 뒤(delay_ms) 풀을 채운다."""
+        if self.size and not self._closed:
+            self._refill_timer.start(delay_ms)
+
+    def fill(self):
+        self._idle = [shell for shell in self._idle if shell.is_running]
+        while not self._closed and len(self._idle) < self.size:
+            shell = PtyProcess(self)
+            # 대기 중 출력(프롬프트 등)은 버림 - 읽지 않으면 PTY 버퍼가 차서 셸이 멈춘다
+            shell.data_received.connect(self._discard)
+            shell.finished.connect(self._on_idle_finished)
+            if not shell.start(pty_process.default_shell(), ['-i'], self.working_directory):
+                shell.deleteLater()
+                break
+            self._idle.append(shell)
+
+    def take(self) -> Optional[PtyProcess]:
+        """살아 있는 대기 셸 하나를 꺼낸다 (없으면 None). 시그널 연결은 끊어서 넘긴다."""
+        while self._idle:
+            shell = self._idle.pop(0)
+            shell.data_received.disconnect(self._discard)
+            shell.finished.disconnect(self._on_idle_finished)
+            if shell.is_running:
+                self.warm(self.REFILL_DELAY_MS)
+                return shell
+            shell.terminate()
+            shell.deleteLater()
+        self.warm(self.REFILL_DELAY_MS)
+        return None
+
+    def shutdown(self):
+        self._closed = True
+        self._refill_timer.stop()
+        for shell in self._idle:
+            shell.terminate()
+            shell.deleteLater()
+        self._idle = []
+
+    def _discard(self, data: bytes):
+        pass
+
+    def _on_idle_finished(self, code: int):
+        shell = self.sender()
+        if shell in self._idle:
+            self._idle.remove(shell)
+            shell.deleteLater()
+            self.warm(self.REFILL_DELAY_MS)
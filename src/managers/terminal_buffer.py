@@ -0,0 +1,143 @@
+import time
+from collections import deque
+from typing import Deque, List
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+def tail_lines(text: str, max_lines: int) -> str:
+    """text 의 마지막 max_lines 줄만 남긴다 (줄 수가 넘칠 때만 자름)."""
+    if max_lines <= 0 or text.count('\n') < max_lines:
+        return text
+    pos = len(text)
+    if text.endswith('\n'):
+        pos -= 1
+    for _ in range(max_lines):
+        pos = text.rfind('\n', 0, pos)
+        if pos < 0:
+            return text
+    return text[pos + 1:]
+
+
+"""
+터미널 스크롤백 링 버퍼.
+
+완성된 줄은 최대 max_lines 줄짜리 deque 에 쌓이고(오래된 줄부터 버려짐), 아직 줄바꿈이 오지 않은
+마지막 줄은 partial 에 따로 둔다. 화면 위젯과 상관없이 세션의 출력 기록을 들고 있는 모델이다.
+"""
+class ScrollbackBuffer:
+    def __init__(self, max_lines: int):
+        self.max_lines = max_lines
+        self.lines: Deque[str] = deque(maxlen=max_lines)
+        self.partial = ""
+
+    def append(self, text: str):
+        if not text:
+            return
+        text = tail_lines(self.partial + text, self.max_lines + 1)
+        parts = text.split('\n')
+        self.partial = parts.pop()
+        self.lines.extend(parts)
+
+    def set_line(self, text: str):
+        """아직 확정되지 않은 마지막 줄을 바꾼다 (CR 로 덮어쓴 진행 표시줄 등)."""
+        self.partial = text
+
+    def clear(self):
+        self.lines.clear()
+        self.partial = ""
+
+    def line_count(self) -> int:
+        return len(self.lines) + (1 if self.partial else 0)
+
+    def text(self) -> str:
+        if not self.lines:
+            return self.partial
+        return '\n'.join(self.lines) + '\n' + self.partial
+
+
+"""
+터미널 출력 합치기(coalescing).
+
+readyRead 마다 들어오는 조각을 모아 두었다가 한 프레임(interval_ms)에 한 번만 flushed 로 내보낸다.
+- 모인 출력이 스크롤백보다 길면 어차피 화면에서 밀려날 앞부분은 버리고 마지막 max_lines 줄만 넘긴다
+  (flushed 의 두 번째 인자로 앞부분을 버렸는지 알린다)
+- 한동안(interval 이상) 조용하다가 들어온 출력은 기다리지 않고 바로 내보낸다 (입력 에코 지연 최소화)
+- flushed 를 받는 쪽(화면 갱신)이 오래 걸리면 다음 flush 를 그만큼 늦춰 이벤트 루프가 숨 쉴 틈을 남긴다
+"""
+class OutputCoalescer(QObject):
+    flushed = pyqtSignal(str, bool)  # text, 앞부분을 버렸는지
+
+    # 화면 갱신에 쓴 시간의 몇 배만큼 다음 flush 까지 쉴지
+    BACKOFF_FACTOR = 2
+    MAX_INTERVAL_MS = 250
+
+    def __init__(self, interval_ms: int = 16, max_lines: int = 10000, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.max_lines = max_lines
+        # 줄이 아주 긴 출력도 무한정 쌓이지 않도록 글자 수 상한도 둔다
+        self.max_chars = max_lines * 512
+        self._chunks: List[str] = []
+        self._size = 0
+        self._dropped = False
+        self._last_flush = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._chunks)
+
+    def feed(self, text: str):
+        if not text:
+            return
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size > self.max_chars * 2:
+            self._compact()
+        if not self._timer.isActive():
+            if (time.perf_counter() - self._last_flush) * 1000 >= self._timer.interval():
+                self.flush()
+            else:
+                self._timer.start()
+
+    def flush(self):
+        """모인 출력을 지금 내보낸다."""
+        self._timer.stop()
+        if not self._chunks:
+            return
+        joined = ''.join(self._chunks)
+        text = self._trim(joined)
+        dropped = self._dropped or len(text) < len(joined)
+        self._chunks = []
+        self._size = 0
+        self._dropped = False
+        started = time.perf_counter()
+        self.flushed.emit(text, dropped)
+        self._last_flush = time.perf_counter()
+        spent_ms = (self._last_flush - started) * 1000
+        self._timer.setInterval(int(min(self.MAX_INTERVAL_MS, max(self.interval_ms, spent_ms * self.BACKOFF_FACTOR))))
+        # 내보내는 동안 새로 들어온 출력
+        if self._chunks and not self._timer.isActive():
+            self._timer.start()
+
+    def discard(self):
+        """보내지 않은 출력을 버린다 (clear 등)."""
+        self._timer.stop()
+        self._chunks = []
+        self._size = 0
+        self._dropped = False
+
+    def _trim(self, text: str) -> str:
+        text = tail_lines(text, self.max_lines)
+        if len(text) > self.max_chars:
+            text = text[-self.max_chars:]
+        return text
+
+    def _compact(self):
+        text = self._trim(''.join(self._chunks))
+        self._dropped = self._dropped or len(text) < self._size
+        self._chunks = [text]
+        self._size = len(text)
@@ -1,23 +1,108 @@
 import os
+import shlex
 import shutil
-import re
-from PyQt5.QtCore import QObject, pyqtSignal, QProcess
+import codecs
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, QProcess
 
-"""터미널 프로세스 관리 클래스"""
+from .terminal_buffer import ScrollbackBuffer, OutputCoalescer
+from .ansi_parser import AnsiParser
+from . import pty_process
+from .pty_process import PtyProcess
+
+"""
+터미널 프로세스 관리 클래스
+
+출력은 readyRead 마다 바로 내보내지 않고 OutputCoalescer 로 모아 프레임(FLUSH_INTERVAL_MS)당 한 번
+AnsiParser 로 해석한 뒤 styled_output 으로 보낸다. 확정된 줄은 평문으로 output_received 에도 보내고,
+scrollback(최대 scrollback_lines 줄 링 버퍼)에 남긴다.
+Linux 에서는 셸을 PtyProcess(진짜 PTY)로 띄우고, 그 밖의 플랫폼은 QProcess 를 쓴다.
+ShellPool 을 주면 새로 띄우는 대신 미리 띄워 둔 셸을 받아 작업 디렉토리로 cd 해서 쓴다.
+"""
 class TerminalManager(QObject):
-    output_received = pyqtSignal(str)
+    output_received = pyqtSignal(str)  # 확정된 줄들의 평문
+    styled_output = pyqtSignal(list, list)  # 확정된 스팬, 현재 줄 스팬 (AnsiParser.feed 결과)
+
+    FLUSH_INTERVAL_MS = 16
+    SCROLLBACK_LINES = int(os.getenv('TERMINAL_SCROLLBACK_LINES', '10000'))
+    USE_PTY = pty_process.available()
+    # 풀에서 받은 셸은 cd 가 끝났다는 이 표시(OSC)가 나올 때까지의 출력(이전 프롬프트, 명령 에코)을 숨긴다
+    ATTACH_MARKER = b'\x1b]777;attached\x07'
+    ATTACH_TIMEOUT_MS = 10000
 
-    def __init__(self):
+    def __init__(self, scrollback_lines: int | None = None, pool=None):
         super().__init__()
         self.process: QProcess | None = None
+        self.pty: PtyProcess | None = None
+        self.pool = pool
+        self._attach_buffer: bytes | None = None
+        self._attach_timer = QTimer(self)
+        self._attach_timer.setSingleShot(True)
+        self._attach_timer.setInterval(self.ATTACH_TIMEOUT_MS)
+        self._attach_timer.timeout.connect(self._end_attach)
+        # PTY 창 크기 (rows, cols) - 화면 크기가 바뀌면 resize 로 갱신
+        self.size: tuple[int, int] = (24, 80)
         self.working_directory: str | None = None
         self.is_running: bool = False
+        self.scrollback_lines: int = scrollback_lines or self.SCROLLBACK_LINES
+        self.scrollback = ScrollbackBuffer(self.scrollback_lines)
+        self._coalescer = OutputCoalescer(self.FLUSH_INTERVAL_MS, self.scrollback_lines, self)
+        self._coalescer.flushed.connect(self._on_flushed)
+        self.parser = AnsiParser()
+        # 여러 바이트짜리 UTF-8 문자가 청크 경계에서 잘려도 깨지지 않도록 스트림별 증분 디코더 사용
+        self._stdout_decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self._stderr_decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
 
     """터미널 시작 (지속형 셸 프로세스)"""
     def start_terminal(self, working_directory: str):
         self.stop_terminal()
         self.working_directory = working_directory
+        self._stdout_decoder.reset()
+        self._stderr_decoder.reset()
+        self.parser.reset()
 
+        if self.USE_PTY:
+            started = self._start_pty(working_directory)
+        else:
+            started = self._start_process(working_directory)
+        self.is_running = started
+        if not started:
+            self._coalescer.feed('터미널 시작 실패\n')
+
+    def _start_pty(self, working_directory: str) -> bool:
+        shell = self.pool.take() if self.pool is not None else None
+        if shell is not None:
+            shell.setParent(self)
+            self._attach(shell, working_directory)
+            return True
+        self.pty = PtyProcess(self)
+        self.pty.data_received.connect(self._on_pty_data)
+        self.pty.finished.connect(self._on_finished)
+        rows, cols = self.size
+        if self.pty.start(pty_process.default_shell(), ['-i'], working_directory, rows=rows, cols=cols):
+            return True
+        self.pty = None
+        return False
+
+    def _attach(self, shell: PtyProcess, working_directory: str):
+        """미리 띄워 둔 셸을 이 터미널의 셸로 쓴다."""
+        self.pty = shell
+        shell.data_received.connect(self._on_pty_data)
+        shell.finished.connect(self._on_finished)
+        shell.resize(*self.size)
+        self._attach_buffer = b''
+        self._attach_timer.start()
+        # 앞 공백: 셸 히스토리에 남기지 않음 (HISTCONTROL=ignorespace / HIST_IGNORE_SPACE)
+        marker = self.ATTACH_MARKER.decode('ascii').replace('\x1b', '\\033').replace('\x07', '\\007')
+        shell.write(f" cd -- {shlex.quote(working_directory)}; printf '{marker}'\n".encode('utf-8'))
+
+    def _end_attach(self):
+        """표시가 끝내 오지 않으면 모아 둔 출력을 그대로 보여준다."""
+        if self._attach_buffer is not None:
+            data = self._attach_buffer
+            self._attach_buffer = None
+            self._on_pty_data(data)
+
+    def _start_process(self, working_directory: str) -> bool:
         self.process = QProcess()
         self.process.setWorkingDirectory(working_directory)
         # 플랫폼별로 실행할 프로그램/인자 설정
@@ -28,8 +113,8 @@ class TerminalManager(QObject):
             self.process.setProgram(program)
             self.process.setArguments(args)
         else:
-            # macOS/Linux: zsh 또는 bash, 가능하면 PTY를 위해 'script' 래핑
-            program = '/bin/zsh' if os.path.exists('/bin/zsh') else '/bin/bash'
+            # macOS/BSD: zsh 또는 bash, 가능하면 PTY를 위해 'script' 래핑
+            program = pty_process.default_shell()
             args = ['-i']  # interactive
 
             script_path = shutil.which('script')
@@ -51,32 +136,54 @@ class TerminalManager(QObject):
         # 프로세스 시작 및 시작 여부 확인
         self.process.start()
         started = self.process.waitForStarted(3000)
-        self.is_running = bool(started)
-
         if started:
             # 초기 PWD 동기화
+            self.is_running = True
             self.execute_command(f'cd "{working_directory}"')
-        else:
-            self.output_received.emit('터미널 시작 실패\n')
+        return bool(started)
 
     def _on_stdout(self):
         if not self.process:
             return
-        text = bytes(self.process.readAllStandardOutput()).decode('utf-8', errors='ignore')
-        if text:
-            self.output_received.emit(self._sanitize_output(text))
+        self._coalescer.feed(self._stdout_decoder.decode(bytes(self.process.readAllStandardOutput())))
 
     def _on_stderr(self):
         if not self.process:
             return
-        text = bytes(self.process.readAllStandardError()).decode('utf-8', errors='ignore')
-        if text:
-            self.output_received.emit(self._sanitize_output(text))
+        self._coalescer.feed(self._stderr_decoder.decode(bytes(self.process.readAllStandardError())))
+
+    def _on_pty_data(self, data: bytes):
+        if self._attach_buffer is not None:
+            data = self._attach_buffer + data
+            index = data.find(self.ATTACH_MARKER)
+            if index < 0:
+                self._attach_buffer = data
+                return
+            self._attach_buffer = None
+            self._attach_timer.stop()
+            data = data[index + len(self.ATTACH_MARKER):]
+        self._coalescer.feed(self._stdout_decoder.decode(data))
+
+    def _on_flushed(self, text: str, dropped: bool):
+        if dropped:
+            # 앞부분이 잘려 나갔으므로 지금까지의 현재 줄은 그대로 끝난 것으로 본다
+            self.parser.break_line()
+        spans, line = self.parser.feed(text)
+        committed = ''.join(t for t, _ in spans)
+        self.scrollback.set_line('')
+        self.scrollback.append(committed)
+        self.scrollback.set_line(''.join(t for t, _ in line))
+        if committed:
+            self.output_received.emit(committed)
+        self.styled_output.emit(spans, line)
 
-    def _on_finished(self, exitCode: int, exitStatus):
+    def _on_finished(self, exitCode: int, exitStatus=None):
         self.is_running = False
+        if self.pty:
+            self.pty.deleteLater()
+            self.pty = None
         # 세션 종료 알림
-        self.output_received.emit("\n[세션 종료]\n")
+        self._coalescer.feed("\n[세션 종료]\n")
 
     def _on_error(self, error):
         # 상태만 false로
@@ -84,12 +191,16 @@ class TerminalManager(QObject):
 
     """명령/입력 전송: 실행 중 프로세스의 stdin으로 전달"""
     def execute_command(self, command: str):
-        if not self.process or not self.is_running:
+        if not self.is_running:
             # 자동 재시작 시도
             if not self.ensure_running():
                 return False, "터미널이 실행 중이 아닙니다. 폴더를 다시 열거나 명령을 다시 시도하세요."
         try:
             data = (command + '\n').encode('utf-8')
+            if self.pty:
+                # 논블로킹 쓰기 - 다 못 쓴 부분은 PtyProcess 가 이어서 씀
+                self.pty.write(data)
+                return True, ""
             self.process.write(data)
             # flush 대신 전송 완료 대기 (QProcess에는 flush가 없음)
             self.process.waitForBytesWritten(1000)
@@ -97,6 +208,22 @@ class TerminalManager(QObject):
         except Exception as e:
             return False, f"입력 실패: {str(e)}"
 
+    """실행 중인 명령 중단 (Ctrl+C)"""
+    def interrupt(self):
+        if self.pty:
+            self.pty.interrupt()
+        elif self.process and self.is_running:
+            # 'script' 로 감싼 경우 그 PTY 가 ^C 를 SIGINT 로 바꿔 준다
+            self.process.write(b'\x03')
+
+    """PTY 창 크기 변경 (행, 열)"""
+    def resize(self, rows: int, cols: int):
+        if rows <= 0 or cols <= 0 or (rows, cols) == self.size:
+            return
+        self.size = (rows, cols)
+        if self.pty:
+            self.pty.resize(rows, cols)
+
     """작업 디렉토리 변경(셸 세션과 내부 상태 모두)"""
     def change_directory(self, path: str):
         if os.path.isdir(path):
@@ -107,12 +234,25 @@ class TerminalManager(QObject):
         else:
             return False, f"디렉토리를 찾을 수 없습니다: {path}"
 
+    """스크롤백과 아직 내보내지 않은 출력을 비움"""
+    def clear_scrollback(self):
+        self._coalescer.discard()
+        self.scrollback.clear()
+
     """현재 작업 디렉토리 반환(내부 상태)"""
     def get_current_directory(self):
         return self.working_directory if self.working_directory else ""
 
     """터미널 종료"""
     def stop_terminal(self):
+        self._attach_buffer = None
+        self._attach_timer.stop()
+        self._coalescer.flush()
+        if self.pty:
+            pty = self.pty
+            self.pty = None
+            pty.terminate()
+            pty.deleteLater()
         if self.process:
             try:
                 self.process.terminate()
@@ -123,25 +263,14 @@ class TerminalManager(QObject):
         self.is_running = False
 
     def _sanitize_output(self, text: str) -> str:
-        """출력 세니타이징"""
-
-        # 캐리지 리턴 정규화
-        text = text.replace('\r', '\n')
-
-        # OSC
-        text = re.sub(r"\x1B\][^\x07]*(\x07|\x1b\\)", "", text)
-        # CSI
-        text = re.sub(r"\x1B\[[0-?]*[ -/]*[@-~]", "", text)
-        # ESC
-        text = re.sub(r"\x1B[()][0-2AB]", "", text)
-
-        return text
+        """출력 세니타이징: 제어 시퀀스를 해석해 화면에 보일 평문만 남김"""
+        return AnsiParser.plain(text)
 
     def ensure_running(self) -> bool:
         """셸이 종료된 경우 working_directory 기준으로 자동 재시작."""
-        if self.process and self.is_running:
+        if self.is_running:
             return True
         if not self.working_directory:
             return False
         self.start_terminal(self.working_directory)
-        return bool(self.process and self.is_running)
+        return self.is_running
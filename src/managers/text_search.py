@@ -0,0 +1,168 @@
+import os
+import re
+import time
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .trigram_index import TrigramIndex
+
+
+"""
+프로젝트 전체 검색 (Find in Files).
+
+- 검색어(리터럴 또는 정규식)를 TrigramIndex 검색 계획으로 바꿔 후보 파일만 고른 뒤,
+  후보를 읽어 실제로 일치하는 줄을 찾는다 (색인이 아직 없으면 폴더 전체를 훑음)
+- 백그라운드 스레드에서 실행하고, 찾은 결과는 FLUSH_INTERVAL 마다 묶어서 results_found 로 흘려보낸다
+- 새 검색을 시작하면 이전 검색은 중단되고, 시그널의 search_id 로 늦게 온 결과를 걸러낸다
+- overrides 로 넘긴 파일(저장하지 않은 편집 중인 버퍼)은 디스크 대신 그 내용을 검색한다
+"""
+class TextSearch(QObject):
+    # search_id, [(path, [(line, col, length, line_text)])]
+    results_found = pyqtSignal(int, list)
+    # search_id, 일치 파일 수, 일치 수, 확인한 후보 파일 수, 전체 파일 수, 결과 제한에 걸렸는지, 걸린 시간(초)
+    search_finished = pyqtSignal(int, int, int, int, int, bool, float)
+
+    MAX_RESULTS = 10000
+    MAX_MATCHES_PER_FILE = 1000
+    MAX_LINE_CHARS = 300
+    FLUSH_INTERVAL = 0.05
+
+    def __init__(self, index: TrigramIndex):
+        super().__init__()
+        self.index = index
+        self._ids = itertools.count(1)
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def search(self, query: str, regex: bool = False, case_sensitive: bool = False, whole_word: bool = False,
+               overrides: Optional[Dict[str, str]] = None) -> Tuple[int, Optional[str]]:
+        """
+        검색 시작 (진행 중인 검색은 중단).
+        returns: (search_id, None) / (0, 정규식 오류 메시지)
+        """
+        self.cancel()
+        if not query or not self.index.root:
+            return 0, None
+        source = query if regex else re.escape(query)
+        if whole_word:
+            source = rf'\b(?:{source})\b'
+        try:
+            pattern = re.compile(source, re.MULTILINE | (0 if case_sensitive else re.IGNORECASE))
+        except re.error as e:
+            return 0, str(e)
+        plan = self.index.plan_regex(query, case_sensitive) if regex else self.index.plan_literal(query, case_sensitive)
+        # 대소문자 구분 리터럴은 정규식 전에 문자열 포함 여부로 먼저 거른다
+        needle = query if not regex and case_sensitive else None
+        search_id = next(self._ids)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(search_id, pattern, plan, needle, dict(overrides or {}), self._cancel), daemon=True)
+        self._thread.start()
+        return search_id, None
+
+    def cancel(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._cancel.set()
+            self._thread.join(1)
+        self._thread = None
+
+    def _run(self, search_id: int, pattern: re.Pattern, plan, needle: Optional[str], overrides: Dict[str, str],
+             cancel: threading.Event):
+        started = time.perf_counter()
+        if self.index.ready:
+            paths, total = self.index.candidates(plan)
+        else:
+            paths = self._walk(cancel)
+            total = len(paths)
+        # 편집 중인 버퍼는 색인과 내용이 다를 수 있으므로 항상 확인
+        known = set(paths)
+        prefix = self.index.root + os.sep
+        extra = [p for p in overrides if p not in known and p.startswith(prefix)]
+        paths = sorted(paths + extra) if extra else paths
+
+        batch: List[Tuple[str, list]] = []
+        last_flush = time.perf_counter()
+        files = matches = 0
+        truncated = False
+        for path in paths:
+            if cancel.is_set():
+                return
+            text = overrides.get(path)
+            if text is None:
+                text = self._read(path)
+                if text is None:
+                    continue
+            if needle is not None and needle not in text:
+                continue
+            found = self._match_lines(pattern, text, min(self.MAX_MATCHES_PER_FILE, self.MAX_RESULTS - matches))
+            if found:
+                files += 1
+                matches += len(found)
+                batch.append((path, found))
+            if matches >= self.MAX_RESULTS:
+                truncated = True
+                break
+            now = time.perf_counter()
+            if batch and now - last_flush >= self.FLUSH_INTERVAL:
+                self.results_found.emit(search_id, batch)
+                batch = []
+                last_flush = now
+        if cancel.is_set():
+            return
+        if batch:
+            self.results_found.emit(search_id, batch)
+        self.search_finished.emit(search_id, files, matches, len(paths), total, truncated, time.perf_counter() - started)
+
+    def _match_lines(self, pattern: re.Pattern, text: str, limit: int) -> List[Tuple[int, int, int, str]]:
+        """일치 위치마다 (줄 번호(0부터), 줄 안의 열, 길이, 줄 내용). 빈 일치는 건너뜀."""
+        out = []
+        line = 0
+        counted = 0
+        for m in pattern.finditer(text):
+            start, end = m.span()
+            if start == end:
+                continue
+            line += text.count('\n', counted, start)
+            counted = start
+            line_start = text.rfind('\n', 0, start) + 1
+            line_end = text.find('\n', start)
+            if line_end == -1:
+                line_end = len(text)
+            col = start - line_start
+            line_text = text[line_start:min(line_end, line_start + self.MAX_LINE_CHARS)]
+            out.append((line, col, min(end, line_end) - start, line_text))
+            if len(out) >= limit:
+                break
+        return out
+
+    def _walk(self, cancel: threading.Event) -> List[str]:
+        """색인이 아직 없을 때: 무시 규칙을 적용해 폴더 전체를 훑는다."""
+        root = self.index.root
+        rules = self.index.rules
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            if cancel.is_set():
+                return []
+            if rules is not None:
+                dirnames[:] = [d for d in dirnames if not rules.is_ignored(os.path.join(dirpath, d), True)]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if rules is None or not rules.is_ignored(path, False):
+                    paths.append(path)
+        paths.sort()
+        return paths
+
+    def _read(self, path: str) -> Optional[str]:
+        try:
+            if os.path.getsize(path) > self.index.MAX_SCAN_BYTES:
+                return None
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if b'\0' in data[:8192]:
+            return None
+        # 에디터와 같은 줄바꿈 정규화 (열 위치가 에디터 문서와 맞도록)
+        return data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
@@ -0,0 +1,670 @@
+import os
+import re
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple, Union
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .ignore_rules import IgnoreRules
+from .cache_paths import cache_root
+
+try:
+    from re import _parser as _sre_parse, _constants as _sre
+except ImportError:  # Python 3.10 이하
+    import sre_parse as _sre_parse
+    import sre_constants as _sre
+
+# 파일 종류
+TEXT, LARGE, BINARY = 0, 1, 2
+
+# 3바이트씩 끊어 읽는다. 시작 위치를 0/1/2 로 세 번 돌리면 겹치는 조각이 모두 나온다 (C 에서 실행)
+_TRIGRAM_RE = re.compile(b'...', re.S)
+_HEADER = struct.Struct('<4sIIIQQQQ')  # magic, version, 파일 수, 키 수, keys/starts/postings/meta 오프셋
+_MAGIC = b'TRG1'
+
+# 검색 계획: None(모든 파일), 트라이그램 키(int), ('and' | 'or', [계획])
+Plan = Union[None, int, Tuple[str, list]]
+
+
+def _trigrams(data: bytes) -> Set[int]:
+    """대소문자 구분 없는(ASCII) 트라이그램 키 집합. 키는 3바이트를 big-endian 정수로."""
+    data = data.lower()
+    grams = set(_TRIGRAM_RE.findall(data))
+    grams.update(_TRIGRAM_RE.findall(data, 1))
+    grams.update(_TRIGRAM_RE.findall(data, 2))
+    return {int.from_bytes(gram, 'big') for gram in grams}
+
+
+def _classify(path: str, max_bytes: int) -> Tuple[int, int, int, Optional[bytes]]:
+    """returns: (mtime_ns, size, 종류, 색인할 내용). 읽을 수 없으면 OSError."""
+    st = os.stat(path)
+    if st.st_size > max_bytes:
+        with open(path, 'rb') as f:
+            head = f.read(8192)
+        return st.st_mtime_ns, st.st_size, BINARY if b'\0' in head else LARGE, None
+    with open(path, 'rb') as f:
+        data = f.read()
+    if b'\0' in data[:8192]:
+        return st.st_mtime_ns, st.st_size, BINARY, None
+    # 검색 때 확인하는 텍스트(TextSearch._read)와 같은 줄바꿈 정규화. 안 하면 \n 을 포함한 패턴이 CRLF 파일에서 빠진다
+    return st.st_mtime_ns, st.st_size, TEXT, data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+
+def _index_chunk(root: str, items: List[Tuple[int, str]], max_bytes: int):
+    """
+    프로세스 풀 작업 단위: 파일 묶음의 트라이그램 역색인.
+    returns: ({키: file_id 배열 bytes (오름차순)}, [(file_id, mtime_ns, size, 종류) | (file_id, None)])
+    """
+    postings: Dict[int, array] = {}
+    metas = []
+    for file_id, rel in items:
+        try:
+            mtime_ns, size, kind, data = _classify(os.path.join(root, rel), max_bytes)
+        except OSError:
+            metas.append((file_id, None))
+            continue
+        metas.append((file_id, mtime_ns, size, kind))
+        if data is not None:
+            for key in _trigrams(data):
+                ids = postings.get(key)
+                if ids is None:
+                    ids = postings[key] = array('I')
+                ids.append(file_id)
+    return {key: ids.tobytes() for key, ids in postings.items()}, metas
+
+
+"""
+프로젝트 전체 텍스트 검색용 트라이그램 역색인.
+
+- 파일마다 소문자로 바꾼 내용의 3바이트 조각을 모아 (트라이그램 -> 파일 id 목록) 역색인을 만든다
+- 빌드는 프로세스 풀에서 파일 묶음 단위로 나눠 실행하고, 결과는 캐시 디렉토리에 한 파일로 저장한다.
+  파일은 [헤더][정렬된 키 u32][시작 위치 u32][게시 목록 u32][메타 JSON] 형식이라 mmap 으로 열어
+  키는 이분 탐색, 게시 목록은 필요한 구간만 읽는다 (메모리에 통째로 올리지 않음)
+- 다음 실행 때는 mtime/크기가 바뀐 파일만 새 id 로 다시 색인해 합친다. 예전 id 는 죽은 것으로
+  표시만 하고, 그 비율이 MAX_DEAD_RATIO 를 넘으면 전체를 다시 만든다
+- 저장/외부 변경은 메모리의 추가분 색인에 반영하고, 추가분이 MERGE_EVERY 개를 넘으면 파일에 합친다
+- candidates(plan) 은 검색 계획(트라이그램 AND/OR)을 만족할 수 있는 파일만 돌려준다.
+  실제 일치 여부는 호출하는 쪽(TextSearch)이 확인한다
+"""
+class TrigramIndex(QObject):
+    build_finished = pyqtSignal(int)  # 색인된 파일 수
+
+    VERSION = 2
+    MAX_FILE_BYTES = 4 * 1024 * 1024      # 이보다 큰 텍스트 파일은 색인 없이 검색 때 직접 훑는다
+    MAX_SCAN_BYTES = 64 * 1024 * 1024     # 이보다 크면 검색하지 않음
+    CHUNK_FILES = 128
+    MIN_POOL_FILES = 512                  # 이보다 적으면 프로세스를 띄우지 않고 바로 색인
+    MAX_DEAD_RATIO = 0.3
+    MERGE_EVERY = 256
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        super().__init__()
+        self.cache_dir = cache_dir or cache_root('index')
+        self.root: str = ""
+        self.rules: Optional[IgnoreRules] = None
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self._merge_thread: Optional[threading.Thread] = None
+        # 빌드 중에 저장된 파일 (빌드 결과로 교체한 뒤 다시 반영)
+        self._updated_during_build: Set[str] = set()
+        self._mm: Optional[mmap.mmap] = None
+        self._reset()
+
+    def _reset(self):
+        self._release()
+        # file_id -> (rel, mtime_ns, size, 종류), 죽은 id 는 None
+        self._files: List[Optional[Tuple[str, int, int, int]]] = []
+        self._ids: Dict[str, int] = {}
+        self._base_files = 0                    # 디스크 색인에 들어간 파일 id 수
+        self._keys = self._starts = self._postings = None
+        self._overlay: Dict[int, array] = {}    # 디스크 색인 이후 다시 색인한 파일의 게시 목록
+        self._overlay_files = 0
+        self._generation = 0                    # 파일 목록이 바뀔 때마다 증가
+        self._scan_stats: Tuple[int, int, List[str]] = (-1, 0, [])  # (generation, 검색 대상 수, 큰 텍스트 파일)
+
+    # ---------- public ----------
+    @property
+    def building(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def ready(self) -> bool:
+        """검색에 쓸 색인이 있는지 (이전 실행의 색인을 불러왔으면 빌드 중에도 True)."""
+        return bool(self._files)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def build(self, root: str, patterns: Optional[List[str]] = None, use_gitignore: bool = True):
+        """root 색인을 백그라운드에서 시작 (저장된 색인이 있으면 바뀐 파일만 다시 색인)."""
+        self.cancel()
+        root = os.path.abspath(root)
+        rules = IgnoreRules(root, patterns, use_gitignore)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._build, args=(root, rules, self._cancel), daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._cancel.set()
+            self._thread.join(5)
+        self._thread = None
+
+    def close(self):
+        self.cancel()
+        self._wait_merge()
+        with self._lock:
+            self.root = ""
+            self._reset()
+
+    def update_file(self, path: str):
+        """저장된 파일 하나를 다시 색인 (백그라운드)."""
+        if self._rel(path) is None:
+            return
+        threading.Thread(target=self._update, args=([path],), daemon=True).start()
+
+    def remove_path(self, path: str):
+        """파일 또는 폴더(하위 전체)를 색인에서 뺀다."""
+        rel = self._rel(path)
+        if rel is None:
+            return
+        prefix = rel + os.sep
+        with self._lock:
+            for name in [r for r in self._ids if r == rel or r.startswith(prefix)]:
+                self._files[self._ids.pop(name)] = None
+                self._generation += 1
+
+    def refresh_directories(self, paths: List[str]):
+        """내용이 바뀐 폴더들에서 추가/수정/삭제된 파일을 다시 색인 (백그라운드)."""
+        if not self.root or self.rules is None:
+            return
+        threading.Thread(target=self._refresh, args=(list(paths),), daemon=True).start()
+
+    def candidates(self, plan: Plan) -> Tuple[List[str], int]:
+        """
+        plan 을 만족할 수 있는 파일의 절대 경로 (상대 경로 순). 색인하지 않은 큰 텍스트 파일은 항상 포함.
+        returns: (경로 목록, 검색 대상 전체 파일 수)
+        """
+        with self._lock:
+            ids = self._eval(plan)
+            files = self._files
+            if ids is None:
+                ids = range(len(files))
+            generation, total, large = self._scan_stats
+            if generation != self._generation:
+                live = [entry for entry in files if entry is not None and entry[3] != BINARY and entry[2] <= self.MAX_SCAN_BYTES]
+                large = [entry[0] for entry in live if entry[3] == LARGE]
+                total = len(live)
+                self._scan_stats = (self._generation, total, large)
+            chosen = list(large)
+            for file_id in ids:
+                entry = files[file_id]
+                if entry is not None and entry[3] == TEXT:
+                    chosen.append(entry[0])
+            root = self.root
+        chosen.sort()
+        return [os.path.join(root, rel) for rel in chosen], total
+
+    # ---------- query plan ----------
+    @classmethod
+    def plan_literal(cls, text: str, case_sensitive: bool = False) -> Plan:
+        """text 가 그대로 들어 있으려면 필요한 트라이그램 AND."""
+        return cls._and(cls._literal_keys(text, case_sensitive))
+
+    @classmethod
+    def plan_regex(cls, pattern: str, case_sensitive: bool = False) -> Plan:
+        """
+        정규식이 일치하려면 반드시 들어 있어야 하는 리터럴 조각의 트라이그램 계획.
+        연속된 리터럴은 AND, 선택(|)은 OR, 0번 반복될 수 있는 부분은 조건에서 뺀다.
+        알 수 없는 구문은 조건 없음(None)으로 취급하므로 후보가 넓어질 뿐 결과가 빠지지는 않는다.
+        """
+        try:
+            parsed = _sre_parse.parse(pattern, 0 if case_sensitive else re.IGNORECASE)
+        except re.error:
+            return None
+        state = getattr(parsed, 'state', None) or parsed.pattern
+        return cls._plan_sequence(list(parsed), not state.flags & re.IGNORECASE)
+
+    @classmethod
+    def _plan_sequence(cls, items, case_sensitive: bool) -> Plan:
+        parts: list = []
+        run: List[str] = []
+
+        def flush():
+            if run:
+                parts.append(cls._and(cls._literal_keys(''.join(run), case_sensitive)))
+                run.clear()
+
+        for op, av in items:
+            if op is _sre.LITERAL:
+                run.append(chr(av))
+                continue
+            flush()
+            if op is _sre.SUBPATTERN:
+                # (?i:...) 처럼 그룹 안에서만 대소문자를 무시할 수도 있다
+                parts.append(cls._plan_sequence(list(av[-1]), case_sensitive and not av[1] & re.IGNORECASE))
+            elif op is _sre.BRANCH:
+                parts.append(cls._or([cls._plan_sequence(list(alt), case_sensitive) for alt in av[1]]))
+            elif op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT, getattr(_sre, 'POSSESSIVE_REPEAT', None)) and av[0] >= 1:
+                parts.append(cls._plan_sequence(list(av[2]), case_sensitive))
+            elif op is getattr(_sre, 'ATOMIC_GROUP', None):
+                parts.append(cls._plan_sequence(list(av), case_sensitive))
+        flush()
+        return cls._and(parts)
+
+    @staticmethod
+    def _literal_keys(text: str, case_sensitive: bool) -> List[int]:
+        if not case_sensitive:
+            # 색인은 ASCII 만 소문자로 바꾸므로, 대소문자 무시 검색에서 ASCII 가 아닌 글자는 조건에서 뺀다
+            pieces = re.split(r'[^\x00-\x7f]', text)
+        else:
+            pieces = [text]
+        keys = []
+        for piece in pieces:
+            keys.extend(_trigrams(piece.encode('utf-8')))
+        return keys
+
+    @staticmethod
+    def _and(parts: list) -> Plan:
+        parts = [p for p in parts if p is not None]
+        flat = []
+        for p in parts:
+            flat.extend(p[1] if isinstance(p, tuple) and p[0] == 'and' else [p])
+        if not flat:
+            return None
+        return flat[0] if len(flat) == 1 else ('and', flat)
+
+    @staticmethod
+    def _or(parts: list) -> Plan:
+        if not parts or any(p is None for p in parts):
+            return None
+        return parts[0] if len(parts) == 1 else ('or', parts)
+
+    def _eval(self, plan: Plan) -> Optional[Set[int]]:
+        if plan is None:
+            return None
+        if isinstance(plan, int):
+            return self._posting(plan)
+        op, items = plan
+        if op == 'or':
+            out: Set[int] = set()
+            for item in items:
+                ids = self._eval(item)
+                if ids is None:
+                    return None
+                out |= ids
+            return out
+        # AND: 짧은 게시 목록부터 시작하고, 후보가 적어지면 긴 목록은 이분 탐색으로 확인만 한다
+        keys = sorted((item for item in items if isinstance(item, int)), key=self._count)
+        result: Optional[Set[int]] = None
+        for key in keys:
+            if result is None:
+                result = self._posting(key)
+            else:
+                result = self._filter(result, key)
+            if not result:
+                return result
+        for item in items:
+            if isinstance(item, int):
+                continue
+            ids = self._eval(item)
+            if ids is not None:
+                result = ids if result is None else result & ids
+        return result
+
+    def _base_range(self, key: int) -> Tuple[int, int]:
+        keys = self._keys
+        if keys is None:
+            return 0, 0
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return self._starts[i], self._starts[i + 1]
+        return 0, 0
+
+    def _count(self, key: int) -> int:
+        start, end = self._base_range(key)
+        return end - start + len(self._overlay.get(key, ()))
+
+    def _posting(self, key: int) -> Set[int]:
+        start, end = self._base_range(key)
+        ids = set(self._postings[start:end].tolist()) if end > start else set()
+        ids.update(self._overlay.get(key, ()))
+        return ids
+
+    def _filter(self, ids: Set[int], key: int) -> Set[int]:
+        start, end = self._base_range(key)
+        if len(ids) * 16 >= end - start:
+            return ids & self._posting(key)
+        postings = self._postings
+        extra = self._overlay.get(key, ())
+        out = set()
+        for file_id in ids:
+            i = bisect_left(postings, file_id, start, end)
+            if (i < end and postings[i] == file_id) or file_id in extra:
+                out.add(file_id)
+        return out
+
+    # ---------- build ----------
+    def _build(self, root: str, rules: IgnoreRules, cancel: threading.Event):
+        # 합치는 중인 게시 목록을 쓰는 동안 mmap 이 바뀌지 않도록 먼저 끝낸다
+        self._wait_merge()
+        with self._lock:
+            if root != self.root:
+                self._reset()
+                self.root = root
+                self._load()
+            self.rules = rules
+            self._updated_during_build = set()
+            old_files = list(self._files)
+            old_ids = dict(self._ids)
+            base = (self._keys, self._starts, self._postings) if self._keys is not None else None
+            base_files = self._base_files
+
+        # 1) 현재 파일 목록을 이전 색인과 비교
+        current: Dict[str, Tuple[int, int]] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            if cancel.is_set():
+                return
+            dirnames[:] = [d for d in dirnames if not rules.is_ignored(os.path.join(dirpath, d), True)]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if rules.is_ignored(path, False):
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                current[os.path.relpath(path, root)] = (st.st_mtime_ns, st.st_size)
+
+        # 디스크 색인의 id 중 내용이 그대로인 것만 살리고, 나머지(삭제/변경, 이후 추가분)는 새로 색인
+        files: List[Optional[Tuple[str, int, int, int]]] = list(old_files[:base_files])
+        keep: Set[int] = set()
+        changed = []
+        for rel, (mtime_ns, size) in current.items():
+            file_id = old_ids.get(rel)
+            if file_id is not None and file_id < base_files and files[file_id] is not None and files[file_id][1:3] == (mtime_ns, size):
+                keep.add(file_id)
+            else:
+                changed.append(rel)
+        newly_dead = 0
+        for file_id in range(base_files):
+            if file_id not in keep and files[file_id] is not None:
+                files[file_id] = None
+                newly_dead += 1
+        dead = base_files - len(keep)
+        if base is None or dead > self.MAX_DEAD_RATIO * (base_files + len(changed)):
+            # 처음이거나 죽은 id 가 너무 많으면 전체를 새로
+            files, base, changed = [], None, sorted(current)
+        elif not changed and not newly_dead:
+            # 저장된 색인이 그대로 맞으면 다시 쓰지 않는다
+            self.build_finished.emit(len(self._ids))
+            return
+
+        # 2) 바뀐 파일만 새 id 로 색인 (많으면 프로세스 풀)
+        first_id = len(files)
+        items = [(first_id + i, rel) for i, rel in enumerate(sorted(changed))]
+        files.extend([None] * len(items))
+        new_postings: Dict[int, List[bytes]] = {}
+        for postings, metas in self._index_items(root, items, cancel):
+            if cancel.is_set():
+                return
+            for key, ids in postings.items():
+                new_postings.setdefault(key, []).append(ids)
+            for meta in metas:
+                if meta[1] is not None:
+                    files[meta[0]] = (items[meta[0] - first_id][1],) + tuple(meta[1:])
+        if cancel.is_set():
+            return
+
+        # 3) 이전 게시 목록 + 새 게시 목록을 파일로 쓰고 mmap 으로 교체
+        extra = {key: b''.join(parts) for key, parts in new_postings.items()}
+        if not self._write_and_swap(root, files, base, extra, cancel, None):
+            return
+        for path in self._updated_during_build:
+            self._update([path])
+        self.build_finished.emit(len(self._ids))
+
+    def _index_items(self, root: str, items: List[Tuple[int, str]], cancel: threading.Event):
+        chunks = [items[i:i + self.CHUNK_FILES] for i in range(0, len(items), self.CHUNK_FILES)]
+        done = 0
+        if len(items) >= self.MIN_POOL_FILES:
+            workers = max(1, min(8, (os.cpu_count() or 2) - 1))
+            # multiprocessing 을 끌어오는 import 라 에디터 시작 때가 아니라 색인할 때 한다
+            from concurrent.futures import ProcessPoolExecutor
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    # 묶음이 id 순이고 map 은 순서를 지키므로 게시 목록을 이어 붙여도 정렬이 유지된다
+                    for result in pool.map(_index_chunk, [root] * len(chunks), chunks, [self.MAX_FILE_BYTES] * len(chunks)):
+                        if cancel.is_set():
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            return
+                        done += 1
+                        yield result
+                return
+            except (OSError, RuntimeError) as e:
+                # 프로세스를 만들 수 없는 환경이면 남은 묶음은 이 스레드에서 색인
+                print(f"색인 프로세스 풀을 쓸 수 없어 스레드에서 색인합니다: {e}")
+        for chunk in chunks[done:]:
+            if cancel.is_set():
+                return
+            yield _index_chunk(root, chunk, self.MAX_FILE_BYTES)
+
+    def _update(self, paths: List[str]):
+        for path in paths:
+            rel = self._rel(path)
+            if rel is None:
+                continue
+            if self.building:
+                self._updated_during_build.add(path)
+            try:
+                mtime_ns, size, kind, data = _classify(path, self.MAX_FILE_BYTES)
+            except OSError:
+                self.remove_path(path)
+                continue
+            keys = _trigrams(data) if data is not None else ()
+            with self._lock:
+                old_id = self._ids.get(rel)
+                if old_id is not None:
+                    self._files[old_id] = None
+                file_id = len(self._files)
+                self._files.append((rel, mtime_ns, size, kind))
+                self._ids[rel] = file_id
+                self._generation += 1
+                for key in keys:
+                    ids = self._overlay.get(key)
+                    if ids is None:
+                        ids = self._overlay[key] = array('I')
+                    ids.append(file_id)
+                self._overlay_files += 1
+        self._maybe_merge()
+
+    def _refresh(self, paths: List[str]):
+        rules = self.rules
+        changed = []
+        for path in paths:
+            rel_dir = self._rel(path)
+            if rel_dir is None:
+                continue
+            rel_dir = "" if rel_dir == '.' else rel_dir
+            try:
+                with os.scandir(path) as it:
+                    listing = {e.name: e for e in it if e.is_file() and not rules.is_ignored(e.path, False)}
+            except OSError:
+                self.remove_path(path)
+                continue
+            with self._lock:
+                known = {rel: self._files[file_id] for rel, file_id in self._ids.items() if os.path.dirname(rel) == rel_dir}
+            for rel, entry in known.items():
+                if os.path.basename(rel) not in listing:
+                    self.remove_path(os.path.join(self.root, rel))
+            for name, e in listing.items():
+                entry = known.get(os.path.join(rel_dir, name))
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                if entry is None or entry[1] != st.st_mtime_ns or entry[2] != st.st_size:
+                    changed.append(e.path)
+        if changed:
+            self._update(changed)
+
+    def _maybe_merge(self):
+        with self._lock:
+            merging = self._merge_thread is not None and self._merge_thread.is_alive()
+            if self._overlay_files < self.MERGE_EVERY or merging or self.building or not self.root:
+                return
+            self._merge_thread = threading.Thread(target=self._merge, daemon=True)
+            self._merge_thread.start()
+
+    def _merge(self):
+        with self._lock:
+            root = self.root
+            generation = self._generation
+            files = list(self._files)
+            base = (self._keys, self._starts, self._postings) if self._keys is not None else None
+            extra = {key: ids.tobytes() for key, ids in self._overlay.items()}
+        self._write_and_swap(root, files, base, extra, None, generation)
+
+    def _wait_merge(self):
+        thread = self._merge_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    # ---------- persistence ----------
+    def _cache_path(self, root: str) -> str:
+        digest = hashlib.sha1(root.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest}.trigram")
+
+    def _write_and_swap(self, root: str, files, base, extra: Dict[int, bytes],
+                        cancel: Optional[threading.Event], generation: Optional[int]) -> bool:
+        """
+        base(mmap 게시 목록) 와 extra 를 합쳐 새 색인 파일을 쓰고 교체한다.
+        generation 이 주어지면(추가분 합치기) 그 사이 색인이 바뀐 경우 버리고 다음 기회에 다시 한다.
+        빌드는 그 사이 저장된 파일을 교체 후 다시 반영하므로 그대로 덮는다.
+        """
+        path = self._cache_path(root)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write(tmp, root, files, base, extra)
+        except OSError as e:
+            print(f"검색 색인 저장 실패: {e}")
+            # 저장하지 못해도 이번 실행에서는 메모리 색인으로 검색
+            with self._lock:
+                if root == self.root and (cancel is None or not cancel.is_set()):
+                    self._swap_in_memory(files, base, extra)
+            return True
+        with self._lock:
+            stale = generation is not None and generation != self._generation
+            if root != self.root or (cancel is not None and cancel.is_set()) or stale:
+                os.remove(tmp)
+                return False
+            self._release()
+            os.replace(tmp, path)
+            self._load()
+        return True
+
+    def _write(self, path: str, root: str, files, base, extra: Dict[int, bytes]):
+        old_keys = base[0].tolist() if base is not None else []
+        old_pos = {key: i for i, key in enumerate(old_keys)}
+        keys = sorted(old_pos.keys() | extra.keys())
+        starts = array('I', [0])
+        total = 0
+        for key in keys:
+            i = old_pos.get(key)
+            if i is not None:
+                total += base[1][i + 1] - base[1][i]
+            e = extra.get(key)
+            if e:
+                total += len(e) // 4
+            starts.append(total)
+        key_array = array('I', keys)
+        keys_offset = _HEADER.size
+        starts_offset = keys_offset + 4 * len(keys)
+        postings_offset = starts_offset + 4 * len(starts)
+        meta_offset = postings_offset + 4 * total
+        meta = json.dumps({'root': root, 'byteorder': sys.byteorder, 'files': files}, ensure_ascii=False).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self.VERSION, len(files), len(keys), keys_offset, starts_offset, postings_offset, meta_offset))
+            f.write(key_array)
+            f.write(starts)
+            for key in keys:
+                i = old_pos.get(key)
+                if i is not None:
+                    f.write(base[2][base[1][i]:base[1][i + 1]])
+                e = extra.get(key)
+                if e:
+                    f.write(e)
+            f.write(meta)
+
+    def _load(self):
+        """저장된 색인을 mmap 으로 연다 (잠금 안에서 호출). 없거나 형식이 다르면 빈 상태로 둔다."""
+        path = self._cache_path(self.root)
+        try:
+            with open(path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+        try:
+            magic, version, n_files, n_keys, keys_offset, starts_offset, postings_offset, meta_offset = _HEADER.unpack_from(mm, 0)
+            if magic != _MAGIC or version != self.VERSION:
+                raise ValueError("version")
+            meta = json.loads(mm[meta_offset:].decode('utf-8'))
+            if meta.get('root') != self.root or meta.get('byteorder') != sys.byteorder:
+                raise ValueError("root")
+        except (struct.error, ValueError, UnicodeDecodeError):
+            mm.close()
+            return
+        view = memoryview(mm)
+        self._mm = mm
+        self._views = [view]
+        self._keys = view[keys_offset:starts_offset].cast('I')
+        self._starts = view[starts_offset:postings_offset].cast('I')
+        self._postings = view[postings_offset:meta_offset].cast('I')
+        self._views += [self._keys, self._starts, self._postings]
+        self._files = [tuple(entry) if entry is not None else None for entry in meta['files']]
+        self._ids = {entry[0]: file_id for file_id, entry in enumerate(self._files) if entry is not None}
+        self._base_files = len(self._files)
+        self._overlay = {}
+        self._overlay_files = 0
+        self._generation += 1
+
+    def _swap_in_memory(self, files, base, extra: Dict[int, bytes]):
+        """디스크에 쓰지 못했을 때: 지금 열린 색인은 그대로 두고 새로 색인한 것만 추가분 색인으로 둔다."""
+        if base is None:
+            # 전체를 새로 만든 경우 예전 게시 목록의 id 는 의미가 없다
+            self._release()
+            self._base_files = 0
+        self._files = list(files)
+        self._ids = {entry[0]: file_id for file_id, entry in enumerate(self._files) if entry is not None}
+        self._overlay = {}
+        for key, data in extra.items():
+            ids = self._overlay[key] = array('I')
+            ids.frombytes(data)
+        self._overlay_files = len(self._files) - self._base_files
+        self._generation += 1
+
+    def _release(self):
+        if self._mm is None:
+            return
+        # 내보낸 memoryview 를 먼저 풀어야 mmap 을 닫을 수 있다
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._keys = self._starts = self._postings = None
+        self._mm.close()
+        self._mm = None
+
+    # ---------- helpers ----------
+    def _rel(self, path: Optional[str]) -> Optional[str]:
+        if not path or not self.root:
+            return None
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        return None if rel.startswith('..') else rel
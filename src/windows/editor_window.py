@@ -1,67 +1,230 @@
 import os
-from PyQt5 import uic
-from PyQt5.QtWidgets import QMainWindow, QFileDialog, QMessageBox, QMenu, QInputDialog, QTreeWidgetItem
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QMainWindow, QFileDialog, QMessageBox, QMenu, QInputDialog, QTabBar, QSizePolicy, QDockWidget, QToolButton, QHBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QTimer, QEvent
+from PyQt5.QtGui import QTextCursor, QTextDocument
 from src.managers.file_manager import FileManager
+from src.managers.buffer_manager import BufferManager
 from src.managers.terminal_manager import TerminalManager
+from src.managers.shell_pool import ShellPool
 from src.managers.model_manager import ModelManager
 from src.managers.agent_manager import AgentManager
+from src.managers.agent_runner import AgentRunner
+from src.managers.agent_stream_parser import AgentStreamParser
+from src.managers.retrieval_index import RetrievalIndex
+from src.managers.text_search import TextSearch
+from src.windows.large_file_view import LargeFileView
+from src.windows.syntax_highlighter import SyntaxHighlighter
+from src.windows.quick_open import QuickOpenDialog
+from src.windows.find_panel import FindPanel
+from src.windows.terminal_renderer import TerminalSession
+from src.windows.ui_loader import load_form_class
 
-# Load UI file
-form_class = uic.loadUiType("./ui/editor.ui")[0]
+# Load UI file (실행 위치와 무관하게 저장소의 ui/ 에서, 컴파일해 캐시한 폼 클래스로)
+UI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'ui', 'editor.ui')
+form_class = load_form_class(UI_PATH)
 
 """에디터 메인 윈도우 클래스"""
 class EditorWindow(QMainWindow, form_class):
+    AUTOSAVE_DELAY_MS = 1500
+    TERMINAL_RESIZE_DELAY_MS = 100
+    SHELL_POOL_WARM_DELAY_MS = 1000
+
     def __init__(self):
         super().__init__()
         self.setupUi(self)
         
         # Manager 초기화
         self.file_manager = FileManager()
-        self.terminal_manager = TerminalManager()
-        self.model_manager = ModelManager()
-        self.agent_manager = AgentManager(self.model_manager)
+        self.buffer_manager = BufferManager(self.file_manager)
+        # 터미널 세션(탭)마다 TerminalManager 하나, 셸은 미리 띄워 둔 풀에서 받아 씀
+        self.shell_pool = ShellPool(parent=self)
+        self.terminal_sessions = []
+        # 모델/에이전트는 처음 쓸 때 만든다 (model_manager / agent_manager / agent_runner 프로퍼티)
+        self._model_manager = None
+        self._agent_manager = None
+        self._agent_runner = None
+        self.retrieval_index = RetrievalIndex()
+
+        # 진행 중 에이전트 요청: task_id -> 요청 당시 파일 경로
+        self._agent_tasks = {}
+        self._agent_display_task = 0
+        # 표시 중인 요청의 증분 파서와 코드 미리보기 상태
+        self._agent_parser = None
+        self._agent_desc_started = False
+        self._agent_preview_document = None
 
-        # 모델 콤보박스 초기화
-        self._populate_model_combobox()
+        # 모델 콤보박스 초기화 (ModelManager 생성이 첫 화면 표시를 늦추지 않도록 이벤트 루프가 돈 뒤)
+        QTimer.singleShot(0, self._populate_model_combobox)
         
         # global 상태 변수
         self.opened_folder_path = ""
-        self.opened_file_path = ""
-        self.opened_file_name = ""
+        # 에디터에 표시 중인 버퍼 (opened_file_path/opened_file_name 은 여기서 파생)
+        self._shown_buffer = None
+        # 탭이 없을 때 붙이는 빈 문서 (위젯 기본 문서는 setDocument 시 삭제되므로 따로 둠)
+        self._empty_document = QTextDocument(self)
+        # 자동 저장: 입력이 멈추고 AUTOSAVE_DELAY_MS 가 지나면 저장
+        self._autosave_timer = QTimer(self)
+        self._autosave_timer.setSingleShot(True)
+        self._autosave_timer.setInterval(self.AUTOSAVE_DELAY_MS)
+        # 진행 중인 저장이 자동 저장인지 (충돌 시 처리 방식이 다름)
+        self._autosave_paths = set()
+        # 대용량 파일 모드: code_input 대신 같은 자리에 읽기 전용 가상화 뷰 표시
+        self.large_view = LargeFileView(self.centralwidget)
+        self.large_view.setFont(self.code_input.font())
+        self.large_view.hide()
+        self.gridLayout_main.addWidget(self.large_view, 1, 1)
+        # 열린 파일 탭 (탭 데이터 = 파일 경로)
+        self.editor_tabs = QTabBar(self.titleArea_16)
+        self.editor_tabs.setTabsClosable(True)
+        self.editor_tabs.setMovable(True)
+        self.editor_tabs.setDocumentMode(True)
+        self.editor_tabs.setExpanding(False)
+        self.editor_tabs.setElideMode(Qt.ElideMiddle)
+        self.editor_tabs.setStyleSheet(
+            "QTabBar::tab { color: #aaa; padding: 2px 10px; border: none; }"
+            "QTabBar::tab:selected { color: white; background-color: #2a2a2e; }"
+        )
+        self.horizontalLayout.insertWidget(0, self.editor_tabs, 1)
+        self.filename_label.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        self._set_editor_document(self._empty_document)
+        # 빠른 열기 팝업 (Ctrl+P)
+        self.quick_open = QuickOpenDialog(self.file_manager.path_index, self)
+        # 프로젝트 전체 검색 패널 (Ctrl+Shift+F, 아래쪽 도크)
+        self.text_search = TextSearch(self.file_manager.search_index)
+        self.find_panel = FindPanel(self.text_search)
+        self.find_panel.overrides_provider = self._unsaved_texts
+        self.find_dock = QDockWidget("파일에서 찾기", self)
+        self.find_dock.setObjectName("find_dock")
+        self.find_dock.setWidget(self.find_panel)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.find_dock)
+        self.find_dock.hide()
+        # LLM 호출 요약 (상태 표시줄 오른쪽, 호출이 끝날 때마다 갱신)
+        self.llm_status_label = QLabel(self)
+        self.llm_status_label.setStyleSheet("color: #aaa; padding: 0 6px;")
+        self.statusbar.addPermanentWidget(self.llm_status_label)
         
         # Initialize UI
         self.filename_label.setText("Untitled")
-        self.file_list.clear()
+        self.file_list.setModel(self.file_manager.model)
         self.file_list.setContextMenuPolicy(Qt.CustomContextMenu)
 
         # Hotkeys
         self.actionOpen.setShortcut("Ctrl+O")
         self.actionSave.setShortcut("Ctrl+S")
+        self.actionQuickOpen.setShortcut("Ctrl+P")
+        self.actionFindInFiles.setShortcut("Ctrl+Shift+F")
         self.actionExit.setShortcut("Ctrl+Q")
         
-        # 터미널 초기 메시지
-        self.terminal_output.setPlainText("터미널이 준비되었습니다. 폴더를 열면 해당 디렉토리에서 시작됩니다.\n")
-        
+        # 터미널 탭 (탭 순서 = terminal_sessions 순서), 오른쪽 + 버튼으로 새 세션
+        self.terminal_tabs = QTabBar(self.widget)
+        self.terminal_tabs.setTabsClosable(True)
+        self.terminal_tabs.setDocumentMode(True)
+        self.terminal_tabs.setExpanding(False)
+        self.terminal_tabs.setStyleSheet(
+            "QTabBar::tab { color: #aaa; padding: 1px 10px; border: none; }"
+            "QTabBar::tab:selected { color: white; background-color: #2a2a2e; }"
+        )
+        self.new_terminal_button = QToolButton(self.widget)
+        self.new_terminal_button.setText("+")
+        self.new_terminal_button.setToolTip("새 터미널")
+        self.new_terminal_button.setAutoRaise(True)
+        terminal_tab_row = QHBoxLayout()
+        terminal_tab_row.setContentsMargins(0, 0, 0, 0)
+        terminal_tab_row.addWidget(self.terminal_tabs)
+        terminal_tab_row.addWidget(self.new_terminal_button)
+        terminal_tab_row.addStretch(1)
+        self.verticalLayout.insertLayout(0, terminal_tab_row)
+        # 첫 세션은 터미널이 처음 보이거나 쓰일 때 만든다 (_current_terminal)
+        # 터미널 화면 크기가 바뀌면 잠시 뒤 PTY 창 크기(행/열)도 맞춘다
+        self._terminal_resize_timer = QTimer(self)
+        self._terminal_resize_timer.setSingleShot(True)
+        self._terminal_resize_timer.setInterval(self.TERMINAL_RESIZE_DELAY_MS)
+        self._terminal_resize_timer.timeout.connect(self._sync_terminal_size)
+        self.terminal_output.viewport().installEventFilter(self)
+        # 입력 칸에서 Ctrl+C (선택한 글자가 없을 때) 는 실행 중인 명령 중단
+        self.terminal_input.installEventFilter(self)
         # 초기 상태: 폴더 열기 버튼 표시
         self.file_list_stack.setCurrentIndex(0)
         
         # Connect events
         self._connect_events()
-        # 터미널 출력 스트림 연결
-        self.terminal_manager.output_received.connect(self.append_terminal_output)
+        # 창이 뜬 뒤 여유 있을 때 셸 풀 채우기
+        self.shell_pool.warm(self.SHELL_POOL_WARM_DELAY_MS)
     
+    """창 종료 시 백그라운드 작업/터미널 정리"""
+    def closeEvent(self, event):
+        self.file_manager.saver.wait()
+        if not self._confirm_discard(self.buffer_manager.dirty_buffers()):
+            event.ignore()
+            return
+        if self._agent_runner is not None:
+            self._agent_runner.shutdown()
+        self.retrieval_index.cancel()
+        self.file_manager.path_index.cancel()
+        self.text_search.cancel()
+        self.file_manager.search_index.close()
+        self.large_view.clear()
+        self.buffer_manager.close_all()
+        if self._model_manager is not None:
+            self._model_manager.close()
+        for session in self.terminal_sessions:
+            session.manager.stop_terminal()
+        self.shell_pool.shutdown()
+        super().closeEvent(event)
+
+    """ModelManager (처음 접근할 때 생성)"""
+    @property
+    def model_manager(self) -> ModelManager:
+        if self._model_manager is None:
+            self._model_manager = ModelManager()
+            self._model_manager.telemetry.recorded.connect(self._on_llm_call_recorded)
+        return self._model_manager
+
+    """AgentManager (처음 접근할 때 생성)"""
+    @property
+    def agent_manager(self) -> AgentManager:
+        if self._agent_manager is None:
+            self._agent_manager = AgentManager(self.model_manager)
+            self._agent_manager.retriever = self.retrieval_index
+        return self._agent_manager
+
+    """AgentRunner (처음 접근할 때 생성하고 시그널 연결)"""
+    @property
+    def agent_runner(self) -> AgentRunner:
+        if self._agent_runner is None:
+            self._agent_runner = AgentRunner(self.agent_manager)
+            self._agent_runner.token_received.connect(self._on_agent_token)
+            self._agent_runner.task_finished.connect(self._on_agent_finished)
+            self._agent_runner.active_count_changed.connect(self._on_agent_active_changed)
+        return self._agent_runner
+
     """이벤트 연결"""
     def _connect_events(self):
         self.actionOpen.triggered.connect(self.open_folder)
-        self.actionSave.triggered.connect(self.save_file)
+        self.actionSave.triggered.connect(lambda: self.save_file())
         self.actionExit.triggered.connect(self.close)
-        self.file_list.itemClicked.connect(self.open_file)
+        self.actionQuickOpen.triggered.connect(self.quick_open.popup)
+        self.quick_open.file_selected.connect(self.open_path)
+        self.actionFindInFiles.triggered.connect(self.show_find_panel)
+        self.find_panel.location_activated.connect(self._go_to_location)
+        self.file_list.clicked.connect(self.open_file)
+        self.editor_tabs.currentChanged.connect(self._on_tab_changed)
+        self.editor_tabs.tabCloseRequested.connect(self.close_tab)
+        self.buffer_manager.dirty_changed.connect(self._on_buffer_dirty_changed)
+        self.buffer_manager.document_loaded.connect(self._on_document_loaded)
         self.file_list.customContextMenuRequested.connect(self.show_context_menu)
         self.terminal_input.returnPressed.connect(self.execute_terminal_command)
+        self.terminal_tabs.currentChanged.connect(self._on_terminal_tab_changed)
+        self.terminal_tabs.tabCloseRequested.connect(self.close_terminal_session)
+        self.new_terminal_button.clicked.connect(lambda: self.new_terminal_session())
         self.open_folder_button.clicked.connect(self.open_folder)
         self.agent_enterButton.clicked.connect(self.on_agent_generate)
+        self.agent_cancelButton.clicked.connect(self.on_agent_cancel)
+        self.retrieval_index.build_finished.connect(self._on_index_built)
+        self.file_manager.watcher.file_changed.connect(self._on_file_changed_on_disk)
+        self.file_manager.saver.save_finished.connect(self._on_save_finished)
+        self.code_input.textChanged.connect(self._on_code_changed)
+        self._autosave_timer.timeout.connect(self._on_autosave_timeout)
         self.modelName.currentTextChanged.connect(self._on_model_selected)
     
     """폴더 열기"""
@@ -75,58 +238,392 @@ class EditorWindow(QMainWindow, form_class):
             self.file_list_stack.setCurrentIndex(1)
             
             self.file_manager.load_folder_tree(self.file_list, folder_path)
+            # 에이전트 참고용 프로젝트 인덱스는 백그라운드에서 생성
+            self.retrieval_index.build(folder_path)
+            self.statusbar.showMessage("프로젝트 색인 중…")
             
-            # 터미널 디렉토리 설정
+            # 터미널 디렉토리 설정 (현재 터미널 탭의 셸을 새 폴더에서 다시 시작)
             self.terminal_manager.start_terminal(folder_path)
             self.append_terminal_output(f"\n작업 디렉토리: {folder_path}\n")
+            self._update_terminal_tab_titles()
         else:
             print("No folder selected")
     
-    """파일 열기"""
-    def open_file(self, item, column):
-        if item.parent() is None and not hasattr(self, 'opened_folder_path'):
+    """현재 탭의 파일 경로/이름 (열린 탭이 없으면 빈 문자열)"""
+    @property
+    def opened_file_path(self):
+        return self._shown_buffer.path if self._shown_buffer else ""
+
+    @property
+    def opened_file_name(self):
+        return self._shown_buffer.name if self._shown_buffer else ""
+
+    """파일 열기 (이미 열린 파일이면 해당 탭으로 전환만 함)"""
+    def open_file(self, index):
+        if not index.isValid() or not self.opened_folder_path:
             return
         
-        file_path = self.file_manager.get_file_path_from_item(item, self.opened_folder_path)
+        file_path = self.file_manager.get_file_path_from_item(index)
         
         if os.path.isfile(file_path):
-            content, error = self.file_manager.read_file(file_path)
-            
-            if error:
-                print(f"Error opening file: {error}")
-                self.code_input.setPlainText("")
-            else:
-                self.code_input.setPlainText(content)
-                self.opened_file_path = file_path
-                self.opened_file_name = os.path.basename(file_path)
-                self.filename_label.setText(self.opened_file_name)
-                print(f"Opened file: {file_path}")
+            self.open_path(file_path)
         else:
             print(f"Not a file: {file_path}")
+
+    def open_path(self, file_path):
+        if self.buffer_manager.get(file_path) is not None:
+            self._activate_path(file_path)
+            return
+
+        # 통째로 읽기 전에 바이너리/대용량 여부부터 확인
+        kind, info = self.file_manager.sniff_file(file_path)
+        if kind == 'binary':
+            self.statusbar.showMessage(f"바이너리 파일은 열 수 없습니다: {os.path.basename(file_path)}", 5000)
+            return
+        if kind == 'large':
+            self._open_large_file(file_path, info)
+            return
+        if kind is None:
+            print(f"Error opening file: {info}")
+            return
+
+        self._store_view_state()
+        buffer, error = self.buffer_manager.open(file_path)
+        if error:
+            print(f"Error opening file: {error}")
+            return
+        self.file_manager.watch_file(file_path)
+        self._add_tab(buffer)
+        print(f"Opened file: {file_path}")
+
+    """대용량 파일을 읽기 전용 가상화 뷰로 열기"""
+    def _open_large_file(self, file_path, size):
+        index, error = self.file_manager.open_large_file(file_path)
+        if error:
+            QMessageBox.critical(self, "오류", f"파일을 열 수 없습니다:\n{error}")
+            return
+        # 색인 스레드에서 오는 시그널이므로 메서드 슬롯으로 연결 (GUI 스레드에서 실행)
+        index.finished.connect(self._on_large_index_finished)
+        self._store_view_state()
+        buffer = self.buffer_manager.open_large(file_path, index)
+        self._add_tab(buffer)
+        self.statusbar.showMessage(f"대용량 파일 색인 중… ({size / (1024 * 1024):.1f} MB)")
+        print(f"Opened large file: {file_path}")
+
+    def _on_large_index_finished(self, lines):
+        buffer = self._shown_buffer
+        if buffer is not None and buffer.large_index is self.sender():
+            self.statusbar.showMessage(f"{buffer.name}: {lines:,}줄 (읽기 전용)")
+
+    """파일을 열고 line 줄 col 열부터 length 글자를 선택 (검색 결과로 이동)"""
+    def _go_to_location(self, path, line, col=0, length=0):
+        self.open_path(path)
+        buffer = self._shown_buffer
+        if buffer is None or buffer.path != path:
+            return
+        if buffer.large_index is not None:
+            self.large_view.go_to_line(line)
+            return
+        block = buffer.document.findBlockByNumber(line)
+        if not block.isValid():
+            return
+        cursor = QTextCursor(block)
+        cursor.setPosition(block.position() + min(col, block.length() - 1))
+        cursor.setPosition(block.position() + min(col + length, block.length() - 1), QTextCursor.KeepAnchor)
+        self.code_input.setTextCursor(cursor)
+        self.code_input.ensureCursorVisible()
+        self.code_input.setFocus()
+
+    """프로젝트 전체 검색 패널 표시 (에디터에서 한 줄을 선택 중이면 검색어로 채움)"""
+    def show_find_panel(self):
+        self.find_dock.show()
+        selected = self.code_input.textCursor().selectedText() if self.code_input.isVisible() else ""
+        self.find_panel.focus_query(selected if selected and '\u2029' not in selected else "")
+
+    """저장하지 않은 버퍼 내용 (검색이 디스크 대신 이 내용을 보도록)"""
+    def _unsaved_texts(self):
+        return {b.path: b.document.toPlainText() for b in self.buffer_manager.dirty_buffers() if b.document is not None}
+
+    """탭 추가 후 선택 (선택 변경으로 _show_buffer 가 호출됨)"""
+    def _add_tab(self, buffer):
+        index = self.editor_tabs.addTab(self._tab_title(buffer))
+        self.editor_tabs.setTabData(index, buffer.path)
+        self.editor_tabs.setTabToolTip(index, buffer.path)
+        if self.editor_tabs.currentIndex() == index:
+            self._show_buffer(buffer)
+        else:
+            self.editor_tabs.setCurrentIndex(index)
+
+    def _tab_index(self, path):
+        for i in range(self.editor_tabs.count()):
+            if self.editor_tabs.tabData(i) == path:
+                return i
+        return -1
+
+    @staticmethod
+    def _tab_title(buffer):
+        return f"● {buffer.name}" if buffer.dirty else buffer.name
+
+    def _on_tab_changed(self, index):
+        if index < 0:
+            self._show_buffer(None)
+            return
+        path = self.editor_tabs.tabData(index)
+        if path is None:
+            return  # addTab 도중 (경로를 붙이기 전) - _add_tab 에서 표시
+        if self._shown_buffer is None or self._shown_buffer.path != path:
+            self._activate_path(path)
+
+    """버퍼를 현재 버퍼로 만들고 표시 (메모리에 있으면 디스크 I/O 없음)"""
+    def _activate_path(self, path):
+        self._store_view_state()
+        buffer, error = self.buffer_manager.open(path)
+        if error:
+            QMessageBox.critical(self, "오류", f"파일을 열 수 없습니다:\n{error}")
+            return
+        index = self._tab_index(path)
+        if self.editor_tabs.currentIndex() != index:
+            self.editor_tabs.setCurrentIndex(index)  # _on_tab_changed 에서 다시 들어오지 않음
+        self._show_buffer(buffer)
+
+    """표시 중인 버퍼의 커서/스크롤 위치를 버퍼에 기록"""
+    def _store_view_state(self):
+        buffer = self._shown_buffer
+        if buffer is None:
+            return
+        if buffer.document is not None and self.code_input.document() is buffer.document:
+            buffer.cursor_position = self.code_input.textCursor().position()
+            buffer.scroll = self.code_input.verticalScrollBar().value()
+        elif buffer.large_index is not None and self.large_view.index is buffer.large_index:
+            buffer.scroll = self.large_view.verticalScrollBar().value()
+
+    """버퍼의 문서를 에디터에 붙임 (None 이면 빈 에디터)"""
+    def _show_buffer(self, buffer):
+        self._end_agent_preview()
+        if buffer is not self._shown_buffer:
+            self._store_view_state()
+        self._shown_buffer = buffer
+
+        if buffer is not None and buffer.large_index is not None:
+            if self.large_view.index is not buffer.large_index:
+                self.large_view.set_index(buffer.large_index)
+                self.large_view.go_to_line(buffer.scroll)
+            self.code_input.hide()
+            self.large_view.show()
+            self.filename_label.setText(f"{self._display_path(buffer)} (읽기 전용)")
+            if buffer.large_index.done:
+                self.statusbar.showMessage(f"{buffer.name}: {buffer.large_index.line_count:,}줄 (읽기 전용)")
+            return
+
+        self.large_view.clear()
+        self.large_view.hide()
+        self.code_input.show()
+        self._set_editor_document(buffer.document if buffer is not None else self._empty_document)
+        self.filename_label.setText(self._display_path(buffer) if buffer is not None else "Untitled")
+        if buffer is not None:
+            cursor = self.code_input.textCursor()
+            cursor.setPosition(min(buffer.cursor_position, buffer.document.characterCount() - 1))
+            self.code_input.setTextCursor(cursor)
+            self.code_input.verticalScrollBar().setValue(buffer.scroll)
+
+    def _display_path(self, buffer):
+        if self.opened_folder_path and buffer.path.startswith(self.opened_folder_path + os.sep):
+            return os.path.relpath(buffer.path, self.opened_folder_path)
+        return buffer.path
+
+    def _set_editor_document(self, document):
+        if self.code_input.document() is document:
+            return
+        tab_stop = self.code_input.tabStopWidth()
+        self.code_input.setDocument(document)
+        # setDocument 는 문서 기본 탭 간격을 쓰므로 위젯 설정을 다시 적용
+        self.code_input.setTabStopWidth(tab_stop)
+
+    """문서가 메모리에 올라올 때 언어별 하이라이터 부착 (문서와 수명이 같음)"""
+    def _on_document_loaded(self, buffer):
+        if SyntaxHighlighter.attach(buffer.document, buffer.path) is None and SyntaxHighlighter.language_for(buffer.path):
+            self.statusbar.showMessage(f"파일이 커서 구문 강조를 끕니다: {buffer.name}", 5000)
+
+    def _on_buffer_dirty_changed(self, path, dirty):
+        index = self._tab_index(path)
+        buffer = self.buffer_manager.get(path)
+        if index >= 0 and buffer is not None:
+            self.editor_tabs.setTabText(index, self._tab_title(buffer))
+
+    """탭 닫기 (수정된 파일이면 저장 여부 확인)"""
+    def close_tab(self, index):
+        path = self.editor_tabs.tabData(index)
+        buffer = self.buffer_manager.get(path)
+        if buffer is not None and buffer.dirty and not self._confirm_discard([buffer]):
+            return
+        self._close_buffer(path)
+
+    def _close_buffer(self, path):
+        buffer = self.buffer_manager.get(path)
+        if buffer is None:
+            return
+        if buffer is self._shown_buffer:
+            self._end_agent_preview()
+            self._shown_buffer = None
+            self.large_view.clear()
+            self._set_editor_document(self._empty_document)
+        self.file_manager.unwatch_file(path)
+        self.buffer_manager.close(path)
+        index = self._tab_index(path)
+        if index >= 0:
+            # 남은 탭으로 선택이 옮겨지며 _on_tab_changed 가 표시를 갱신
+            self.editor_tabs.removeTab(index)
+        if self.editor_tabs.count() == 0:
+            self._show_buffer(None)
+
+    """
+    수정된 버퍼들을 버려도 되는지 확인. 저장을 고르면 동기로 저장한다.
+    returns: 계속 진행해도 되면 True
+    """
+    def _confirm_discard(self, buffers):
+        if not buffers:
+            return True
+        names = "\n".join(b.path for b in buffers)
+        reply = QMessageBox.question(
+            self,
+            "저장하지 않은 변경 사항",
+            f"저장하지 않은 파일이 {len(buffers)}개 있습니다. 저장할까요?\n{names}",
+            QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
+            QMessageBox.Save
+        )
+        if reply == QMessageBox.Cancel:
+            return False
+        if reply == QMessageBox.Discard:
+            return True
+        for buffer in buffers:
+            success, error = self.file_manager.save_file(buffer.path, self.buffer_manager.text(buffer))
+            if not success:
+                QMessageBox.critical(self, "오류", f"파일 저장 실패:\n{buffer.path}\n{error}")
+                return False
+            self.buffer_manager.mark_saved(buffer)
+            self.retrieval_index.update_file(buffer.path)
+        return True
     
-    """파일 저장"""
-    def save_file(self):
-        if not self.opened_file_path or not os.path.isfile(self.opened_file_path):
+    """파일 저장 (워커 스레드에서 원자적으로 저장, 결과는 상태바에 표시)"""
+    def save_file(self, autosave=False, force=False):
+        buffer = self._shown_buffer
+        if buffer is None or not os.path.isfile(buffer.path):
             print("No file to save")
             return
-        
-        content = self.code_input.toPlainText()
-        success, error = self.file_manager.save_file(self.opened_file_path, content)
-        
-        if success:
-            QMessageBox.information(self, "저장 완료", f"파일이 저장되었습니다:\n{self.opened_file_path}")
-            print(f"File saved: {self.opened_file_path}")
+        if buffer.large_index is not None:
+            self.statusbar.showMessage("대용량 파일은 읽기 전용입니다.", 3000)
+            return
+        self._save_buffer(buffer, autosave, force)
+
+    def _save_buffer(self, buffer, autosave=False, force=False):
+        if buffer.document is None:
+            return  # 메모리에서 내려간 버퍼는 다시 열어서 저장
+        content = self.buffer_manager.text(buffer)
+        # 저장 요청 시점의 내용으로 저장하므로 이후 입력은 다시 수정 상태가 됨
+        self.buffer_manager.mark_saved(buffer)
+        if autosave:
+            self._autosave_paths.add(buffer.path)
         else:
-            print(f"Error saving file: {error}")
+            self._autosave_paths.discard(buffer.path)
+        self.file_manager.save_file_async(buffer.path, content, force=force)
+        self.statusbar.showMessage("저장 중…")
+
+    """저장 완료/실패 처리"""
+    def _on_save_finished(self, path, success, error, conflict):
+        autosave = path in self._autosave_paths
+        self._autosave_paths.discard(path)
+        buffer = self.buffer_manager.get(path)
+
+        if success:
+            self.retrieval_index.update_file(path)
+            label = "자동 저장됨" if autosave else "저장됨"
+            self.statusbar.showMessage(f"{label}: {os.path.basename(path)}", 3000)
+            print(f"File saved: {path}")
+            return
+
+        if buffer is not None:
+            self.buffer_manager.mark_dirty(buffer)
+        if conflict and buffer is not None and not autosave:
+            reply = QMessageBox.question(
+                self,
+                "저장 충돌",
+                f"마지막으로 불러온 뒤 디스크의 파일이 변경되었습니다.\n덮어쓸까요?\n{path}",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply == QMessageBox.Yes:
+                self._save_buffer(buffer, force=True)
+            else:
+                self.statusbar.showMessage("저장 취소됨: 디스크의 파일이 변경되었습니다.", 5000)
+            return
+        if conflict:
+            self.statusbar.showMessage(f"자동 저장 건너뜀 (디스크에서 변경됨): {os.path.basename(path)}", 5000)
+            return
+        self.statusbar.showMessage(f"저장 실패: {error}", 8000)
+        print(f"Error saving file: {error}")
+
+    """입력 시 자동 저장 타이머 재시작"""
+    def _on_code_changed(self):
+        if self.actionAutoSave.isChecked() and self.opened_file_path and not self.code_input.isReadOnly():
+            self._autosave_timer.start()
+
+    def _on_autosave_timeout(self):
+        # 메모리에 있는 수정된 버퍼 모두 저장 (미리보기 중인 버퍼는 제외)
+        for buffer in self.buffer_manager.dirty_buffers():
+            if buffer.document is None:
+                continue
+            if buffer is self._shown_buffer and self._agent_preview_document is not None:
+                continue
+            self._save_buffer(buffer, autosave=True)
     
+    """열린 파일이 외부(터미널, git 등)에서 바뀌었을 때 처리"""
+    def _on_file_changed_on_disk(self, path):
+        buffer = self.buffer_manager.get(path)
+        if buffer is None or buffer.large_index is not None:
+            return
+        if not os.path.isfile(path):
+            self.statusbar.showMessage(f"파일이 디스크에서 삭제되었습니다: {path}", 5000)
+            return
+        if self.file_manager.saver.is_saving(path) or not self.file_manager.changed_on_disk(path):
+            return  # 직접 저장한 변경
+        if buffer.document is None:
+            # 메모리에서 내려간 버퍼: 수정 안 된 것은 다음에 열 때 디스크에서 읽음
+            if buffer.dirty:
+                self.statusbar.showMessage(f"외부에서 변경됨 (저장하지 않은 변경 사항 있음): {buffer.name}", 5000)
+            return
+        if buffer.dirty:
+            reply = QMessageBox.question(
+                self,
+                "파일 변경됨",
+                f"파일이 외부에서 변경되었습니다. 다시 불러올까요?\n(저장하지 않은 변경 사항은 사라집니다)\n{path}",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+        content, error = self.file_manager.read_file(path)
+        if error:
+            return
+        # 커서/스크롤 위치를 유지한 채로 다시 불러오기
+        self._store_view_state()
+        buffer.document.setPlainText(content)
+        buffer.document.setModified(False)
+        buffer.cursor_position = min(buffer.cursor_position, len(content))
+        if buffer is self._shown_buffer and self._agent_preview_document is None:
+            cursor = self.code_input.textCursor()
+            cursor.setPosition(buffer.cursor_position)
+            self.code_input.setTextCursor(cursor)
+            self.code_input.verticalScrollBar().setValue(buffer.scroll)
+        self.statusbar.showMessage(f"외부 변경으로 다시 불러옴: {buffer.name}", 3000)
+
     """파일 리스트 우클릭 컨텍스트 메뉴 표시"""
     def show_context_menu(self, position):
-        item = self.file_list.itemAt(position)
-        if not item:
+        item = self.file_list.indexAt(position)
+        if not item.isValid():
             return
         
-        file_path = self.file_manager.get_file_path_from_item(item, self.opened_folder_path)
-        is_directory = os.path.isdir(file_path)
+        file_path = self.file_manager.get_file_path_from_item(item)
+        is_directory = self.file_manager.is_directory_item(item)
         
         menu = QMenu(self)
         
@@ -157,10 +654,7 @@ class EditorWindow(QMainWindow, form_class):
             success, error = self.file_manager.create_file(new_file_path)
             
             if success:
-                new_item = QTreeWidgetItem(folder_item)
-                new_item.setText(0, file_name)
-                new_item.setData(0, 1, file_name)
-                folder_item.setExpanded(True)
+                self.file_list.expand(self.file_manager.model.index_for_path(folder_path))
                 
                 QMessageBox.information(self, "성공", f"파일이 생성되었습니다:\n{new_file_path}")
                 print(f"File created: {new_file_path}")
@@ -181,10 +675,7 @@ class EditorWindow(QMainWindow, form_class):
             success, error = self.file_manager.create_folder(new_folder_path)
             
             if success:
-                new_item = QTreeWidgetItem(folder_item)
-                new_item.setText(0, f"📁 {folder_name}")
-                new_item.setData(0, 1, folder_name)
-                folder_item.setExpanded(True)
+                self.file_list.expand(self.file_manager.model.index_for_path(folder_path))
                 
                 QMessageBox.information(self, "성공", f"폴더가 생성되었습니다:\n{new_folder_path}")
                 print(f"Folder created: {new_folder_path}")
@@ -206,19 +697,10 @@ class EditorWindow(QMainWindow, form_class):
             success, error = self.file_manager.delete_item(item_path, is_directory)
             
             if success:
-                parent = item.parent()
-                if parent:
-                    parent.removeChild(item)
-                else:
-                    index = self.file_list.indexOfTopLevelItem(item)
-                    self.file_list.takeTopLevelItem(index)
-                
-                # 현재 열린 파일이 삭제된 경우 에디터 초기화
-                if self.opened_file_path == item_path:
-                    self.code_input.setPlainText("")
-                    self.filename_label.setText("Untitled")
-                    self.opened_file_path = ""
-                    self.opened_file_name = ""
+                # 삭제된 파일(폴더면 그 아래 파일)의 탭은 닫음
+                for buffer in self.buffer_manager.buffers():
+                    if buffer.path == item_path or buffer.path.startswith(item_path + os.sep):
+                        self._close_buffer(buffer.path)
                 
                 QMessageBox.information(self, "성공", f"{item_type}가 삭제되었습니다.")
                 print(f"Deleted: {item_path}")
@@ -250,10 +732,12 @@ class EditorWindow(QMainWindow, form_class):
             new_path = os.path.normpath(new_path)
             success, message = self.terminal_manager.change_directory(new_path)
             self.append_terminal_output(f"{message}\n")
+            self._update_terminal_tab_titles()
         
         # clear
         elif command.lower() in ["clear", "cls"]:
-            self.terminal_output.clear()
+            self.terminal_manager.clear_scrollback()
+            self._current_terminal().renderer.clear()
             self.append_terminal_output("터미널이 초기화되었습니다.\n")
         
         # else
@@ -263,15 +747,97 @@ class EditorWindow(QMainWindow, form_class):
             if not success and msg:
                 self.append_terminal_output(msg + "\n")
     
+    def eventFilter(self, obj, event):
+        if obj is self.terminal_input and event.type() == QEvent.KeyPress:
+            if event.key() == Qt.Key_C and event.modifiers() == Qt.ControlModifier \
+                    and not self.terminal_input.hasSelectedText():
+                self.terminal_manager.interrupt()
+                return True
+        elif obj is self.terminal_output.viewport() and event.type() == QEvent.Resize:
+            self._terminal_resize_timer.start()
+        elif obj is self.terminal_output.viewport() and event.type() == QEvent.Show and not self.terminal_sessions:
+            # 첫 화면 표시를 늦추지 않도록 이벤트 루프가 돈 뒤에 첫 세션 생성
+            QTimer.singleShot(0, self._current_terminal)
+        return super().eventFilter(obj, event)
+
+    """터미널 화면에 들어가는 행/열 수를 PTY 에 알림"""
+    def _sync_terminal_size(self):
+        viewport = self.terminal_output.viewport()
+        metrics = self.terminal_output.fontMetrics()
+        cols = viewport.width() // max(1, metrics.horizontalAdvance('M'))
+        rows = viewport.height() // max(1, metrics.lineSpacing())
+        for session in self.terminal_sessions:
+            session.manager.resize(rows, cols)
+
     """터미널 출력에 텍스트 추가"""
     def append_terminal_output(self, text):
-        self.terminal_output.moveCursor(QTextCursor.End)
-        self.terminal_output.insertPlainText(text)
-        self.terminal_output.moveCursor(QTextCursor.End)
+        self._current_terminal().renderer.append_plain(text)
+
+    """현재 터미널 탭의 세션 (아직 없으면 첫 세션을 만든다)"""
+    def _current_terminal(self):
+        if not self.terminal_sessions:
+            session = self._add_terminal_session()
+            session.renderer.append_plain("터미널이 준비되었습니다. 폴더를 열면 해당 디렉토리에서 시작됩니다.\n")
+            self._terminal_resize_timer.start()
+        return self.terminal_sessions[max(0, self.terminal_tabs.currentIndex())]
+
+    @property
+    def terminal_manager(self):
+        return self._current_terminal().manager
+
+    def _add_terminal_session(self):
+        manager = TerminalManager(pool=self.shell_pool)
+        if self.terminal_sessions:
+            manager.size = self.terminal_sessions[0].manager.size
+        session = TerminalSession(manager, self.terminal_output)
+        self.terminal_sessions.append(session)
+        self.terminal_tabs.addTab(session.title)
+        if len(self.terminal_sessions) == 1:
+            self.terminal_output.setDocument(session.document)
+        return session
+
+    """새 터미널 탭 (열린 폴더, 없으면 현재 탭의 디렉토리/홈에서 시작)"""
+    def new_terminal_session(self, working_directory=None):
+        directory = working_directory or self.opened_folder_path \
+            or (self.terminal_sessions and self.terminal_manager.get_current_directory()) or os.path.expanduser('~')
+        session = self._add_terminal_session()
+        session.manager.start_terminal(directory)
+        self.terminal_tabs.setCurrentIndex(len(self.terminal_sessions) - 1)
+        self._update_terminal_tab_titles()
+        self.terminal_input.setFocus()
+        return session
+
+    """터미널 탭 닫기 (마지막 탭이면 셸만 끄고 비움)"""
+    def close_terminal_session(self, index):
+        session = self.terminal_sessions[index]
+        if len(self.terminal_sessions) == 1:
+            session.manager.stop_terminal()
+            session.manager.clear_scrollback()
+            session.renderer.clear()
+            return
+        if self.terminal_output.document() is session.document:
+            other = self.terminal_sessions[index - 1 if index > 0 else 1]
+            self.terminal_output.setDocument(other.document)
+        del self.terminal_sessions[index]
+        self.terminal_tabs.removeTab(index)  # currentChanged 는 세션 목록을 줄인 뒤에
+        session.close()
+
+    def _on_terminal_tab_changed(self, index):
+        if 0 <= index < len(self.terminal_sessions):
+            session = self.terminal_sessions[index]
+            self.terminal_output.setDocument(session.document)
+            session.renderer.scroll_to_bottom()
+
+    def _update_terminal_tab_titles(self):
+        for i, session in enumerate(self.terminal_sessions):
+            self.terminal_tabs.setTabText(i, session.title)
+            self.terminal_tabs.setTabToolTip(i, session.manager.get_current_directory())
 
     """모델 콤보박스 초기화"""
     def _populate_model_combobox(self):
         """ModelManager에 등록된 모델들을 `modelName` 콤보박스에 채웁니다."""
+        # 채우는 동안의 선택 변경은 사용자 선택이 아님
+        self.modelName.blockSignals(True)
         try:
             self.modelName.clear()
             # 모델 alias 목록을 추가
@@ -287,6 +853,8 @@ class EditorWindow(QMainWindow, form_class):
         except Exception as e:
             # UI에 오류 출력
             self.append_terminal_output(f"모델 목록 로드 실패: {e}\n")
+        finally:
+            self.modelName.blockSignals(False)
 
     """모델 콤보박스 선택 변경 핸들러"""
     def _on_model_selected(self, alias: str):
@@ -296,15 +864,19 @@ class EditorWindow(QMainWindow, form_class):
         try:
             self.model_manager.set_default_model(alias)
             self.append_terminal_output(f"모델 선택: {alias}\n")
+            self._update_llm_status(alias)
         except Exception as e:
             QMessageBox.warning(self, "모델 선택 오류", str(e))
 
-    """에이전트 생성 실행"""
+    """에이전트 생성 실행 (백그라운드 스레드에서 실행)"""
     def on_agent_generate(self):
         # 파일이 열려 있어야 함
         if not self.opened_file_path:
             QMessageBox.warning(self, "에이전트", "먼저 파일을 열어주세요.")
             return
+        if self._shown_buffer.large_index is not None:
+            QMessageBox.warning(self, "에이전트", "대용량 파일(읽기 전용)에는 에이전트를 사용할 수 없습니다.")
+            return
 
         # 사용자 프롬프트와 현재 코드(수정 전/중)를 가져옴
         user_prompt = self.agent_promptEdit.toPlainText().strip()
@@ -314,32 +886,186 @@ class EditorWindow(QMainWindow, form_class):
         
         self.agent_promptEdit.clear()
 
+        # 이전 요청의 미리보기를 먼저 걷어내야 생성 중인 코드가 아닌 실제 버퍼 내용과 커서를 보낸다
+        self._end_agent_preview()
         current_code = self.code_input.toPlainText()
 
-        # 실행 중 표시
-        self.agent_enterButton.setEnabled(False)
-        self.agent_enterButton.setText("…")
+        # 실행 중 표시 (응답 창은 가장 최근 요청의 스트림을 보여줌)
+        cursor_line = self.code_input.textCursor().blockNumber()
+        task_id = self.agent_runner.submit(user_prompt, self.opened_file_path, current_code, cursor_line)
+        # 완료 시 버퍼가 그 사이 바뀌었는지 알 수 있도록 보낸 시점의 문서와 리비전을 함께 기록
+        document = self._shown_buffer.document
+        self._agent_tasks[task_id] = (self.opened_file_path, document, document.revision())
+        self._agent_display_task = task_id
+        self._agent_parser = AgentStreamParser()
+        self._agent_desc_started = False
         self.agent_resultEdit.setPlainText("LLM 호출 중입니다…")
-        try:
-            ok, raw, extracted_code, extracted_desc = self.agent_manager.run(user_prompt, self.opened_file_path, current_code)
-        finally:
-            self.agent_enterButton.setEnabled(True)
-            self.agent_enterButton.setText("✦")
+
+    """에이전트 요청 전체 취소"""
+    def on_agent_cancel(self):
+        if self._agent_runner is not None:
+            self._agent_runner.cancel_all()
+        self.statusbar.showMessage("에이전트 요청을 취소하는 중…", 3000)
+
+    """프로젝트 색인 완료 알림"""
+    def _on_index_built(self, file_count: int):
+        self.statusbar.showMessage(f"프로젝트 색인 완료: 파일 {file_count}개", 5000)
+
+    """진행 중 요청 수에 따라 버튼 상태 갱신"""
+    def _on_agent_active_changed(self, count: int):
+        self.agent_cancelButton.setEnabled(count > 0)
+        self.agent_enterButton.setText(f"✦ {count}" if count > 1 else "✦")
+        if count:
+            self.statusbar.showMessage(f"에이전트 요청 {count}개 진행 중")
+        else:
+            self.statusbar.clearMessage()
+
+    """LLM 호출 기록 수신 (텔레메트리, 워커 스레드에서 큐로 전달됨)"""
+    def _on_llm_call_recorded(self, entry: dict):
+        self._update_llm_status(entry.get('alias', ''))
+
+    """상태 표시줄에 모델의 최근 지연/TTFT/속도 요약, 툴팁에 모든 모델"""
+    def _update_llm_status(self, alias: str):
+        if self._model_manager is None:
+            return
+        telemetry = self._model_manager.telemetry
+        summary = telemetry.summary(alias)
+        if not summary['calls']:
+            self.llm_status_label.clear()
+            return
+        self.llm_status_label.setText(self._format_llm_summary(summary))
+        lines = [self._format_llm_summary(s) + f" · 오류 {s['errors']} · 재시도 {s['retries']}" for s in telemetry.summaries()]
+        if telemetry.log_path:
+            lines.append(f"로그: {telemetry.log_path}")
+        self.llm_status_label.setToolTip('\n'.join(lines))
+
+    @staticmethod
+    def _format_llm_summary(summary: dict) -> str:
+        def duration(ms):
+            if ms is None:
+                return "-"
+            return f"{ms / 1000:.1f}s" if ms >= 1000 else f"{ms:.0f}ms"
+
+        parts = [summary['alias']]
+        if summary['window']:
+            parts.append(f"지연 p50 {duration(summary['latency_p50_ms'])} / p95 {duration(summary['latency_p95_ms'])}")
+            if summary['ttft_p50_ms'] is not None:
+                parts.append(f"TTFT p50 {duration(summary['ttft_p50_ms'])}")
+            if summary['tokens_per_sec_p50']:
+                parts.append(f"{summary['tokens_per_sec_p50']:.0f} tok/s")
+        parts.append(f"{summary['calls']}회" + (f" (캐시 {summary['cache_hits']})" if summary['cache_hits'] else ""))
+        return " · ".join(parts)
+
+    """스트리밍 토큰 수신: 설명은 응답 창에, 코드는 에디터 미리보기에 바로 반영"""
+    def _on_agent_token(self, task_id: int, delta: str):
+        if task_id != self._agent_display_task or self._agent_parser is None:
+            return
+        for kind, fragment in self._agent_parser.feed(delta):
+            if kind == 'desc_reset':
+                self.agent_resultEdit.clear()
+            elif kind == 'desc':
+                if not self._agent_desc_started:
+                    self._agent_desc_started = True
+                    self.agent_resultEdit.clear()
+                self.agent_resultEdit.moveCursor(QTextCursor.End)
+                self.agent_resultEdit.insertPlainText(fragment)
+            elif kind in ('code', 'code_reset'):
+                self._agent_preview(task_id, kind, fragment)
+
+    """
+    생성 중인 코드를 에디터에 읽기 전용 미리보기로 표시.
+    버퍼 문서는 건드리지 않고 임시 문서를 잠시 붙이므로 되돌리기 기록이 유지된다.
+    """
+    def _agent_preview(self, task_id: int, kind: str, fragment: str):
+        # 요청한 파일이 지금 열린 파일일 때만 미리보기
+        task = self._agent_tasks.get(task_id)
+        if task is None or task[0] != self.opened_file_path:
+            return
+        if self._agent_preview_document is None:
+            self._store_view_state()
+            self._agent_preview_document = QTextDocument(self)
+            SyntaxHighlighter.attach(self._agent_preview_document, self.opened_file_path)
+            self._set_editor_document(self._agent_preview_document)
+            self.code_input.setReadOnly(True)
+        if kind == 'code_reset':
+            self._agent_preview_document.clear()
+            return
+        self.code_input.moveCursor(QTextCursor.End)
+        self.code_input.insertPlainText(fragment)
+
+    """미리보기 종료 (표시 중인 버퍼 문서를 다시 붙임)"""
+    def _end_agent_preview(self):
+        if self._agent_preview_document is None:
+            return
+        preview, self._agent_preview_document = self._agent_preview_document, None
+        self.code_input.setReadOnly(False)
+        buffer = self._shown_buffer
+        if buffer is not None and buffer.document is not None:
+            self._set_editor_document(buffer.document)
+            cursor = self.code_input.textCursor()
+            cursor.setPosition(min(buffer.cursor_position, buffer.document.characterCount() - 1))
+            self.code_input.setTextCursor(cursor)
+            self.code_input.verticalScrollBar().setValue(buffer.scroll)
+        else:
+            self._set_editor_document(self._empty_document)
+        preview.deleteLater()
+
+    """에이전트 요청 완료 처리"""
+    def _on_agent_finished(self, task_id: int, ok: bool, raw: str, extracted_code: str, extracted_desc: str):
+        file_path, document, revision = self._agent_tasks.pop(task_id, ("", None, None))
+        is_display = task_id == self._agent_display_task
+        if is_display:
+            self._agent_parser = None
+            # 미리보기를 걷어내고, 성공이면 아래에서 버퍼에 최종 코드를 반영
+            self._end_agent_preview()
 
         if not ok:
-            self.agent_resultEdit.setHtml(self._format_as_html(raw))
+            if self.agent_runner.is_cancelled(task_id) or raw == ModelManager.CANCELLED_MESSAGE:
+                if is_display:
+                    self.agent_resultEdit.setHtml(self._format_as_html(raw))
+                return
+            if is_display:
+                self.agent_resultEdit.setHtml(self._format_as_html(raw))
             QMessageBox.critical(self, "에이전트 오류", raw)
             return
 
-        # 설명 블록이 있으면 그걸 표시, 없으면 전체 응답 표시
-        if extracted_desc:
-            self.agent_resultEdit.setHtml(self._format_as_html(extracted_desc))
-        else:
-            self.agent_resultEdit.setHtml(self._format_as_html(raw))
+        # 요청한 파일의 탭이 닫혔거나 메모리에서 내려갔다면 코드를 덮어쓰지 않음
+        buffer = self.buffer_manager.get(file_path)
+        if buffer is None or buffer.document is None:
+            self.append_terminal_output(f"에이전트 응답이 도착했지만 해당 파일이 열려 있지 않아 적용하지 않았습니다: {file_path}\n")
+            return
+
+        # 설명 블록이 있으면 그걸 표시, 없으면 전체 응답 표시 (응답 창은 가장 최근 요청의 것만)
+        if is_display:
+            self.agent_resultEdit.setHtml(self._format_as_html(extracted_desc or raw))
 
-        # 포맷에 맞는 코드 추출 성공 시 코드 입력창에 반영
+        # 포맷에 맞는 코드 추출 성공 시 버퍼에 반영 (한 번의 되돌리기로 취소 가능)
         if extracted_code:
-            self.code_input.setPlainText(extracted_code)
+            # 요청 이후 버퍼가 바뀌었으면(직접 편집, 다른 요청 적용 등) 덮어쓰기 전에 확인
+            stale = buffer.document is not document or buffer.document.revision() != revision
+            # 보이지 않는 탭에 쓰는 경우도 같은 확인을 거친다 (어느 탭인지 함께 알림)
+            if stale:
+                # 적용하지 않더라도 코드를 옮겨 쓸 수 있도록 응답 창에는 코드를 포함한 전체 응답을 표시
+                self.agent_resultEdit.setHtml(self._format_as_html(raw))
+                target = "파일" if buffer is self._shown_buffer else f"다른 탭의 파일({buffer.name})"
+                reply = QMessageBox.question(
+                    self,
+                    "에이전트",
+                    f"요청을 보낸 뒤 {target}이 수정되었습니다.\n"
+                    "에이전트 응답을 적용하면 그 사이의 변경 내용이 덮어써집니다. 적용할까요?",
+                    QMessageBox.Yes | QMessageBox.No,
+                    QMessageBox.No
+                )
+                if reply != QMessageBox.Yes:
+                    self.statusbar.showMessage("에이전트 응답을 적용하지 않았습니다. 우측 응답을 확인해주세요.", 5000)
+                    return
+                if buffer.document is None:
+                    return
+            cursor = QTextCursor(buffer.document)
+            cursor.select(QTextCursor.Document)
+            cursor.insertText(extracted_code)
+            if buffer is not self._shown_buffer:
+                self.statusbar.showMessage(f"에이전트 응답을 다른 탭에 적용했습니다: {buffer.name}", 5000)
         else:
             # 추출 실패 시 안내 유지
             QMessageBox.information(self, "안내", "응답에서 수정된 코드를 추출하지 못했습니다. 우측 응답을 확인해주세요.")
@@ -0,0 +1,134 @@
+import os
+from PyQt5.QtWidgets import QWidget, QLineEdit, QToolButton, QLabel, QTreeWidget, QTreeWidgetItem, QHBoxLayout, QVBoxLayout
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+
+
+"""
+프로젝트 전체 검색(Find in Files) 패널.
+
+입력이 SEARCH_DELAY_MS 동안 멈추거나 Enter 를 누르면 TextSearch 로 검색하고,
+결과는 도착하는 대로 파일별로 묶어 트리에 붙인다. 결과 줄을 더블클릭/Enter 하면 location_activated 로 알린다.
+"""
+class FindPanel(QWidget):
+    location_activated = pyqtSignal(str, int, int, int)  # path, line, col, length
+
+    SEARCH_DELAY_MS = 300
+
+    def __init__(self, text_search, parent=None):
+        super().__init__(parent)
+        self.text_search = text_search
+        # 검색 때 편집 중인 버퍼 내용을 넘겨주는 콜백 (path -> text)
+        self.overrides_provider = None
+        self._search_id = 0
+        self._file_items = {}
+
+        self.setStyleSheet(
+            "QWidget { background-color: #19191c; color: #d4d4d4; }"
+            "QLineEdit { border: 1px solid #444; padding: 3px; }"
+            "QToolButton { border: 1px solid transparent; padding: 2px 6px; }"
+            "QToolButton:checked { border: 1px solid #007acc; background-color: #1e3a52; }"
+            "QTreeWidget { border: none; }"
+        )
+        self.query_input = QLineEdit(self)
+        self.query_input.setPlaceholderText("파일에서 찾기")
+        self.case_button = self._toggle("Aa", "대소문자 구분")
+        self.word_button = self._toggle("ab", "단어 단위")
+        self.regex_button = self._toggle(".*", "정규식")
+        self.status_label = QLabel(self)
+        self.results = QTreeWidget(self)
+        self.results.setHeaderHidden(True)
+        self.results.setUniformRowHeights(True)
+
+        row = QHBoxLayout()
+        row.setContentsMargins(0, 0, 0, 0)
+        row.addWidget(self.query_input, 1)
+        row.addWidget(self.case_button)
+        row.addWidget(self.word_button)
+        row.addWidget(self.regex_button)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        layout.setSpacing(4)
+        layout.addLayout(row)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.results, 1)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.start_search)
+        self.query_input.textChanged.connect(lambda _: self._search_timer.start())
+        self.query_input.returnPressed.connect(self.start_search)
+        for button in (self.case_button, self.word_button, self.regex_button):
+            button.toggled.connect(lambda _: self.start_search())
+        self.results.itemActivated.connect(self._on_item_activated)
+        self.text_search.results_found.connect(self._on_results)
+        self.text_search.search_finished.connect(self._on_finished)
+
+    def _toggle(self, text, tooltip):
+        button = QToolButton(self)
+        button.setText(text)
+        button.setToolTip(tooltip)
+        button.setCheckable(True)
+        return button
+
+    def focus_query(self, text=""):
+        if text:
+            self.query_input.setText(text)
+        self.query_input.setFocus()
+        self.query_input.selectAll()
+
+    def start_search(self):
+        self._search_timer.stop()
+        self.results.clear()
+        self._file_items = {}
+        query = self.query_input.text()
+        if not query:
+            self.text_search.cancel()
+            self._search_id = 0
+            self.status_label.setText("")
+            return
+        overrides = self.overrides_provider() if self.overrides_provider else None
+        search_id, error = self.text_search.search(
+            query,
+            regex=self.regex_button.isChecked(),
+            case_sensitive=self.case_button.isChecked(),
+            whole_word=self.word_button.isChecked(),
+            overrides=overrides,
+        )
+        self._search_id = search_id
+        if error:
+            self.status_label.setText(f"정규식 오류: {error}")
+        elif search_id:
+            self.status_label.setText("검색 중…")
+        else:
+            self.status_label.setText("폴더를 먼저 여세요")
+
+    def _on_results(self, search_id, batch):
+        if search_id != self._search_id:
+            return  # 이전 검색의 늦은 결과
+        root = self.text_search.index.root
+        self.results.setUpdatesEnabled(False)
+        for path, matches in batch:
+            item = QTreeWidgetItem(self.results, [f"{os.path.relpath(path, root)}  ({len(matches)})"])
+            item.setData(0, Qt.UserRole, (path, 0, 0, 0))
+            item.setToolTip(0, path)
+            for line, col, length, text in matches:
+                child = QTreeWidgetItem(item, [f"{line + 1}: {text.strip()}"])
+                child.setData(0, Qt.UserRole, (path, line, col, length))
+            # 처음 몇 파일만 펼쳐 둔다
+            if self.results.topLevelItemCount() <= 20:
+                item.setExpanded(True)
+        self.results.setUpdatesEnabled(True)
+
+    def _on_finished(self, search_id, files, matches, candidates, total, truncated, seconds):
+        if search_id != self._search_id:
+            return
+        text = f"{files}개 파일에서 {matches}개 일치 (후보 {candidates}/{total}개 파일, {seconds * 1000:.0f} ms)"
+        if truncated:
+            text += f" - 처음 {matches}개만 표시"
+        self.status_label.setText(text)
+
+    def _on_item_activated(self, item, column):
+        data = item.data(0, Qt.UserRole)
+        if data:
+            self.location_activated.emit(*data)
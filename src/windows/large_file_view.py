@@ -0,0 +1,91 @@
+from PyQt5.QtWidgets import QAbstractScrollArea
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QFontMetrics, QPainter
+
+
+"""
+대용량 파일용 읽기 전용 가상화 뷰.
+
+화면에 보이는 줄만 LargeFileIndex.get_lines 로 읽어 그린다. 메모리 사용량은 파일 크기가 아니라
+창 높이에 비례하며, 스크롤바 범위는 색인이 진행되는 동안 계속 늘어난다.
+"""
+class LargeFileView(QAbstractScrollArea):
+    GUTTER_PADDING = 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = None
+        self._max_width = 0
+        self.setStyleSheet("background-color: #19191c; color: #d4d4d4; border: 1px solid #666;")
+        self.viewport().setCursor(Qt.IBeamCursor)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+
+    def set_index(self, index):
+        if self.index is not None:
+            # 탭 전환으로 여러 번 붙었다 떨어지므로 이전 색인의 연결은 끊는다
+            self.index.progress.disconnect(self._update_scrollbars)
+            self.index.finished.disconnect(self._update_scrollbars)
+        self.index = index
+        self._max_width = 0
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        if index is not None:
+            index.progress.connect(self._update_scrollbars)
+            index.finished.connect(self._update_scrollbars)
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def clear(self):
+        self.set_index(None)
+
+    def go_to_line(self, line: int):
+        self.verticalScrollBar().setValue(max(0, line))
+
+    def _visible_lines(self) -> int:
+        return max(1, self.viewport().height() // QFontMetrics(self.font()).lineSpacing())
+
+    def _update_scrollbars(self, *args):
+        total = self.index.line_count if self.index is not None else 0
+        visible = self._visible_lines()
+        bar = self.verticalScrollBar()
+        bar.setRange(0, max(0, total - visible + 1))
+        bar.setPageStep(visible)
+        hbar = self.horizontalScrollBar()
+        hbar.setRange(0, max(0, self._max_width - self.viewport().width()))
+        hbar.setPageStep(self.viewport().width())
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        if self.index is None:
+            return
+        metrics = QFontMetrics(self.font())
+        line_height = metrics.lineSpacing()
+        first = self.verticalScrollBar().value()
+        lines = self.index.get_lines(first, self._visible_lines() + 1)
+
+        gutter = metrics.horizontalAdvance(str(max(1, self.index.line_count))) + self.GUTTER_PADDING * 2
+        x_offset = gutter - self.horizontalScrollBar().value()
+        widest = self._max_width
+        y = metrics.ascent()
+        for i, text in enumerate(lines):
+            painter.setPen(QColor('#858585'))
+            painter.drawText(self.GUTTER_PADDING, y, str(first + i + 1))
+            painter.setPen(QColor('#d4d4d4'))
+            painter.setClipRect(gutter, 0, self.viewport().width() - gutter, self.viewport().height())
+            painter.drawText(x_offset, y, text.expandtabs(4))
+            painter.setClipping(False)
+            widest = max(widest, gutter + metrics.horizontalAdvance(text))
+            y += line_height
+        if widest > self._max_width:
+            # 지금까지 본 가장 긴 줄 기준으로 가로 스크롤 범위 확장
+            self._max_width = widest
+            self.horizontalScrollBar().setRange(0, max(0, widest - self.viewport().width()))
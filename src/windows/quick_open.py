@@ -0,0 +1,104 @@
+import os
+from PyQt5.QtWidgets import QDialog, QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal
+
+
+"""
+빠른 열기(Ctrl+P) 팝업.
+
+입력할 때마다 PathIndex.search 로 상위 RESULT_LIMIT 개를 다시 그린다. 위/아래로 고르고
+Enter 로 열며, Esc 나 바깥 클릭으로 닫힌다. 색인이 아직 만들어지는 중이면 끝날 때 다시 검색한다.
+"""
+class QuickOpenDialog(QDialog):
+    file_selected = pyqtSignal(str)  # 절대 경로
+
+    RESULT_LIMIT = 50
+
+    def __init__(self, path_index, parent=None):
+        super().__init__(parent, Qt.Popup)
+        self.path_index = path_index
+        self.setStyleSheet(
+            "QDialog { background-color: #252528; border: 1px solid #555; }"
+            "QLineEdit { background-color: #19191c; color: white; border: 1px solid #444; padding: 4px; }"
+            "QListWidget { background-color: #252528; color: #d4d4d4; border: none; }"
+            "QListWidget::item:selected { background-color: #094771; color: white; }"
+        )
+        self.query_input = QLineEdit(self)
+        self.query_input.setPlaceholderText("파일 이름으로 이동")
+        self.results = QListWidget(self)
+        self.results.setUniformItemSizes(True)
+        self.results.setFocusPolicy(Qt.NoFocus)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        layout.setSpacing(4)
+        layout.addWidget(self.query_input)
+        layout.addWidget(self.results)
+
+        self.query_input.textChanged.connect(self._update_results)
+        self.query_input.installEventFilter(self)
+        self.results.itemActivated.connect(self._open_item)
+        self.path_index.build_finished.connect(self._on_index_built)
+
+    def popup(self):
+        """부모 창 위쪽 가운데에 띄우고 이전 검색어를 선택해 둔다."""
+        parent = self.parentWidget()
+        if parent is not None:
+            width = min(640, max(320, parent.width() // 2))
+            self.resize(width, 360)
+            top_left = parent.mapToGlobal(parent.rect().topLeft())
+            self.move(top_left.x() + (parent.width() - width) // 2, top_left.y() + 40)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.query_input.setFocus()
+        self.query_input.selectAll()
+        self._update_results()
+
+    def eventFilter(self, obj, event):
+        if obj is self.query_input and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up, Qt.Key_PageDown, Qt.Key_PageUp):
+                step = {Qt.Key_Down: 1, Qt.Key_Up: -1, Qt.Key_PageDown: 10, Qt.Key_PageUp: -10}[key]
+                count = self.results.count()
+                if count:
+                    row = min(max(self.results.currentRow() + step, 0), count - 1)
+                    self.results.setCurrentRow(row)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                self._open_item(self.results.currentItem())
+                return True
+            if key == Qt.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(obj, event)
+
+    def _update_results(self, *args):
+        query = self.query_input.text()
+        self.results.clear()
+        if not self.path_index.root:
+            item = QListWidgetItem("파일 목록을 만드는 중…" if self.path_index.building else "폴더를 먼저 여세요")
+            item.setFlags(Qt.NoItemFlags)
+            self.results.addItem(item)
+            return
+        root = self.path_index.root
+        for rel in self.path_index.search(query, self.RESULT_LIMIT):
+            rel_dir, name = os.path.split(rel)
+            item = QListWidgetItem(f"{name}    {rel_dir}" if rel_dir else name)
+            item.setData(Qt.UserRole, os.path.join(root, rel))
+            item.setToolTip(rel)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def _open_item(self, item):
+        if item is None:
+            return
+        path = item.data(Qt.UserRole)
+        if not path:
+            return
+        self.hide()
+        self.file_selected.emit(path)
+
+    def _on_index_built(self, count):
+        if self.isVisible():
+            self._update_results()
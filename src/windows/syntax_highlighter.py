@@ -0,0 +1,259 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QTextDocument
+from src.managers.languages import language_for
+
+
+def _words(*words: str) -> str:
+    return r'\b(?:' + '|'.join(words) + r')\b'
+
+
+_NUMBER = r'\b(?:0[xX][0-9a-fA-F_]+|0[bB][01_]+|\d[\d_]*(?:\.\d*)?(?:[eE][+-]?\d+)?)[jJlLuUfF]*\b'
+_DQ_STRING = r'"(?:[^"\\\n]|\\.)*"?'
+_SQ_STRING = r"'(?:[^'\\\n]|\\.)*'?"
+# 식별자 끝 글자가 접두사로 잡히지 않도록 (buf"x" 의 uf)
+_PY_PREFIX = r'(?:(?<!\w)(?i:[rbuf]{1,2}))?'
+_C_KEYWORDS = ('if', 'else', 'for', 'while', 'do', 'switch', 'case', 'default', 'break', 'continue', 'return',
+               'goto', 'sizeof', 'typedef', 'struct', 'union', 'enum', 'static', 'const', 'extern', 'volatile',
+               'inline', 'void', 'char', 'short', 'int', 'long', 'float', 'double', 'signed', 'unsigned', 'bool',
+               'true', 'false', 'NULL')
+_JS_KEYWORDS = ('if', 'else', 'for', 'while', 'do', 'switch', 'case', 'default', 'break', 'continue', 'return',
+                'function', 'var', 'let', 'const', 'new', 'delete', 'typeof', 'instanceof', 'in', 'of', 'class',
+                'extends', 'super', 'this', 'import', 'export', 'from', 'as', 'async', 'await', 'yield', 'try',
+                'catch', 'finally', 'throw', 'null', 'undefined', 'true', 'false', 'void', 'static', 'get', 'set')
+
+"""
+언어별 규칙: (토큰 종류, 정규식) 목록과 여러 줄에 걸치는 구간 (종류, 시작, 끝) 목록.
+규칙은 하나의 정규식으로 합쳐서 한 줄을 한 번만 훑는다. 가장 왼쪽 토큰이 이기므로
+문자열 안의 주석 기호 등은 자연스럽게 무시된다.
+"""
+_LANGUAGES: Dict[str, Tuple[List[Tuple[str, str]], List[Tuple[str, str, str]]]] = {
+    'python': ([
+        ('comment', r'#.*'),
+        ('string', _PY_PREFIX + _DQ_STRING),
+        ('string', _PY_PREFIX + _SQ_STRING),
+        ('decorator', r'@[\w.]+'),
+        ('definition', r'(?<=\bdef )\w+|(?<=\bclass )\w+'),
+        ('keyword', _words('and', 'as', 'assert', 'async', 'await', 'break', 'class', 'continue', 'def', 'del',
+                           'elif', 'else', 'except', 'finally', 'for', 'from', 'global', 'if', 'import', 'in', 'is',
+                           'lambda', 'nonlocal', 'not', 'or', 'pass', 'raise', 'return', 'try', 'while', 'with',
+                           'yield', 'None', 'True', 'False', 'match', 'case')),
+        ('builtin', r'(?<!\.)' + _words('self', 'cls', 'print', 'len', 'range', 'str', 'int', 'float', 'bool', 'list', 'dict',
+                           'set', 'tuple', 'object', 'type', 'isinstance', 'super', 'open', 'enumerate', 'zip',
+                           'min', 'max', 'sum', 'sorted', 'any', 'all', 'map', 'filter', 'Exception')),
+        ('number', _NUMBER),
+    ], [
+        ('string', _PY_PREFIX + r'"""', r'"""'),
+        ('string', _PY_PREFIX + r"'''", r"'''"),
+    ]),
+    'javascript': ([
+        ('comment', r'//.*'),
+        ('string', _DQ_STRING),
+        ('string', _SQ_STRING),
+        ('definition', r'(?<=\bfunction )\w+|(?<=\bclass )\w+'),
+        ('keyword', _words(*_JS_KEYWORDS)),
+        ('number', _NUMBER),
+    ], [
+        ('comment', r'/\*', r'\*/'),
+        ('string', r'`', r'(?<!\\)`'),
+    ]),
+    'c': ([
+        ('comment', r'//.*'),
+        ('string', _DQ_STRING),
+        ('string', _SQ_STRING),
+        ('decorator', r'^\s*#\s*\w+'),
+        ('keyword', _words(*_C_KEYWORDS)),
+        ('number', _NUMBER),
+    ], [
+        ('comment', r'/\*', r'\*/'),
+    ]),
+    'json': ([
+        ('definition', r'"(?:[^"\\\n]|\\.)*"(?=\s*:)'),
+        ('string', _DQ_STRING),
+        ('keyword', _words('true', 'false', 'null')),
+        ('number', r'-?' + _NUMBER),
+    ], []),
+    'markdown': ([
+        ('keyword', r'^#{1,6}\s.*'),
+        ('string', r'`[^`\n]+`'),
+        ('definition', r'\*\*[^*\n]+\*\*|__[^_\n]+__'),
+        ('builtin', r'\[[^\]\n]*\]\([^)\n]*\)'),
+        ('comment', r'^\s*>.*'),
+    ], [
+        ('string', r'^\s*```', r'^\s*```\s*$'),
+    ]),
+    'html': ([
+        ('keyword', r'</?[\w:-]+|/?>'),
+        ('builtin', r'\b[\w:-]+(?==)'),
+        ('string', _DQ_STRING),
+        ('string', _SQ_STRING),
+        ('number', r'&\w+;'),
+    ], [
+        ('comment', r'<!--', r'-->'),
+    ]),
+    'css': ([
+        ('string', _DQ_STRING),
+        ('string', _SQ_STRING),
+        ('builtin', r'[\w-]+(?=\s*:)'),
+        ('definition', r'[.#][\w-]+'),
+        ('keyword', r'@[\w-]+|!important'),
+        ('number', r'-?\d+(?:\.\d+)?(?:px|em|rem|%|s|ms|vh|vw|pt)?\b|#[0-9a-fA-F]{3,8}\b'),
+    ], [
+        ('comment', r'/\*', r'\*/'),
+    ]),
+}
+_LANGUAGES['typescript'] = (
+    [(kind, _words(*_JS_KEYWORDS, 'interface', 'type', 'enum', 'implements', 'private', 'public', 'protected',
+                   'readonly', 'declare', 'namespace', 'abstract', 'keyof', 'any', 'unknown', 'never',
+                   'string', 'number', 'boolean')) if kind == 'keyword' else (kind, rx)
+     for kind, rx in _LANGUAGES['javascript'][0]],
+    _LANGUAGES['javascript'][1],
+)
+_LANGUAGES['cpp'] = (
+    [(kind, _words(*_C_KEYWORDS, 'class', 'namespace', 'template', 'typename', 'public', 'private', 'protected',
+                   'virtual', 'override', 'new', 'delete', 'this', 'using', 'auto', 'nullptr', 'constexpr',
+                   'try', 'catch', 'throw', 'operator', 'friend', 'explicit', 'noexcept', 'std')) if kind == 'keyword' else (kind, rx)
+     for kind, rx in _LANGUAGES['c'][0]],
+    _LANGUAGES['c'][1],
+)
+_LANGUAGES['java'] = (
+    [('comment', r'//.*'), ('string', _DQ_STRING), ('string', _SQ_STRING), ('decorator', r'@\w+'),
+     ('definition', r'(?<=\bclass )\w+|(?<=\binterface )\w+'),
+     ('keyword', _words('abstract', 'assert', 'boolean', 'break', 'byte', 'case', 'catch', 'char', 'class', 'const',
+                        'continue', 'default', 'do', 'double', 'else', 'enum', 'extends', 'final', 'finally', 'float',
+                        'for', 'if', 'implements', 'import', 'instanceof', 'int', 'interface', 'long', 'new',
+                        'package', 'private', 'protected', 'public', 'return', 'short', 'static', 'super', 'switch',
+                        'synchronized', 'this', 'throw', 'throws', 'try', 'void', 'volatile', 'while', 'var',
+                        'record', 'true', 'false', 'null')),
+     ('number', _NUMBER)],
+    [('comment', r'/\*', r'\*/')],
+)
+
+_COLORS = {
+    'keyword': ('#569cd6', False),
+    'builtin': ('#4ec9b0', False),
+    'definition': ('#dcdcaa', False),
+    'decorator': ('#c586c0', False),
+    'string': ('#ce9178', False),
+    'number': ('#b5cea8', False),
+    'comment': ('#6a9955', True),
+}
+
+
+"""언어별로 한 번만 컴파일한 규칙 (토큰 정규식, 여러 줄 구간 종료 정규식, 그룹 이름 -> 종류)"""
+class _CompiledLanguage:
+    _cache: Dict[str, '_CompiledLanguage'] = {}
+
+    def __init__(self, rules: List[Tuple[str, str]], spans: List[Tuple[str, str, str]]):
+        parts = []
+        self.kinds: Dict[str, str] = {}
+        # 구간 시작이 같은 위치의 한 줄짜리 규칙보다 먼저 시도되도록 앞에 둔다 (''' 가 '' 로 잘리지 않게)
+        for i, (kind, start, _) in enumerate(spans):
+            parts.append(f'(?P<s{i}>{start})')
+        for i, (kind, rx) in enumerate(rules):
+            parts.append(f'(?P<r{i}>{rx})')
+            self.kinds[f'r{i}'] = kind
+        self.pattern = re.compile('|'.join(parts), re.MULTILINE)
+        # 블록 상태 1..n = n 번째 구간 안에 있음
+        self.span_ends = [re.compile(end, re.MULTILINE) for _, _, end in spans]
+        self.span_kinds = [kind for kind, _, _ in spans]
+
+    @classmethod
+    def get(cls, language: str) -> Optional['_CompiledLanguage']:
+        compiled = cls._cache.get(language)
+        if compiled is None and language in _LANGUAGES:
+            compiled = cls._cache[language] = cls(*_LANGUAGES[language])
+        return compiled
+
+
+"""
+규칙 기반 증분 하이라이터.
+
+블록(줄)마다 여러 줄 구간 안에 있는지를 상태로 남기므로, 편집하면 QSyntaxHighlighter 가
+바뀐 블록부터 상태가 이전과 같아질 때까지만 다시 칠한다. 문서가 MAX_BLOCKS 줄이나
+MAX_CHARS 자를 넘으면 붙이지 않는다.
+"""
+class SyntaxHighlighter(QSyntaxHighlighter):
+    MAX_BLOCKS = 50_000
+    MAX_CHARS = 4 * 1024 * 1024
+
+    _formats: Dict[str, QTextCharFormat] = {}
+
+    def __init__(self, document: QTextDocument, language: str):
+        self.language = _CompiledLanguage.get(language)
+        if not self._formats:
+            for kind, (color, italic) in _COLORS.items():
+                fmt = QTextCharFormat()
+                fmt.setForeground(QColor(color))
+                if italic:
+                    fmt.setFontItalic(True)
+                if kind == 'definition':
+                    fmt.setFontWeight(QFont.Bold)
+                SyntaxHighlighter._formats[kind] = fmt
+        # 부모가 문서이므로 문서와 함께 정리됨
+        super().__init__(document)
+
+    @classmethod
+    def language_for(cls, file_path: str) -> str:
+        return language_for(os.path.basename(file_path))
+
+    @classmethod
+    def attach(cls, document: QTextDocument, file_path: str) -> Optional['SyntaxHighlighter']:
+        """지원하는 언어이고 너무 크지 않으면 하이라이터를 붙인다."""
+        language = cls.language_for(file_path)
+        if _CompiledLanguage.get(language) is None:
+            return None
+        if document.blockCount() > cls.MAX_BLOCKS or document.characterCount() > cls.MAX_CHARS:
+            return None
+        highlighter = cls(document, language)
+        # 첫 전체 하이라이트는 다음 이벤트 루프로 예약되는데, 그때 문서에 레이아웃이 있으면(에디터에 붙어 있으면)
+        # 블록마다 레이아웃이 갱신되어 수천 줄에서 몇 초가 걸린다. 레이아웃이 없을 때 직접 rehighlight() 하고
+        # (예약된 것은 취소됨), 이어서 레이아웃을 만들어 두어 에디터에 붙일 때 전체 재하이라이트가 생기지 않게 한다
+        highlighter.rehighlight()
+        blocked = document.blockSignals(True)
+        document.documentLayout()
+        document.blockSignals(blocked)
+        return highlighter
+
+    def highlightBlock(self, text: str):
+        lang = self.language
+        formats = self._formats
+        pos = 0
+        length = len(text)
+
+        state = self.previousBlockState()
+        if state > 0:
+            # 이전 줄에서 이어지는 여러 줄 구간
+            fmt = formats[lang.span_kinds[state - 1]]
+            end = lang.span_ends[state - 1].search(text)
+            if end is None:
+                self.setFormat(0, length, fmt)
+                self.setCurrentBlockState(state)
+                return
+            self.setFormat(0, end.end(), fmt)
+            pos = end.end()
+        self.setCurrentBlockState(0)
+
+        search = lang.pattern.search
+        kinds = lang.kinds
+        while pos < length:
+            m = search(text, pos)
+            if m is None:
+                break
+            group = m.lastgroup
+            start = m.start()
+            if group[0] == 's':
+                # 여러 줄 구간 시작: 같은 줄에서 끝나지 않으면 다음 블록으로 상태를 넘김
+                index = int(group[1:])
+                fmt = formats[lang.span_kinds[index]]
+                end = lang.span_ends[index].search(text, m.end())
+                if end is None:
+                    self.setFormat(start, length - start, fmt)
+                    self.setCurrentBlockState(index + 1)
+                    return
+                self.setFormat(start, end.end() - start, fmt)
+                pos = end.end()
+                continue
+            self.setFormat(start, m.end() - start, formats[kinds[group]])
+            pos = m.end() if m.end() > start else start + 1
@@ -0,0 +1,138 @@
+import os
+from PyQt5.QtGui import QColor, QFont, QTextCharFormat, QTextCursor, QTextDocument
+from PyQt5.QtWidgets import QPlainTextDocumentLayout
+
+
+# VS Code 다크 테마 터미널의 16색
+_ANSI_COLORS = [
+    '#000000', '#cd3131', '#0dbc79', '#e5e510', '#2472c8', '#bc3fbc', '#11a8cd', '#e5e5e5',
+    '#666666', '#f14c4c', '#23d18b', '#f5f543', '#3b8eea', '#d670d6', '#29b8db', '#e5e5e5',
+]
+_DEFAULT_FG = '#cccccc'
+_DEFAULT_BG = '#1e1e1e'
+
+
+def _color(value, default: str) -> QColor:
+    """AnsiParser 의 색 값(None / 0~255 / (r, g, b))을 QColor 로."""
+    if value is None:
+        return QColor(default)
+    if isinstance(value, tuple):
+        return QColor(*value)
+    if value < 16:
+        return QColor(_ANSI_COLORS[value])
+    if value < 232:
+        # 6x6x6 색 큐브
+        value -= 16
+        steps = (0, 95, 135, 175, 215, 255)
+        return QColor(steps[value // 36], steps[value // 6 % 6], steps[value % 6])
+    level = 8 + (value - 232) * 10
+    return QColor(level, level, level)
+
+
+"""
+AnsiParser 가 만든 스팬을 터미널 문서(QPlainTextEdit 용 QTextDocument)에 그린다.
+
+render 한 번에 편집 블록 하나로: 지난번에 그린 현재 줄(문서의 마지막 블록)을 지우고,
+확정된 스팬과 새 현재 줄을 이어 붙인다. 스타일별 QTextCharFormat 은 캐시해 둔다.
+문서가 view 에 붙어 있고 맨 아래를 보고 있을 때만 스크롤을 따라 내린다.
+"""
+class TerminalRenderer:
+    def __init__(self, view, document=None):
+        self.view = view
+        self.document = document if document is not None else view.document()
+        self._formats = {None: QTextCharFormat()}
+        # 문서의 마지막 블록이 파서의 현재 줄인지 (그 사이 다른 텍스트가 붙으면 False)
+        self._live = False
+
+    def render(self, spans, line):
+        follow = self._at_bottom()
+        cursor = QTextCursor(self.document)
+        cursor.beginEditBlock()
+        cursor.movePosition(QTextCursor.End)
+        if self._live:
+            cursor.movePosition(QTextCursor.StartOfBlock, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        for text, style in spans:
+            cursor.insertText(text, self._format(style))
+        for text, style in line:
+            cursor.insertText(text, self._format(style))
+        cursor.endEditBlock()
+        self._live = True
+        if follow:
+            self.scroll_to_bottom()
+
+    def append_plain(self, text: str):
+        """터미널 출력이 아닌 안내 문구 등을 기본 스타일로 덧붙인다."""
+        follow = self._at_bottom()
+        cursor = QTextCursor(self.document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text, self._formats[None])
+        self._live = False
+        if follow:
+            self.scroll_to_bottom()
+
+    def clear(self):
+        self.document.clear()
+        self._live = False
+
+    def scroll_to_bottom(self):
+        if self.view.document() is self.document:
+            bar = self.view.verticalScrollBar()
+            bar.setValue(bar.maximum())
+
+    def _at_bottom(self) -> bool:
+        if self.view.document() is not self.document:
+            return False
+        bar = self.view.verticalScrollBar()
+        return bar.value() >= bar.maximum()
+
+    def _format(self, style) -> QTextCharFormat:
+        fmt = self._formats.get(style)
+        if fmt is None:
+            fg, bg, bold, italic, underline, inverse = style
+            fmt = QTextCharFormat()
+            fore = _color(fg, _DEFAULT_FG)
+            back = _color(bg, _DEFAULT_BG) if bg is not None or inverse else None
+            if inverse:
+                fore, back = back, fore
+            fmt.setForeground(fore)
+            if back is not None:
+                fmt.setBackground(back)
+            if bold:
+                fmt.setFontWeight(QFont.Bold)
+            if italic:
+                fmt.setFontItalic(True)
+            if underline:
+                fmt.setFontUnderline(True)
+            self._formats[style] = fmt
+        return fmt
+
+
+"""
+터미널 탭 하나: 셸(TerminalManager)과 그 출력을 담는 문서, 렌더러.
+
+문서는 세션마다 따로 두고 탭을 바꾸면 출력 위젯에 붙이는 문서만 바꾼다.
+"""
+class TerminalSession:
+    __slots__ = ('manager', 'document', 'renderer')
+
+    def __init__(self, manager, view):
+        self.manager = manager
+        # 문서는 manager 와 함께 정리된다
+        self.document = QTextDocument(manager)
+        self.document.setDocumentLayout(QPlainTextDocumentLayout(self.document))
+        self.document.setDefaultFont(view.font())
+        self.document.setMaximumBlockCount(manager.scrollback_lines)
+        self.document.setUndoRedoEnabled(False)
+        self.renderer = TerminalRenderer(view, self.document)
+        manager.styled_output.connect(self.renderer.render)
+
+    @property
+    def title(self) -> str:
+        directory = self.manager.get_current_directory()
+        return os.path.basename(directory.rstrip(os.sep)) or directory or "터미널"
+
+    def close(self):
+        self.manager.styled_output.disconnect(self.renderer.render)
+        self.manager.stop_terminal()
+        self.manager.deleteLater()
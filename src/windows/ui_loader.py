@@ -0,0 +1,62 @@
+import os
+import hashlib
+import importlib.util
+from PyQt5.QtCore import PYQT_VERSION_STR
+
+from src.managers.cache_paths import cache_root
+
+
+def _cache_dir() -> str:
+    return cache_root('ui')
+
+
+def _compile(ui_path: str, target: str):
+    # uic 는 .ui 가 바뀌었을 때만 필요하므로 여기서 import (import 만 수십 ms)
+    from PyQt5 import uic
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        uic.compileUi(ui_path, f)
+    os.replace(tmp, target)
+
+
+def _import(path: str, name: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_form_class(ui_path: str):
+    """
+    Qt Designer .ui 파일의 폼 클래스(Ui_*)를 돌려준다.
+
+    uic.loadUiType 은 실행할 때마다 XML 을 파싱해 파이썬 코드를 만들고 exec 하므로, 한 번 컴파일한 모듈을
+    캐시 디렉토리(cache_root() 아래 ui/)에 두고 import 한다
+    (바이트코드도 __pycache__ 에 남음). 파일 이름에 .ui 내용과 PyQt 버전의 해시를 넣어
+    .ui 가 바뀌면 새로 컴파일하고 예전 것은 지운다. 캐시를 쓸 수 없으면 loadUiType 으로 대신한다.
+    """
+    with open(ui_path, 'rb') as f:
+        digest = hashlib.sha1(f.read() + PYQT_VERSION_STR.encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(ui_path))[0]
+    name = f"{stem}_{digest}"
+    try:
+        cache_dir = _cache_dir()
+        target = os.path.join(cache_dir, f"{name}.py")
+        if not os.path.exists(target):
+            os.makedirs(cache_dir, exist_ok=True)
+            _compile(ui_path, target)
+            for old in os.listdir(cache_dir):
+                if old.startswith(f"{stem}_") and old.endswith('.py') and old != f"{name}.py":
+                    try:
+                        os.remove(os.path.join(cache_dir, old))
+                    except OSError:
+                        pass
+        module = _import(target, f"_ui_{name}")
+        for attr, value in vars(module).items():
+            if attr.startswith('Ui_') and isinstance(value, type):
+                return value
+        raise ImportError(f"{target} 에 폼 클래스가 없습니다")
+    except Exception as e:
+        print(f"UI 캐시를 쓰지 않음: {e}")
+        from PyQt5 import uic
+        return uic.loadUiType(ui_path)[0]
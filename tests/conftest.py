@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+# 저장소 루트에서 `pytest` 로 실행해도 src 패키지를 찾을 수 있도록
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_llm_server import MockConfig, MockLLMServer  # noqa: E402
+from src.managers.model_manager import ModelManager  # noqa: E402
+
+
+@pytest.fixture
+def make_manager(tmp_path, monkeypatch):
+    """목 서버를 띄우고 그 서버를 기본 모델로 쓰는 ModelManager 를 만든다."""
+    servers = []
+    managers = []
+    monkeypatch.setenv('EDITOR_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv('LLM_DEFAULT_MODEL', raising=False)
+    monkeypatch.delenv('LLM_HEDGE_ALIASES', raising=False)
+
+    def make(cache: bool = False, **config):
+        server = MockLLMServer(MockConfig(latency_ms=0, tokens_per_sec=0, **config)).start()
+        servers.append(server)
+        monkeypatch.setenv('LLM_LOCAL_URL', server.url)
+        monkeypatch.setenv('LLM_LOCAL_MODELS', 'mock-model')
+        monkeypatch.setenv('LLM_CACHE', '1' if cache else '0')
+        manager = ModelManager()
+        manager.backoff_base = 0.01
+        managers.append(manager)
+        return manager, server
+
+    yield make
+    for manager in managers:
+        manager.close()
+    for server in servers:
+        server.stop()
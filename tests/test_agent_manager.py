@@ -0,0 +1,14 @@
+from src.managers.agent_manager import AgentManager
+
+
+SOURCE = "def add(a, b):\n    return a + b\n"
+
+
+def test_repeated_request_is_served_from_cache(make_manager):
+    manager, server = make_manager(cache=True)
+    agent = AgentManager(manager)
+    first = agent.run("add 에 docstring 을 달아줘", "/tmp/calc.py", SOURCE)
+    second = agent.run("add 에 docstring 을 달아줘", "/tmp/calc.py", SOURCE)
+    assert first[0] and second == first
+    assert server.stats()['requests'] == 1
+    assert manager.cache_stats()['hits'] == 1
@@ -0,0 +1,98 @@
+import pytest
+
+from src.managers.agent_manager import AgentManager
+from src.managers.agent_stream_parser import AgentStreamParser
+
+
+RESPONSE = (
+    "앞부분 잡담\n"
+    "<<BEGIN_DESC>>\n**변경**: `x` 를 `y` 로\n<<END_DESC>>\n\n"
+    "<<BEGIN_FILE>>\ndef f():\n    return '<<' + \"``\"\n<<END_FILE>>\n"
+)
+
+
+def run(chunks):
+    parser = AgentStreamParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    events.extend(parser.finish())
+    return parser, events
+
+
+def joined(events, kind):
+    return ''.join(fragment for k, fragment in events if k == kind)
+
+
+def test_whole_response():
+    parser, events = run([RESPONSE])
+    assert parser.desc == "**변경**: `x` 를 `y` 로"
+    assert parser.code == "def f():\n    return '<<' + \"``\""
+    # 마커 바로 뒤 줄바꿈은 내용에 넣지 않음
+    assert joined(events, 'desc').startswith("**변경**")
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 7, 13])
+def test_markers_split_across_chunks(size):
+    chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+    parser, events = run(chunks)
+    whole, _ = run([RESPONSE])
+    assert parser.desc == whole.desc
+    assert parser.code == whole.code
+    # 스트림으로 내보낸 조각을 이어 붙이면 최종 값과 같아야 함 (마커 글자가 새지 않음)
+    assert '<<BEGIN' not in joined(events, 'code') and '<<END' not in joined(events, 'desc')
+    assert joined(events, 'code').strip('\n') == whole.code
+
+
+def test_every_split_point_matches_extract():
+    # AgentManager 의 최종 추출과 모든 두 조각 분할 결과가 같아야 함
+    manager = AgentManager(model_manager=None)
+    expected_code = manager._extract_code(RESPONSE)
+    expected_desc = manager._extract_desc(RESPONSE)
+    for cut in range(len(RESPONSE) + 1):
+        parser, _ = run([RESPONSE[:cut], RESPONSE[cut:]])
+        assert (parser.code, parser.desc) == (expected_code, expected_desc), cut
+
+
+def test_partial_marker_prefix_at_end_is_flushed_by_finish():
+    parser = AgentStreamParser()
+    events = parser.feed("<<BEGIN_DESC>>\n설명 <<END_DE")
+    # 마커일 수도 있는 꼬리는 아직 보내지 않음
+    assert joined(events, 'desc') == "설명 "
+    events = parser.finish()
+    assert joined(events, 'desc') == "<<END_DE"
+
+
+def test_fence_fallback_without_markers():
+    parser, events = run(["설명입니다\n```py", "thon\nprint(1)\n``", "`\n끝"])
+    assert parser.code == "print(1)"
+    assert joined(events, 'code') == "print(1)\n"
+
+
+def test_file_marker_overrides_earlier_fence():
+    text = "```\nsnippet\n```\n<<BEGIN_FILE>>\nreal\n<<END_FILE>>"
+    parser, events = run([text])
+    kinds = [k for k, _ in events]
+    assert 'code_reset' in kinds
+    assert parser.code == "real"
+
+
+def test_fence_inside_file_marker_is_content():
+    text = "<<BEGIN_FILE>>\n```\nx\n```\n<<END_FILE>>"
+    parser, _ = run([text])
+    assert parser.code == "```\nx\n```"
+
+
+def test_second_description_resets():
+    text = ("<<BEGIN_DESC>>\n첫 번째\n<<END_DESC>>\n"
+            "[편집 블록 적용 실패]\n"
+            "<<BEGIN_DESC>>\n두 번째\n<<END_DESC>>")
+    parser, events = run([text])
+    assert ('desc_reset', '') in events
+    assert parser.desc == "두 번째"
+
+
+def test_edits_block():
+    text = "<<BEGIN_EDITS>>\n<<<<<<< SEARCH\na\n=======\nb\n>>>>>>> REPLACE\n<<END_EDITS>>"
+    parser, _ = run([text[:20], text[20:]])
+    assert parser.edits == "<<<<<<< SEARCH\na\n=======\nb\n>>>>>>> REPLACE\n"
@@ -0,0 +1,121 @@
+import pytest
+
+from src.managers.ansi_parser import AnsiParser
+
+
+RED = (1, None, False, False, False, False)
+BOLD_GREEN = (2, None, True, False, False, False)
+
+
+def feed_all(chunks):
+    """청크를 차례로 넣고 (확정된 스팬 전체, 마지막 현재 줄)을 돌려준다."""
+    parser = AnsiParser()
+    done, line = [], []
+    for chunk in chunks:
+        spans, line = parser.feed(chunk)
+        done.extend(spans)
+    return done, line
+
+
+def text_of(spans):
+    return ''.join(t for t, _ in spans)
+
+
+def test_plain_text_and_lines():
+    done, line = feed_all(["hello\nworld"])
+    assert text_of(done) == "hello\n"
+    assert text_of(line) == "world"
+
+
+def test_crlf_is_a_single_newline():
+    assert AnsiParser.plain("a\r\nb\r\n") == "a\nb\n"
+
+
+def test_sgr_colors_and_reset():
+    # 줄바꿈은 그 줄 마지막 스팬에 붙는다
+    done, _ = feed_all(["\x1b[31mred\x1b[0m plain \x1b[1;32mok\x1b[m\n"])
+    assert done == [("red", RED), (" plain ", None), ("ok\n", BOLD_GREEN)]
+
+
+def test_extended_colors():
+    parser = AnsiParser()
+    parser.feed("\x1b[38;5;208m")
+    assert parser.style[0] == 208
+    parser.feed("\x1b[48;2;1;2;3m")
+    assert parser.style[1] == (1, 2, 3)
+    parser.feed("\x1b[39;49m")
+    assert parser.style is None
+
+
+def test_style_persists_across_feeds():
+    parser = AnsiParser()
+    parser.feed("\x1b[31m")
+    spans, line = parser.feed("still red")
+    assert line == [("still red", RED)]
+
+
+@pytest.mark.parametrize('cut', range(1, len("\x1b[1;32m")))
+def test_sequence_split_across_chunks(cut):
+    seq = "\x1b[1;32m"
+    done, line = feed_all(["a" + seq[:cut], seq[cut:] + "b\n"])
+    assert done == [("a", None), ("b\n", BOLD_GREEN)]
+
+
+def test_osc_title_is_dropped_even_when_split():
+    done, line = feed_all(["before\x1b]0;ti", "tle\x07after\n"])
+    assert text_of(done) == "beforeafter\n"
+
+
+def test_osc_with_st_terminator():
+    assert AnsiParser.plain("x\x1b]2;title\x1b\\y") == "xy"
+
+
+def test_carriage_return_overwrites_current_line():
+    done, line = feed_all(["progress 10%", "\rprogress 55%"])
+    assert text_of(line) == "progress 55%"
+    done, line = feed_all(["long line here\rshort"])
+    assert text_of(line) == "shortline here"
+
+
+def test_carriage_return_and_erase_line():
+    done, line = feed_all(["long line here\r\x1b[Kshort\n"])
+    assert text_of(done) == "short\n"
+
+
+def test_backspace_and_cursor_moves():
+    assert AnsiParser.plain("abc\x08\x08X") == "aXc"
+    assert AnsiParser.plain("abcdef\x1b[3DZ") == "abcZef"
+    assert AnsiParser.plain("ab\x1b[2Cc") == "ab  c"
+    assert AnsiParser.plain("abcdef\x1b[2GZ") == "aZcdef"
+
+
+def test_overwrite_keeps_styles_of_untouched_parts():
+    _, line = feed_all(["\x1b[31mred\x1b[0m tail\r\x1b[32mG"])
+    assert line == [("G", (2, None, False, False, False, False)), ("ed", RED), (" tail", None)]
+
+
+def test_unknown_sequences_are_dropped():
+    assert AnsiParser.plain("\x1b[2J\x1b[Hclear\x1b(Bdone\x1b=") == "cleardone"
+
+
+def test_lone_escape_at_end_is_held_until_next_feed():
+    parser = AnsiParser()
+    _, line = parser.feed("abc\x1b")
+    assert text_of(line) == "abc"
+    _, line = parser.feed("[31mx")
+    assert line == [("abc", None), ("x", RED)]
+
+
+def test_overlong_line_is_broken():
+    parser = AnsiParser()
+    spans, line = parser.feed("x" * (AnsiParser.MAX_LINE_CHARS + 10))
+    assert text_of(spans).endswith('\n')
+    assert len(text_of(spans)) + len(text_of(line)) == AnsiParser.MAX_LINE_CHARS + 11
+
+
+def test_reset_clears_state():
+    parser = AnsiParser()
+    parser.feed("\x1b[31mpartial\x1b[")
+    parser.reset()
+    spans, line = parser.feed("fresh")
+    assert spans == [] and line == [("fresh", None)]
@@ -0,0 +1,112 @@
+from src.managers.edit_applier import EditApplier
+
+
+def block(search: str, replace: str) -> str:
+    return f"{EditApplier.SEARCH}\n{search}\n{EditApplier.DIVIDER}\n{replace}\n{EditApplier.REPLACE}"
+
+
+SOURCE = (
+    "def add(a, b):\n"
+    "    return a + b\n"
+    "\n"
+    "\n"
+    "class Calculator:\n"
+    "    def __init__(self):\n"
+    "        self.total = 0\n"
+    "\n"
+    "    def push(self, value):\n"
+    "        self.total += value\n"
+    "        return self.total\n"
+)
+
+
+def test_parse_multiple_blocks_and_drops_unterminated():
+    text = (
+        "설명\n" + block("a", "b") + "\n중간 텍스트\n" + block("c\nd", "") + "\n"
+        + f"{EditApplier.SEARCH}\nx\n{EditApplier.DIVIDER}\ny"  # 잘린 응답
+    )
+    assert EditApplier.parse(text) == [("a", "b"), ("c\nd", "")]
+
+
+def test_parse_tolerates_marker_indentation():
+    text = f"  {EditApplier.SEARCH}\nold\n  {EditApplier.DIVIDER}  \nnew\n\t{EditApplier.REPLACE}"
+    assert EditApplier.parse(text) == [("old", "new")]
+
+
+def test_exact_match():
+    ok, content, error = EditApplier.apply(SOURCE, [("    return a + b", "    return a - b")])
+    assert ok and error == ""
+    assert "return a - b" in content and "return a + b" not in content
+
+
+def test_blocks_apply_in_order_on_updated_content():
+    blocks = [("self.total = 0", "self.total = 1"), ("self.total = 1", "self.total = 2")]
+    ok, content, _ = EditApplier.apply(SOURCE, blocks)
+    assert ok and "self.total = 2" in content
+
+
+def test_ambiguous_exact_match_fails_without_changes():
+    text = "x = 1\ny = 2\nx = 1\n"
+    ok, content, error = EditApplier.apply(text, [("x = 1", "x = 3")])
+    assert not ok and content == text
+    assert error.startswith("1번째 블록")
+
+
+def test_failure_keeps_original_even_after_earlier_blocks():
+    blocks = [("def add(a, b):", "def plus(a, b):"), ("does not exist anywhere", "")]
+    ok, content, error = EditApplier.apply(SOURCE, blocks)
+    assert not ok and content == SOURCE
+    assert error.startswith("2번째 블록")
+
+
+def test_trailing_whitespace_is_ignored():
+    search = "    def push(self, value):   \n        self.total += value  "
+    replace = "    def push(self, value):\n        self.total += value * 2"
+    ok, content, _ = EditApplier.apply(SOURCE, [(search, replace)])
+    assert ok and "self.total += value * 2\n        return self.total" in content
+
+
+def test_indentation_mismatch_is_reindented_to_original():
+    # 모델이 클래스 들여쓰기를 빼고 보낸 경우
+    search = "def push(self, value):\n    self.total += value"
+    replace = "def push(self, value):\n    self.total -= value"
+    ok, content, _ = EditApplier.apply(SOURCE, [(search, replace)])
+    assert ok
+    assert "    def push(self, value):\n        self.total -= value\n" in content
+
+
+def test_fuzzy_match_allows_small_typo():
+    search = "    def __init__(self):\n        self.totl = 0"
+    replace = "    def __init__(self):\n        self.total = 10"
+    ok, content, _ = EditApplier.apply(SOURCE, [(search, replace)])
+    assert ok and "self.total = 10" in content and "self.total = 0" not in content
+
+
+def test_fuzzy_match_rejects_ambiguous_location():
+    text = "a = compute(1)\nprint(a)\n\nb = compute(2)\nprint(b)\n"
+    ok, content, _ = EditApplier.apply(text, [("c = compute(3)\nprint(c)", "pass")])
+    assert not ok and content == text
+
+
+def test_fuzzy_match_rejects_unrelated_code():
+    ok, _, _ = EditApplier.apply(SOURCE, [("import sys\nsys.exit(1)", "pass")])
+    assert not ok
+
+
+def test_empty_search_appends_at_end():
+    ok, content, _ = EditApplier.apply("a = 1", [("", "b = 2")])
+    assert ok and content == "a = 1\nb = 2"
+    ok, content, _ = EditApplier.apply("a = 1\n", [("\n", "b = 2\n")])
+    assert ok and content == "a = 1\nb = 2\n"
+
+
+def test_search_does_not_match_inside_a_line():
+    text = "x = 1\ncount = 10\n"
+    ok, content, _ = EditApplier.apply(text, [("unt = 1", "unt = 5")])
+    assert not ok and content == text
+
+
+def test_whole_line_match_ignores_longer_line_with_same_prefix():
+    text = "def f():\n    total = 1\n    total = 10\n"
+    ok, content, _ = EditApplier.apply(text, [("    total = 1", "    total = 2")])
+    assert ok and content == "def f():\n    total = 2\n    total = 10\n"
@@ -0,0 +1,31 @@
+def test_stream_decodes_non_ascii_as_utf8(make_manager):
+    # '녕' 의 UTF-8 에는 0x85 가 들어 있어 ISO-8859-1 로 읽으면 NEL 줄바꿈으로 잘린다
+    reply = "안녕하세요, 세계! 코드를 고쳤습니다."
+    manager, _ = make_manager(reply=reply)
+    tokens = []
+    ok, text = manager.chat([{'role': 'user', 'content': '인사'}], on_token=tokens.append)
+    assert ok and text == reply
+    assert ''.join(tokens) == reply
+
+
+def test_retry_after_is_honored_not_clamped(make_manager):
+    manager, _ = make_manager()
+    manager.backoff_max = 1.0
+    assert manager._retry_after('5') == 5.0
+    assert manager._retry_after('-3') == 0.0
+    assert manager._retry_after('soon') is None
+
+
+def test_long_retry_after_returns_429_without_retrying(make_manager):
+    manager, server = make_manager(rate_limit_rate=1.0, retry_after=60)
+    ok, text = manager.chat([{'role': 'user', 'content': 'hi'}])
+    assert not ok and '429' in text
+    assert server.stats()['requests'] == 1
+
+
+def test_short_retry_after_is_retried(make_manager):
+    manager, server = make_manager(rate_limit_rate=1.0, retry_after=0.01)
+    manager.max_retries = 2
+    ok, text = manager.chat([{'role': 'user', 'content': 'hi'}])
+    assert not ok and '429' in text
+    assert server.stats()['requests'] == 3
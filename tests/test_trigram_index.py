@@ -0,0 +1,159 @@
+import os
+import re
+
+import pytest
+
+from src.managers.trigram_index import TrigramIndex, _trigrams
+
+
+def satisfied(plan, text: str) -> bool:
+    """plan 이 text 의 트라이그램 집합으로 만족되는지 (색인의 _eval 과 같은 의미)."""
+    grams = _trigrams(text.encode('utf-8'))
+    def check(node):
+        if node is None:
+            return True
+        if isinstance(node, int):
+            return node in grams
+        op, items = node
+        results = [check(item) for item in items]
+        return all(results) if op == 'and' else any(results)
+    return check(plan)
+
+
+def keys(text: str):
+    return _trigrams(text.encode('utf-8'))
+
+
+def flatten(plan):
+    if plan is None:
+        return set()
+    if isinstance(plan, int):
+        return {plan}
+    out = set()
+    for item in plan[1]:
+        out |= flatten(item)
+    return out
+
+
+def test_literal_plan():
+    assert TrigramIndex.plan_literal("ab") is None
+    assert flatten(TrigramIndex.plan_literal("hello")) == keys("hello")
+    assert TrigramIndex.plan_literal("hello")[0] == 'and'
+
+
+def test_invalid_regex_means_no_filter():
+    assert TrigramIndex.plan_regex("(unclosed") is None
+
+
+def test_alternation_is_or():
+    plan = TrigramIndex.plan_regex("foo|bar")
+    assert plan == ('or', [next(iter(keys("foo"))), next(iter(keys("bar")))])
+
+
+def test_alternation_with_unconstrained_branch_drops_out():
+    # 한 갈래가 아무 조건이 없으면 OR 전체가 조건 없음 -> 뒤의 리터럴만 남음
+    plan = TrigramIndex.plan_regex("(foo|.*)barbaz")
+    assert flatten(plan) == keys("barbaz")
+
+
+def test_optional_and_star_parts_are_not_required():
+    plan = TrigramIndex.plan_regex("alpha(beta)?gamma(delta)*")
+    assert flatten(plan) == keys("alpha") | keys("gamma")
+
+
+def test_plus_repeat_is_required():
+    plan = TrigramIndex.plan_regex("(needle)+x")
+    assert keys("needle") <= flatten(plan)
+
+
+def test_character_class_splits_literal_runs():
+    plan = TrigramIndex.plan_regex("prefix[0-9a-f]suffix")
+    assert flatten(plan) == keys("prefix") | keys("suffix")
+    # 클래스 양옆을 이어 붙인 가짜 트라이그램이 들어가면 안 됨
+    assert not (keys("ixsu") & flatten(plan))
+
+
+def test_escapes_and_anchors():
+    plan = TrigramIndex.plan_regex(r"^def\s+main\(\)$")
+    assert flatten(plan) == keys("def") | keys("main()")
+
+
+def test_inline_ignorecase_group():
+    plan = TrigramIndex.plan_regex("(?i:Token)Value", case_sensitive=True)
+    assert satisfied(plan, "tokenValue") and satisfied(plan, "TOKENValue")
+
+
+def test_non_ascii_is_ignored_when_case_insensitive():
+    plan = TrigramIndex.plan_regex("한글abc")
+    assert flatten(plan) == keys("abc")
+
+
+PATTERNS = [
+    r"foo|bar",
+    r"(get|set)_value\(",
+    r"colou?r",
+    r"class\s+\w+Manager",
+    r"[A-Z]{3}_LIMIT",
+    r"x(ab|cd)+y",
+    r"(?:start|stop)(?:ing|ed)?",
+    r"^import (os|sys)$",
+    r"TODO.*fix",
+    r"a.b.c",
+]
+TEXTS = [
+    "foo", "a bar here", "get_value(1)", "set_value(", "color", "colour", "class  FileManager:",
+    "MAX_LIMIT", "xababy", "xcdy", "starting", "stopped", "import os", "import sys",
+    "TODO: please fix", "aXbYc", "nothing relevant", "GET_VALUE(", "Colour",
+]
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_plan_never_excludes_a_match(pattern):
+    for case_sensitive in (False, True):
+        plan = TrigramIndex.plan_regex(pattern, case_sensitive)
+        flags = re.M | (0 if case_sensitive else re.I)
+        for text in TEXTS:
+            if re.search(pattern, text, flags):
+                assert satisfied(plan, text), (pattern, case_sensitive, text)
+
+
+def test_candidates_from_built_index(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "a.py").write_text("def get_value():\n    return 1\n")
+    (root / "b.py").write_text("def set_value(x):\n    pass\n")
+    (root / "c.py").write_text("print('unrelated')\n")
+    index = TrigramIndex(cache_dir=str(tmp_path / "cache"))
+    try:
+        index.build(str(root))
+        index._thread.join(10)
+        assert index.ready
+
+        def names(plan):
+            paths, total = index.candidates(plan)
+            assert total == 3
+            return sorted(p.rsplit('/', 1)[-1].rsplit('\\', 1)[-1] for p in paths)
+
+        assert names(TrigramIndex.plan_regex(r"(get|set)_value")) == ["a.py", "b.py"]
+        assert names(TrigramIndex.plan_regex(r"get_value|unrelated")) == ["a.py", "c.py"]
+        assert names(TrigramIndex.plan_literal("return 1")) == ["a.py"]
+        assert names(TrigramIndex.plan_regex(r".*")) == ["a.py", "b.py", "c.py"]
+    finally:
+        index.close()
+
+
+def test_newline_patterns_match_crlf_files(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "lf.txt").write_bytes(b"foo\nbar\n")
+    (root / "crlf.txt").write_bytes(b"foo\r\nbar\r\n")
+    (root / "cr.txt").write_bytes(b"foo\rbar\r")
+    index = TrigramIndex(cache_dir=str(tmp_path / "cache"))
+    try:
+        index.build(str(root))
+        index._thread.join(10)
+        assert index.ready
+        paths, _ = index.candidates(TrigramIndex.plan_regex(r"foo\nbar"))
+        assert sorted(os.path.basename(p) for p in paths) == ["cr.txt", "crlf.txt", "lf.txt"]
+    finally:
+        index.close()